@@ -99,6 +99,8 @@ class ATSValidationResult(BaseModel):
     section_issues: List[str] = []
     keyword_optimization: Dict[str, Any] = {}
     recommendations: List[str] = []
+    rule_timings: Optional[Dict[str, float]] = None  # Seconds per ATS rule, when requested
+    pdf_inspection: Optional[Dict[str, Any]] = None  # Fonts, images and layout hints of PDF uploads
 
 class ResumeBuilderRequest(BaseModel):
     resume_data: ResumeData
@@ -3,13 +3,22 @@ ATS Validator API router
 Handles ATS compatibility validation of resumes
 """
 
-from fastapi import APIRouter, File, UploadFile, Form, HTTPException, BackgroundTasks
-from pathlib import Path
+from fastapi import APIRouter, File, UploadFile, Form, HTTPException, WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
+from typing import List
+import asyncio
+import time
 import uuid
 import logging
 
 from app.services.ats_validator import ATSValidator
+from app.services.ats_session import ATSSession
+from app.services.extraction_pool import extraction_pool
 from app.services.resume_parser import ResumeParser
+from app.services.text_extraction import ExtractedDocument
+from app.services.upload_ingestion import (
+    ingest_upload, ALLOWED_EXTENSIONS, BULK_WINDOW, MAX_BATCH_FILES, MAX_FILE_SIZE
+)
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -18,54 +27,36 @@ logger = logging.getLogger(__name__)
 ats_validator = ATSValidator()
 resume_parser = ResumeParser()
 
-# Upload settings
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
-ALLOWED_EXTENSIONS = {'.pdf', '.docx', '.doc', '.txt'}
-MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-
 @router.post("/validate")
 async def validate_resume_file(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    timings: bool = False
 ):
-    """Validate ATS compatibility of uploaded resume file"""
-    
-    # Validate file
-    if not file.filename:
-        raise HTTPException(status_code=400, detail="No file provided")
-    
-    file_ext = Path(file.filename).suffix.lower()
-    if file_ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Unsupported file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
-        )
+    """Validate ATS compatibility of uploaded resume file
+
+    Pass ``?timings=true`` to include the time spent in each ATS rule.
+    """
     
-    # Check file size
-    file_content = await file.read()
-    if len(file_content) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=400, detail="File too large. Maximum size: 10MB")
+    # Validate, size-check and hash the upload while streaming it
+    upload = await ingest_upload(file)
     
     try:
-        # Save uploaded file temporarily
         file_id = str(uuid.uuid4())
-        file_path = UPLOAD_DIR / f"{file_id}{file_ext}"
         
-        with open(file_path, "wb") as f:
-            f.write(file_content)
+        # Extract once, straight from the upload buffer; the same document
+        # feeds every ATS check
+        document = await resume_parser.extract_upload(upload)
         
-        # Extract text for analysis
-        resume_text = await resume_parser._extract_text_from_file(str(file_path))
-        
-        if not resume_text:
+        if not document.text:
             raise HTTPException(status_code=400, detail="Could not extract text from file")
         
-        # Perform ATS validation
-        validation_result = await ats_validator.validate_resume(str(file_path), resume_text)
+        # Fonts and layout of PDFs, cached by content hash
+        inspection = await extraction_pool.inspect_upload(upload)
         
-        # Schedule file cleanup
-        background_tasks.add_task(cleanup_file, file_path)
+        # Perform ATS validation; scoring is CPU-bound, so keep it off the event loop
+        validation_result = await run_in_threadpool(
+            ats_validator.validate_document, document, upload.filename, include_timings=timings, inspection=inspection
+        )
         
         return {
             "file_id": file_id,
@@ -78,26 +69,111 @@ async def validate_resume_file(
         logger.error(f"Error validating resume: {e}")
         raise HTTPException(status_code=500, detail=f"Error validating resume: {str(e)}")
 
-@router.post("/validate-text")
-async def validate_resume_text(
-    resume_text: str = Form(...),
-    filename: str = Form("resume.txt")
+@router.post("/validate-batch")
+async def validate_resume_batch(
+    files: List[UploadFile] = File(...)
 ):
-    """Validate ATS compatibility of resume text"""
+    """Validate ATS compatibility of many resumes in one request
+
+    Files are extracted ``BULK_WINDOW`` at a time; rules and scores are
+    then computed across the whole batch at once. A file that cannot be
+    read gets an ``error`` entry instead of failing the batch.
+    """
+    
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(status_code=400, detail=f"Too many files. Maximum per batch: {MAX_BATCH_FILES}")
     
     try:
-        # Create a temporary text file for validation
-        file_id = str(uuid.uuid4())
-        file_path = UPLOAD_DIR / f"{file_id}.txt"
+        # Extract a window of files at a time; cached content skips extraction
+        window = asyncio.Semaphore(BULK_WINDOW)
+        extracted = await asyncio.gather(*(_extract_for_batch(file, window) for file in files))
+        
+        results = [{"filename": file.filename, "error": error} for file, (_, _, error) in zip(files, extracted)]
+        ready = [(index, document, inspection)
+                 for index, (document, inspection, error) in enumerate(extracted) if error is None]
         
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(resume_text)
+        # Score the whole batch off the event loop
+        validations = await run_in_threadpool(
+            ats_validator.validate_batch,
+            [document for _, document, _ in ready],
+            [files[index].filename for index, _, _ in ready],
+            [inspection for _, _, inspection in ready]
+        )
+        for (index, _, _), validation in zip(ready, validations):
+            results[index] = {"filename": files[index].filename, "validation_result": validation.model_dump()}
+        
+        return {
+            "count": len(files),
+            "validated": len(ready),
+            "results": results,
+            "message": "Batch ATS validation completed successfully"
+        }
         
-        # Perform ATS validation
-        validation_result = await ats_validator.validate_resume(str(file_path), resume_text)
+    except Exception as e:
+        logger.error(f"Error validating resume batch: {e}")
+        raise HTTPException(status_code=500, detail=f"Error validating resume batch: {str(e)}")
+
+async def _extract_for_batch(file: UploadFile, window: asyncio.Semaphore):
+    """Ingest, extract and inspect one batch member, returning (document, inspection, error)"""
+    async with window:
+        try:
+            upload = await ingest_upload(file)
+        except HTTPException as e:
+            return None, None, e.detail
         
-        # Clean up temp file
-        file_path.unlink()
+        try:
+            document = await resume_parser.extract_upload(upload)
+        except Exception as e:
+            # e.g. ExtractionTimeout or a broken worker pool - fail this file only
+            logger.exception(f"Error extracting batch file {file.filename}")
+            return None, None, str(e) or type(e).__name__
+        
+        if not document.text:
+            return None, None, "Could not extract text from file"
+        return document, await extraction_pool.inspect_upload(upload), None
+
+@router.post("/inspect")
+async def inspect_pdf_file(
+    file: UploadFile = File(...)
+):
+    """Report a PDF's fonts, images, annotations and layout hints
+    
+    Reads page resources, then tokenizes up to the first 512KB of each
+    page's content streams to place text lines for the column hint. The
+    shown strings are never decoded, so it costs a fraction of a full
+    extraction. Results are cached by content hash.
+    """
+    
+    upload = await ingest_upload(file, allowed_extensions={'.pdf'})
+    
+    try:
+        inspection = await extraction_pool.inspect_pdf(upload.sha256, upload.rewind())
+        
+        return {
+            "filename": file.filename,
+            "sha256": upload.sha256,
+            "inspection": inspection.summary(),
+            "message": "PDF inspection completed successfully"
+        }
+        
+    except Exception as e:
+        logger.error(f"Error inspecting PDF: {e}")
+        raise HTTPException(status_code=500, detail=f"Error inspecting PDF: {str(e)}")
+
+@router.post("/validate-text")
+async def validate_resume_text(
+    resume_text: str = Form(...),
+    filename: str = Form("resume.txt"),
+    file_format: str = Form("txt")
+):
+    """Validate ATS compatibility of resume text
+    
+    The text is judged as a file of the declared ``file_format``.
+    """
+    
+    try:
+        # Perform ATS validation entirely in memory
+        validation_result = ats_validator.validate_text(resume_text, file_format)
         
         return {
             "filename": filename,
@@ -109,6 +185,55 @@ async def validate_resume_text(
         logger.error(f"Error validating text: {e}")
         raise HTTPException(status_code=500, detail=f"Error validating text: {str(e)}")
 
+@router.websocket("/live")
+async def live_ats_session(websocket: WebSocket, filename: str = "resume.txt"):
+    """Re-score a resume as it is edited
+    
+    Each JSON message either replaces the text, ``{"text": "..."}``, or
+    edits it, ``{"changes": [{"start": 0, "end": 4, "text": "Jane"}]}``
+    with offsets in code points of the current text, applied in order.
+    Every message is answered with the new validation result and the
+    message's ``version``, if it had one; only the edited lines are
+    re-analyzed. An invalid edit clears the session.
+    """
+    
+    await websocket.accept()
+    session = ATSSession(filename=filename, validator=ats_validator)
+    
+    try:
+        while True:
+            message = await websocket.receive_json()
+            version = message.get("version") if isinstance(message, dict) else None
+            started = time.perf_counter()
+            try:
+                if not isinstance(message, dict):
+                    raise ValueError("Expected a JSON object")
+                if "text" in message:
+                    session.reset(str(message["text"]))
+                for change in message.get("changes", []):
+                    session.apply(int(change["start"]), int(change["end"]), str(change.get("text", "")))
+                if session.length > MAX_FILE_SIZE:
+                    raise ValueError("Resume text exceeds the size limit")
+            except (KeyError, TypeError, ValueError) as e:
+                # The client's copy may no longer match ours: start over from
+                # an empty document until it resends the full text
+                session.reset("")
+                await websocket.send_json({"version": version, "error": f"Invalid edit: {str(e)}"})
+                continue
+            
+            validation_result = session.validate()
+            await websocket.send_json({
+                "version": version,
+                "validation_result": validation_result.model_dump(),
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)
+            })
+    
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Error in live ATS session: {e}")
+        await websocket.close(code=1011)
+
 @router.post("/quick-check")
 async def quick_ats_check(
     resume_text: str = Form(...),
@@ -117,52 +242,23 @@ async def quick_ats_check(
     """Quick ATS compatibility check with keyword analysis"""
     
     try:
-        # Perform basic checks without file upload
-        issues = []
-        score = 100.0
-        
-        # Basic text analysis
-        word_count = len(resume_text.split())
-        if word_count < 200:
-            issues.append("Resume appears too short (< 200 words)")
-            score -= 20
-        elif word_count > 1000:
-            issues.append("Resume may be too long (> 1000 words)")
-            score -= 10
-        
-        # Check for contact information
-        import re
-        if not re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', resume_text):
-            issues.append("No email address found")
-            score -= 15
-        
-        if not re.search(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', resume_text):
-            issues.append("No phone number detected")
-            score -= 10
-        
-        # Check for section headers
-        section_count = len(re.findall(r'\n([A-Z][A-Z\s]{2,})\n', resume_text))
-        if section_count < 2:
-            issues.append("Sections may not be clearly defined")
-            score -= 15
+        # Length, contact and header rules from the ATS engine, no file needed
+        document = ExtractedDocument.from_text(resume_text)
+        result = ats_validator.quick_check(document)
         
         # Keyword analysis
         keyword_analysis = {}
         if target_keywords:
             keywords = [kw.strip().lower() for kw in target_keywords.split(',')]
-            text_lower = resume_text.lower()
-            
             for keyword in keywords:
-                count = text_lower.count(keyword)
+                count = document.lower.count(keyword)
                 keyword_analysis[keyword] = {
                     "count": count,
                     "found": count > 0
                 }
         
         return {
-            "quick_score": max(score, 0),
-            "word_count": word_count,
-            "issues": issues,
+            **result,
             "keyword_analysis": keyword_analysis,
             "recommendations": [
                 "Save resume as PDF or DOCX format",
@@ -260,15 +356,6 @@ async def get_keyword_suggestions(industry: str = "technology"):
         ]
     }
 
-async def cleanup_file(file_path: Path):
-    """Background task to clean up uploaded files"""
-    try:
-        if file_path.exists():
-            file_path.unlink()
-            logger.info(f"Cleaned up file: {file_path}")
-    except Exception as e:
-        logger.error(f"Error cleaning up file {file_path}: {e}")
-
 @router.get("/health")
 async def health_check():
     """Health check for ATS validator service"""
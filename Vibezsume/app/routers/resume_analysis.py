@@ -3,166 +3,339 @@ Resume analysis API router
 Handles upload, parsing, and analysis of resume files
 """
 
-from fastapi import APIRouter, File, UploadFile, Form, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
-import os
-import uuid
+from fastapi import APIRouter, File, UploadFile, Form, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pathlib import Path
+from functools import partial
+from typing import List
+import asyncio
+import json
+import re
+import uuid
+import zipfile
 import logging
 
 from app.services.resume_parser import ResumeParser
-from app.services.llm_service import LLMService
-from app.models.resume_models import JobDescription, AnalysisResult
+from app.services.ats_validator import ATSValidator
+from app.services.llm_service import llm_service
+from app.services.upload_ingestion import (
+    IngestedUpload, detach_upload, ingest_upload, ingest_zip_member, list_zip_members,
+    ALLOWED_EXTENSIONS, BULK_WINDOW, MAX_BATCH_FILES, MAX_BATCH_SIZE
+)
+from app.services.extraction_cache import extraction_cache
+from app.services.extraction_pool import extraction_pool
+from app.services.skills_taxonomy import find_skills
+from app.models.resume_models import JobDescription, AnalysisResult, ResumeData
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 # Initialize services
 resume_parser = ResumeParser()
-llm_service = LLMService()
+ats_validator = ATSValidator()
 
-# LLM service will be initialized in main.py startup event
+# llm_service is shared with main.py, which probes it on startup and keeps a
+# background prober running; unavailable means the fallback, with no network call
 
-# Ensure upload directory exists
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
+SHA256_PATTERN = re.compile(r'^[0-9a-f]{64}$')
 
-ALLOWED_EXTENSIONS = {'.pdf', '.docx', '.doc', '.txt'}
-MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+# Stages of the combined /report endpoint, in the order they are computed
+REPORT_STAGES = ("parse", "ats", "analysis", "skill_gap", "vibe")
 
 @router.post("/upload", response_model=dict)
 async def upload_resume(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     job_description: str = Form(None),
     job_url: str = Form(None)
 ):
     """Upload and analyze a resume file"""
     
-    # Validate file
-    if not file.filename:
-        raise HTTPException(status_code=400, detail="No file provided")
+    # Validate, size-check and hash the upload while streaming it
+    upload = await ingest_upload(file)
+    
+    try:
+        file_id = str(uuid.uuid4())
+        
+        # Parse resume straight from the upload buffer (cached by content hash)
+        _, resume_data = await resume_parser.parse_upload(upload)
+        
+        return await _analyze_uploaded_resume(file_id, resume_data, job_description, job_url)
+        
+    except Exception as e:
+        logger.error(f"Error processing resume: {e}")
+        raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
+
+@router.post("/precheck", response_model=dict)
+async def precheck_resume(
+    sha256: str = Form(...),
+    filename: str = Form(...),
+    job_description: str = Form(None),
+    job_url: str = Form(None)
+):
+    """Analyze a previously uploaded resume by its content hash, without the upload
+    
+    The client hashes the file locally and calls this first; on a miss it
+    falls back to ``/upload`` with the bytes.
+    """
     
-    file_ext = Path(file.filename).suffix.lower()
+    sha256 = sha256.strip().lower()
+    if not SHA256_PATTERN.match(sha256):
+        raise HTTPException(status_code=400, detail="sha256 must be 64 hexadecimal characters")
+    
+    file_ext = Path(filename).suffix.lower()
     if file_ext not in ALLOWED_EXTENSIONS:
         raise HTTPException(
-            status_code=400, 
+            status_code=400,
             detail=f"Unsupported file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
         )
     
-    # Check file size
-    file_content = await file.read()
-    if len(file_content) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=400, detail="File too large. Maximum size: 10MB")
+    # Bloom filter answers most misses without touching the cache tiers
+    if not extraction_cache.might_contain(sha256, file_ext):
+        return {"found": False}
+    
+    cached = await run_in_threadpool(extraction_cache.get, sha256, file_ext)
+    if cached is None:
+        return {"found": False}
     
     try:
-        # Save uploaded file
-        file_id = str(uuid.uuid4())
-        file_path = UPLOAD_DIR / f"{file_id}{file_ext}"
-        
-        with open(file_path, "wb") as f:
-            f.write(file_content)
-        
-        # Parse resume
-        resume_data = await resume_parser.parse_resume(str(file_path))
-        
-        # Initialize LLM service if not already done
-        if not llm_service.is_available:
-            await llm_service.initialize()
-        
-        # Prepare job description for analysis if provided
-        job_desc = None
-        if job_description:
-            job_desc = JobDescription(
-                title="Target Position",
-                description=job_description,
-                required_skills=[],  # Could be extracted from description
-                url=job_url if job_url else None
-            )
-        
-        # Analyze resume
-        analysis = await llm_service.analyze_resume(resume_data, job_desc)
-        
-        # Get skill gap analysis if job description provided
-        skill_gap = None
-        if job_desc:
-            skill_gap = await llm_service.get_skill_gap_analysis(resume_data, job_desc)
+        resume_data = cached.resume_data
+        if resume_data is None:
+            resume_data = await run_in_threadpool(resume_parser.parse_document, cached.document)
+            await run_in_threadpool(extraction_cache.put, sha256, file_ext, cached.document, resume_data)
         
-        # Get vibe check feedback
-        vibe_feedback = await llm_service.vibe_check_feedback(resume_data, job_url)
+        result = await _analyze_uploaded_resume(str(uuid.uuid4()), resume_data, job_description, job_url)
+        return {"found": True, **result}
         
-        # Schedule file cleanup
-        background_tasks.add_task(cleanup_file, file_path)
+    except Exception as e:
+        logger.error(f"Error processing cached resume: {e}")
+        raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
+
+async def _analyze_uploaded_resume(file_id: str, resume_data: ResumeData,
+                                   job_description: str = None, job_url: str = None) -> dict:
+    """Run the LLM analysis shared by /upload and /precheck"""
+    
+    # Prepare job description for analysis if provided
+    job_desc = _job_description_from_form(job_description, job_url)
+    
+    # Analyze resume
+    analysis = await llm_service.analyze_resume(resume_data, job_desc)
+    
+    # Get skill gap analysis if job description provided
+    skill_gap = None
+    if job_desc:
+        skill_gap = await llm_service.get_skill_gap_analysis(resume_data, job_desc)
+    
+    # Get vibe check feedback
+    vibe_feedback = await llm_service.vibe_check_feedback(resume_data, job_url)
+    
+    return {
+        "file_id": file_id,
+        "resume_data": resume_data.model_dump(),
+        "analysis": analysis.model_dump(),
+        "skill_gap": skill_gap,
+        "vibe_feedback": vibe_feedback,
+        "message": "Resume analyzed successfully"
+    }
+
+@router.post("/report", response_model=dict)
+async def resume_report(
+    file: UploadFile = File(...),
+    job_description: str = Form(None),
+    job_url: str = Form(None),
+    stages: str = Form(",".join(REPORT_STAGES))
+):
+    """Parse, ATS-validate and analyze one upload in a single request
+    
+    The file is ingested and extracted once; every requested stage reuses
+    that document. ``stages`` is a comma-separated subset of
+    parse, ats, analysis, skill_gap and vibe.
+    """
+    
+    requested = _requested_stages(stages)
+    
+    # Validate, size-check and hash the upload while streaming it
+    upload = await ingest_upload(file)
+    
+    try:
+        result = await _build_report(upload, requested, job_description, job_url)
+        result["message"] = "Resume report completed successfully"
+        return result
         
-        return {
-            "file_id": file_id,
-            "resume_data": resume_data.model_dump(),
-            "analysis": analysis.model_dump(),
-            "skill_gap": skill_gap,
-            "vibe_feedback": vibe_feedback,
-            "message": "Resume analyzed successfully"
-        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error building resume report: {e}")
+        raise HTTPException(status_code=500, detail=f"Error building resume report: {str(e)}")
+
+@router.post("/bulk")
+async def bulk_resume_report(
+    files: List[UploadFile] = File(...),
+    job_description: str = Form(None),
+    job_url: str = Form(None),
+    stages: str = Form("ats")
+):
+    """Report on many resumes, streaming one NDJSON line per file as it finishes
+    
+    Accepts several files and/or zip archives of resumes. At most
+    ``BULK_WINDOW`` files are read and processed at a time, so memory stays
+    bounded however large the batch. Each line carries the file's ``index``
+    in submission order and either its report (see ``/report``; ``stages``
+    defaults to ``ats``) or an ``error``.
+    """
+    
+    requested = _requested_stages(stages)
+    
+    try:
+        # Zip archives are expanded lazily: only their directories are read here
+        items = []
+        files = [detach_upload(file) for file in files]
+        for file in files:
+            if Path(file.filename or "").suffix.lower() == '.zip':
+                archive_upload = await ingest_upload(file, allowed_extensions={'.zip'}, max_size=MAX_BATCH_SIZE)
+                archive = zipfile.ZipFile(archive_upload.buffer)
+                for info in list_zip_members(archive):
+                    items.append((Path(info.filename).name,
+                                  partial(run_in_threadpool, ingest_zip_member, archive, info)))
+            else:
+                items.append((file.filename, partial(ingest_upload, file)))
+        
+        if len(items) > MAX_BATCH_FILES:
+            raise HTTPException(status_code=400, detail=f"Too many files. Maximum per batch: {MAX_BATCH_FILES}")
         
     except Exception as e:
-        logger.error(f"Error processing resume: {e}")
-        raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
+        for file in files:
+            await file.close()
+        if isinstance(e, HTTPException):
+            raise
+        if isinstance(e, zipfile.BadZipFile):
+            raise HTTPException(status_code=400, detail="Invalid zip archive")
+        logger.error(f"Error reading bulk upload: {e}")
+        raise HTTPException(status_code=500, detail=f"Error reading bulk upload: {str(e)}")
+    
+    async def bulk_item(index: int, filename: str, ingest) -> dict:
+        try:
+            upload = await ingest()
+            return {"index": index, **await _build_report(upload, requested, job_description, job_url)}
+        except HTTPException as e:
+            return {"index": index, "filename": filename, "error": e.detail}
+        except Exception as e:
+            # Reported on the item, but logged with its traceback so bugs stay visible
+            logger.exception(f"Error in bulk report for {filename}")
+            return {"index": index, "filename": filename, "error": str(e)}
+    
+    async def stream_results():
+        pending = set()
+        queue = iter(enumerate(items))
+        try:
+            while True:
+                # Keep the in-flight window full
+                for index, (filename, ingest) in queue:
+                    pending.add(asyncio.create_task(bulk_item(index, filename, ingest)))
+                    if len(pending) >= BULK_WINDOW:
+                        break
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield json.dumps(task.result()) + "\n"
+        finally:
+            # Client went away: stop the work still in flight
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for file in files:
+                await file.close()
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson",
+                             headers={"X-Bulk-Count": str(len(items))})
+
+def _requested_stages(stages: str) -> set:
+    """Parse a comma-separated stage list, rejecting unknown stages"""
+    
+    requested = {stage.strip().lower() for stage in stages.split(",") if stage.strip()}
+    unknown = requested - set(REPORT_STAGES)
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown stages: {', '.join(sorted(unknown)) or 'none given'}. "
+                   f"Allowed: {', '.join(REPORT_STAGES)}"
+        )
+    return requested
+
+async def _build_report(upload: IngestedUpload, requested: set,
+                        job_description: str = None, job_url: str = None) -> dict:
+    """Run the requested stages over one ingested upload, shared by /report and /bulk"""
+    
+    result = {
+        "file_id": str(uuid.uuid4()),
+        "filename": upload.filename,
+        "stages": [stage for stage in REPORT_STAGES if stage in requested]
+    }
+    
+    # Extract once; parsing reuses the cached document and ATS-only
+    # reports skip the parser entirely
+    document = await resume_parser.extract_upload(upload)
+    if not document.text:
+        raise HTTPException(status_code=400, detail="Could not extract text from file")
+    
+    resume_data = None
+    if requested - {"ats"}:
+        # Keep the parsed document so ATS reuses its section index and contact scan
+        document, resume_data = await resume_parser.parse_upload(upload)
+    
+    if "parse" in requested:
+        result["resume_data"] = resume_data.model_dump()
+    
+    if "ats" in requested:
+        # Scoring is CPU-bound; keep it off the event loop
+        inspection = await extraction_pool.inspect_upload(upload)
+        validation = await run_in_threadpool(
+            ats_validator.validate_document, document, upload.filename, inspection=inspection
+        )
+        result["validation_result"] = validation.model_dump()
+    
+    job_desc = _job_description_from_form(job_description, job_url)
+    
+    if "skill_gap" in requested:
+        # Skill gap needs a target job; without one the stage is empty
+        result["skill_gap"] = None
+    
+    if requested & {"analysis", "skill_gap", "vibe"}:
+        # The LLM-backed stages are independent, so run them concurrently
+        llm_stages = {}
+        if "analysis" in requested:
+            llm_stages["analysis"] = llm_service.analyze_resume(resume_data, job_desc)
+        if "skill_gap" in requested and job_desc:
+            llm_stages["skill_gap"] = llm_service.get_skill_gap_analysis(resume_data, job_desc)
+        if "vibe" in requested:
+            llm_stages["vibe_feedback"] = llm_service.vibe_check_feedback(resume_data, job_url)
+        
+        outputs = await asyncio.gather(*llm_stages.values())
+        for key, output in zip(llm_stages, outputs):
+            result[key] = output.model_dump() if key == "analysis" else output
+    
+    return result
 
 @router.post("/analyze", response_model=dict)
 async def analyze_resume_endpoint(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     job_description: str = Form(None),
     job_url: str = Form(None)
 ):
     """Analyze a resume file - main endpoint called by frontend"""
     
-    # Validate file
-    if not file.filename:
-        raise HTTPException(status_code=400, detail="No file provided")
-    
-    file_ext = Path(file.filename).suffix.lower()
-    if file_ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Unsupported file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
-        )
-    
-    # Check file size
-    file_content = await file.read()
-    if len(file_content) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=400, detail="File too large. Maximum size: 10MB")
+    # Validate, size-check and hash the upload while streaming it
+    upload = await ingest_upload(file)
     
     try:
-        # Save uploaded file
         file_id = str(uuid.uuid4())
-        file_path = UPLOAD_DIR / f"{file_id}{file_ext}"
-        
-        with open(file_path, "wb") as f:
-            f.write(file_content)
         
-        # Parse resume
-        resume_data = await resume_parser.parse_resume(str(file_path))
-        
-        # Initialize LLM service if not already done
-        if not llm_service.is_available:
-            await llm_service.initialize()
+        # Parse resume straight from the upload buffer (cached by content hash)
+        _, resume_data = await resume_parser.parse_upload(upload)
         
         # Prepare job description for analysis if provided
-        job_desc = None
-        if job_description and job_description.strip():
-            # Extract skills from job description (simple keyword extraction)
-            common_skills = ['python', 'javascript', 'react', 'node.js', 'sql', 'aws', 'docker', 'kubernetes', 'git', 'agile']
-            description_lower = job_description.lower()
-            found_skills = [skill for skill in common_skills if skill in description_lower]
-            
-            job_desc = JobDescription(
-                title="Target Position",
-                company="Target Company",
-                description=job_description.strip(),
-                required_skills=found_skills[:5],  # Top 5 found skills
-                preferred_skills=found_skills[5:],  # Additional skills
-                url=job_url.strip() if job_url and job_url.strip() else None
-            )
+        job_desc = _job_description_from_form(job_description, job_url)
         
         # Analyze resume (works with or without job description)
         analysis = await llm_service.analyze_resume(resume_data, job_desc)
@@ -175,9 +348,6 @@ async def analyze_resume_endpoint(
         # Get vibe check feedback
         vibe_feedback = await llm_service.vibe_check_feedback(resume_data, job_url)
         
-        # Schedule file cleanup
-        background_tasks.add_task(cleanup_file, file_path)
-        
         return {
             "success": True,
             "file_id": file_id,
@@ -195,11 +365,103 @@ async def analyze_resume_endpoint(
         
     except Exception as e:
         logger.error(f"Error processing resume: {e}")
-        # Clean up file if it was created
-        if 'file_path' in locals() and file_path.exists():
-            file_path.unlink()
         raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
 
+@router.post("/analyze/stream")
+async def analyze_resume_stream(
+    file: UploadFile = File(...),
+    job_description: str = Form(None),
+    job_url: str = Form(None)
+):
+    """Analyze a resume file, streaming the LLM review as Server-Sent Events
+    
+    Sends an ``analysis`` event with the rule-based score as soon as the file
+    is parsed, one ``token`` event per chunk of LLM text as Ollama produces
+    it, and a final ``done`` event carrying the same fields as ``/analyze``
+    (an ``error`` event instead if the analysis fails part way).
+    """
+    
+    # Validate, size-check and hash the upload while streaming it
+    upload = await ingest_upload(file)
+    
+    try:
+        # Parse before the stream starts so a bad file is still a plain HTTP error
+        _, resume_data = await resume_parser.parse_upload(upload)
+        job_desc = _job_description_from_form(job_description, job_url)
+        analysis = llm_service.score_resume(resume_data, job_desc)
+        
+    except Exception as e:
+        logger.error(f"Error processing resume: {e}")
+        raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
+    
+    file_id = str(uuid.uuid4())
+    
+    async def stream_events():
+        # Skill gap and vibe check run alongside the streamed review
+        skill_gap_task = (asyncio.create_task(llm_service.get_skill_gap_analysis(resume_data, job_desc))
+                          if job_desc else None)
+        vibe_task = asyncio.create_task(llm_service.vibe_check_feedback(resume_data, job_url))
+        try:
+            yield _sse("analysis", {"file_id": file_id, **analysis.model_dump()})
+            
+            if llm_service.is_available:
+                review = []
+                async for token in llm_service.stream_analysis(resume_data, job_desc):
+                    review.append(token)
+                    yield _sse("token", {"text": token})
+                llm_service.add_llm_suggestions(analysis, "".join(review))
+            
+            skill_gap = await skill_gap_task if skill_gap_task else None
+            vibe_feedback = await vibe_task
+            yield _sse("done", {
+                "success": True,
+                "file_id": file_id,
+                "score": analysis.score,
+                "strengths": analysis.strengths,
+                "weaknesses": analysis.weaknesses,
+                "suggestions": analysis.suggestions,
+                "missing_skills": analysis.missing_skills,
+                "keyword_matches": analysis.keyword_matches,
+                "skill_gap": skill_gap,
+                "vibe_feedback": vibe_feedback,
+                "has_job_description": job_desc is not None,
+                "message": "Resume analyzed successfully"
+            })
+        except Exception as e:
+            logger.error(f"Error streaming resume analysis: {e}")
+            yield _sse("error", {"detail": f"Error processing resume: {str(e)}"})
+        finally:
+            # Client went away: stop the LLM calls still in flight
+            tasks = [task for task in (skill_gap_task, vibe_task) if task is not None]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    return StreamingResponse(stream_events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+def _sse(event: str, data: dict) -> str:
+    """One Server-Sent Event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _job_description_from_form(job_description: str = None, job_url: str = None) -> JobDescription:
+    """Build a JobDescription from form fields, or None when no description was given"""
+    
+    if not job_description or not job_description.strip():
+        return None
+    
+    # Extract skills from job description (shared skills taxonomy)
+    found_skills = find_skills(job_description)
+    
+    return JobDescription(
+        title="Target Position",
+        company="Target Company",
+        description=job_description.strip(),
+        required_skills=found_skills[:5],  # Top 5 found skills
+        preferred_skills=found_skills[5:],  # Additional skills
+        url=job_url.strip() if job_url and job_url.strip() else None
+    )
+
 @router.post("/analyze-text")
 async def analyze_resume_text(
     resume_text: str = Form(...),
@@ -305,24 +567,12 @@ async def get_vibe_check(file_id: str, job_url: str = None):
         "message": "Vibe check completed"
     }
 
-async def cleanup_file(file_path: Path):
-    """Background task to clean up uploaded files"""
-    try:
-        if file_path.exists():
-            file_path.unlink()
-            logger.info(f"Cleaned up file: {file_path}")
-    except Exception as e:
-        logger.error(f"Error cleaning up file {file_path}: {e}")
-
 @router.get("/health")
 async def health_check():
     """Health check for resume analysis service"""
-    # Initialize LLM service if not already done
-    if not llm_service.is_available:
-        await llm_service.initialize()
-    
     return {
         "status": "healthy",
         "service": "resume_analysis",
-        "llm_available": llm_service.is_available
+        "llm_available": llm_service.is_available,
+        "llm_circuit": llm_service.breaker.state
     }
@@ -0,0 +1,233 @@
+"""
+Batch ATS scoring
+Scores many resumes at once by evaluating the ATS rules on NumPy feature arrays
+"""
+
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.services.ats_rules import (
+    CATEGORIES, REQUIRED_SECTIONS, TABLE_BORDER_CHARS, DECORATIVE_CHARS, BULLET_CHARS, MAX_FONT_FAMILIES,
+    Features, Rule, RuleReport, is_ats_friendly_font
+)
+
+# A vectorized finding: which documents it applies to, the points it takes
+# off, and its issue message (fixed, per document, or None for score-only)
+VectorFinding = Tuple[np.ndarray, Union[float, np.ndarray], Union[None, str, Callable[[int], str]]]
+
+
+class FeatureArrays:
+    """Per-document features of a batch, one array entry per document"""
+
+    def __init__(self, batch: Sequence[Features]):
+        self.size = len(batch)
+        self.file_ext = np.array([features.file_ext for features in batch], dtype=object)
+        self.table_borders = np.array([features.count(TABLE_BORDER_CHARS) for features in batch])
+        self.decorative = np.array([features.count(DECORATIVE_CHARS) for features in batch])
+        self.bullet_types = np.array([sum(1 for char in BULLET_CHARS if features.characters[char])
+                                      for features in batch])
+        self.tabs = np.array([features.characters['\t'] for features in batch])
+        self.max_blanks = np.array([features.max_consecutive_blanks for features in batch])
+        self.headers = np.array([len(features.sections.headers) for features in batch])
+        self.caps_headers = np.array([len(features.sections.caps_headers) for features in batch])
+        self.missing_sections = [[section for section in REQUIRED_SECTIONS if section not in features.sections]
+                                 for features in batch]
+        self.missing_count = np.array([len(missing) for missing in self.missing_sections])
+        self.first_line = [(features.first_content_line or '').lower() for features in batch]
+        self.has_email = np.array([features.contact.email is not None for features in batch], dtype=bool)
+        self.has_phone = np.array([features.contact.phone is not None for features in batch], dtype=bool)
+        self.no_pages = np.array([features.source is None or features.source.page_count == 0
+                                  for features in batch], dtype=bool)
+        self.selectable = np.array([features.source is not None and features.source.text_selectable
+                                    for features in batch], dtype=bool)
+        inspections = [features.inspection for features in batch]
+        self.inspected = np.array([inspection is not None for inspection in inspections], dtype=bool)
+        self.has_images = np.array([inspection is not None and inspection.has_images
+                                    for inspection in inspections], dtype=bool)
+        self.multi_column = np.array([inspection is not None and inspection.multi_column
+                                      for inspection in inspections], dtype=bool)
+        self.font_families = [inspection.font_families if inspection is not None else []
+                              for inspection in inspections]
+        self.family_count = np.array([len(families) for families in self.font_families])
+        self.uncommon_fonts = [[family for family in families if not is_ats_friendly_font(family)]
+                               for families in self.font_families]
+        self.unembedded_fonts = [inspection.unembedded_fonts if inspection is not None else []
+                                 for inspection in inspections]
+        self.word_count = np.array([features.word_count for features in batch], dtype=np.int64)
+        self.unique_keywords = np.array([len(features.keyword_counts) for features in batch])
+        self.total_keywords = np.array([sum(features.keyword_counts.values()) for features in batch],
+                                       dtype=np.int64)
+
+        # Line lengths of all documents laid end to end, with the owning document of each
+        lengths = [features.line_lengths for features in batch]
+        self.line_count = np.array([len(doc_lengths) for doc_lengths in lengths], dtype=np.int64)
+        self.line_lengths = np.fromiter((length for doc_lengths in lengths for length in doc_lengths),
+                                        dtype=np.int64, count=int(self.line_count.sum()))
+        self.line_owner = np.repeat(np.arange(self.size), self.line_count)
+
+
+def _long_line_counts(arrays: FeatureArrays) -> np.ndarray:
+    """Lines longer than twice their document's average line length"""
+    totals = np.bincount(arrays.line_owner, weights=arrays.line_lengths, minlength=arrays.size)
+    average = np.divide(totals, arrays.line_count, out=np.zeros(arrays.size), where=arrays.line_count > 0)
+    is_long = arrays.line_lengths > average[arrays.line_owner] * 2
+    return np.bincount(arrays.line_owner, weights=is_long, minlength=arrays.size)
+
+
+def keyword_density(arrays: FeatureArrays) -> np.ndarray:
+    return np.divide(arrays.total_keywords, arrays.word_count, out=np.zeros(arrays.size),
+                     where=arrays.word_count > 0) * 100
+
+
+# Vectorized counterparts of the rules in ats_rules, keyed by rule name. Each
+# must yield exactly the findings its scalar rule yields for every document.
+
+def file_format(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    mask = ~np.isin(arrays.file_ext, ['.pdf', '.docx', '.doc'])
+    yield mask, 20, "Use PDF or DOCX format for better ATS compatibility"
+
+
+def table_borders(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    yield arrays.table_borders > 0, 15, "Contains table borders or complex formatting that may confuse ATS"
+
+
+def decorative_symbols(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    yield arrays.decorative > 5, 10, "Too many special characters/symbols - use simple bullets (•)"
+
+
+def bullet_points(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    yield arrays.bullet_types == 0, 10, "No bullet points detected - use consistent bullet formatting"
+    yield arrays.bullet_types > 1, 5, "Inconsistent bullet point styles - stick to one type"
+
+
+def images(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    yield arrays.has_images, 10, "Contains images or graphics - ATS cannot read text inside them"
+
+
+def multi_column_layout(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    yield arrays.multi_column, 15, "Multi-column layout detected - ATS may read the columns out of order"
+
+
+def blank_lines(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    yield arrays.max_blanks > 2, 10, "Too many consecutive blank lines - limit to 1-2 for section breaks"
+
+
+def line_lengths(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    mask = (arrays.line_count > 0) & (_long_line_counts(arrays) > arrays.line_count * 0.1)
+    yield mask, 8, "Inconsistent line lengths may indicate formatting issues"
+
+
+def section_spacing(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    yield arrays.headers < 3, 12, "Sections may not be clearly separated - use consistent header formatting"
+
+
+def tab_characters(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    yield arrays.tabs > 0, 5, "Contains tab characters - use spaces for consistent formatting"
+
+
+def pdf_fonts(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    is_pdf = arrays.file_ext == '.pdf'
+    yield is_pdf & arrays.no_pages, 10, "Could not analyze PDF font properties"
+    yield is_pdf & ~arrays.no_pages & ~arrays.selectable, 30, \
+        "PDF text is not selectable - may be an image or have font issues"
+
+
+def font_families(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    has_uncommon = np.array([bool(uncommon) for uncommon in arrays.uncommon_fonts], dtype=bool)
+    yield has_uncommon, 10, lambda index: (
+        f"Uncommon fonts may not parse reliably: {', '.join(arrays.uncommon_fonts[index])} - "
+        f"use Arial, Calibri, Times New Roman, or Helvetica")
+    yield arrays.family_count > MAX_FONT_FAMILIES, 5, \
+        lambda index: f"Uses {arrays.family_count[index]} font families - stick to one or two"
+
+
+def font_embedding(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    mask = np.array([bool(unembedded) for unembedded in arrays.unembedded_fonts], dtype=bool)
+    yield mask, 15, lambda index: (
+        f"Fonts not embedded in the PDF: {', '.join(arrays.unembedded_fonts[index])} - embed fonts when exporting")
+
+
+def font_advice(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    uninspected = ~arrays.inspected
+    yield uninspected, 0, "Use ATS-friendly fonts: Arial, Calibri, Times New Roman, or Helvetica"
+    yield uninspected, 0, "Font size should be 10-12pt for body text, 14-16pt for headers"
+
+
+def required_sections(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    yield arrays.missing_count > 0, 15 * arrays.missing_count, \
+        lambda index: f"Missing required sections: {', '.join(arrays.missing_sections[index])}"
+
+
+def contact_first(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    mask = np.array([('experience' in line or 'education' in line) for line in arrays.first_line], dtype=bool)
+    yield mask, 10, "Contact information should appear before other sections"
+
+
+def header_formatting(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    yield arrays.caps_headers < 2, 12, "Section headers should be in ALL CAPS or clearly formatted"
+
+
+def email_present(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    yield ~arrays.has_email, 20, "No email address found - essential for ATS parsing"
+
+
+def phone_present(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    yield ~arrays.has_phone, 10, "No phone number detected - include for better ATS compatibility"
+
+
+def keyword_variety(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    unique = arrays.unique_keywords
+    penalty = np.select([unique > 10, unique > 5, unique > 2], [0, 10, 20], 30)
+    yield np.ones(arrays.size, dtype=bool), penalty, None
+
+
+def keyword_density_range(arrays: FeatureArrays) -> Iterator[VectorFinding]:
+    density = keyword_density(arrays)
+    optimal = (density >= 2.0) & (density <= 5.0)
+    acceptable = ((density >= 1.0) & (density < 2.0)) | ((density > 5.0) & (density <= 7.0))
+    penalty = np.select([optimal, acceptable], [0, 10], 20)
+    yield np.ones(arrays.size, dtype=bool), penalty, None
+
+
+VECTOR_RULES: Dict[str, Callable[[FeatureArrays], Iterator[VectorFinding]]] = {
+    check.__name__: check for check in (
+        file_format, table_borders, decorative_symbols, bullet_points, images, multi_column_layout,
+        blank_lines, line_lengths, section_spacing, tab_characters,
+        pdf_fonts, font_families, font_embedding, font_advice,
+        required_sections, contact_first, header_formatting, email_present, phone_present,
+        keyword_variety, keyword_density_range,
+    )
+}
+
+
+def evaluate_batch(batch: Sequence[Features],
+                   rules: Sequence[Rule]) -> Optional[Tuple[List[RuleReport], Dict[str, np.ndarray]]]:
+    """Evaluate rules over a batch of feature sets at once
+
+    Returns one report per document (issues and penalties, as the scalar
+    engine would produce them) plus the per-category score arrays, or None
+    when some rule has no vectorized counterpart.
+    """
+    if any(rule.name not in VECTOR_RULES for rule in rules):
+        return None
+    if not batch:
+        return [], {category: np.zeros(0) for category in CATEGORIES}
+
+    arrays = FeatureArrays(batch)
+    reports = [RuleReport(features) for features in batch]
+    penalties = {category: np.zeros(arrays.size) for category in CATEGORIES}
+
+    for rule in rules:
+        for mask, penalty, message in VECTOR_RULES[rule.name](arrays):
+            penalties[rule.category] += np.where(mask, penalty, 0)
+            if message is None:
+                continue
+            for index in np.flatnonzero(mask):
+                reports[index].issues[rule.category].append(message(index) if callable(message) else message)
+
+    scores = {category: np.maximum(100.0 - penalty, 0) for category, penalty in penalties.items()}
+    for index, report in enumerate(reports):
+        for category in CATEGORIES:
+            report.penalties[category] = float(penalties[category][index])
+    return reports, scores
@@ -0,0 +1,412 @@
+"""
+ATS rule engine
+Declarative ATS rules evaluated over features gathered in one pass over the text
+"""
+
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.services.contact_scanner import ContactDetails
+from app.services.pdf_inspector import PdfInspection
+from app.services.resume_document import ResumeDocument
+from app.services.section_index import SectionIndex
+from app.services.skills_taxonomy import skill_matcher
+
+# Feature groups a rule can ask for. Line-level groups are collected together
+# in a single pass over the document's lines; the others are views the
+# document already caches.
+LINE_STATS = 'line_stats'        # blank runs, non-blank line lengths, first content line
+CHARACTERS = 'characters'        # character histogram
+TOKENS = 'tokens'                # word count and taxonomy keyword counts
+SECTIONS = 'sections'            # section index (known sections, header lines)
+CONTACT = 'contact'              # email/phone scan
+SOURCE = 'source'                # file extension, extraction metadata and PDF inspection
+
+CATEGORIES = ('formatting', 'spacing', 'font', 'sections', 'keywords')
+
+TABLE_BORDER_CHARS = '│┌┐└┘├┤┬┴┼'
+DECORATIVE_CHARS = '★☆●○◆◇▪▫►▲▼◄'
+BULLET_CHARS = ('•', '-', '*')
+ATS_FRIENDLY_FONTS = ('arial', 'calibri', 'times new roman', 'helvetica', 'georgia',
+                      'verdana', 'tahoma', 'trebuchet ms', 'garamond')
+# Families matched by prefix, ignoring case and spaces; "times" covers the
+# standard Times-Roman, and the standard symbol fonts only draw bullets
+_FRIENDLY_FAMILY_PREFIXES = tuple(font.replace(' ', '') for font in ATS_FRIENDLY_FONTS) + (
+    'times', 'symbol', 'zapfdingbats')
+MAX_FONT_FAMILIES = 3
+
+# A finding is an issue message (None for a pure score adjustment) and the
+# points it takes off its category's score of 100
+Finding = Tuple[Optional[str], float]
+
+
+class Features:
+    """Everything the rules look at, computed once per document"""
+
+    def __init__(self, document: ResumeDocument, filename: str, source: Optional[ResumeDocument] = None,
+                 inspection: Optional[PdfInspection] = None):
+        self.document = document
+        # The extracted upload, for page and font metadata; may differ from
+        # ``document`` when the caller supplied replacement text
+        self.source = source
+        # Font and layout inspection of the source PDF, when there is one
+        self.inspection = inspection
+        self.file_ext = Path(filename).suffix.lower()
+        self.max_consecutive_blanks = 0
+        self.line_lengths: List[int] = []
+        self.first_content_line: Optional[str] = None
+        self.characters: Counter = Counter()
+        self.word_count = 0
+        self.keyword_counts: Dict[str, int] = {}
+
+    def count(self, chars: Iterable[str]) -> int:
+        """Occurrences of any of the given characters"""
+        return sum(self.characters[char] for char in chars)
+
+    @property
+    def sections(self) -> SectionIndex:
+        return self.document.sections
+
+    @property
+    def contact(self) -> ContactDetails:
+        return self.document.contact
+
+
+def extract_features(document: ResumeDocument, filename: str, needed: Iterable[str],
+                     source: Optional[ResumeDocument] = None,
+                     inspection: Optional[PdfInspection] = None) -> Features:
+    """Collect the requested feature groups, reading each line once
+
+    Section and contact features are the document's own cached views, built
+    once and shared with the parser.
+    """
+    needed = set(needed)
+    features = Features(document, filename, source, inspection)
+    line_stats, characters, tokens = LINE_STATS in needed, CHARACTERS in needed, TOKENS in needed
+
+    if line_stats or characters or tokens:
+        consecutive_blanks = 0
+        keyword_counts: Dict[str, int] = {}
+        for line in document.lines:
+            if characters:
+                features.characters.update(line)
+            if tokens:
+                words = line.split()
+                features.word_count += len(words)
+                # Taxonomy terms never span lines, so per-line counts add up
+                # to the whole-text count
+                if words:
+                    for _, _, keyword in skill_matcher.iter_matches(line):
+                        keyword_counts[keyword] = keyword_counts.get(keyword, 0) + 1
+            if line_stats:
+                stripped = line.strip()
+                if not stripped:
+                    consecutive_blanks += 1
+                    features.max_consecutive_blanks = max(features.max_consecutive_blanks, consecutive_blanks)
+                else:
+                    consecutive_blanks = 0
+                    features.line_lengths.append(len(line))
+                    if features.first_content_line is None:
+                        features.first_content_line = stripped
+        features.keyword_counts = keyword_counts
+    return features
+
+
+class Rule:
+    """One ATS check: the features it reads and a function yielding findings"""
+
+    __slots__ = ('name', 'category', 'features', 'check')
+
+    def __init__(self, name: str, category: str, features: Iterable[str],
+                 check: Callable[[Features], Iterable[Finding]]):
+        if category not in CATEGORIES:
+            raise ValueError(f"Unknown ATS rule category: {category}")
+        self.name = name
+        self.category = category
+        self.features = frozenset(features)
+        self.check = check
+
+
+# Rules in evaluation order; within a category, issues are reported in this order
+RULES: List[Rule] = []
+
+
+def ats_rule(category: str, *features: str, registry: Optional[List[Rule]] = None) -> Callable:
+    """Register a check function as an ATS rule (in ``RULES`` unless another registry is given)"""
+    def register(check: Callable[[Features], Iterable[Finding]]) -> Callable:
+        (RULES if registry is None else registry).append(Rule(check.__name__, category, features, check))
+        return check
+    return register
+
+
+class RuleReport:
+    """Findings, category scores and timings from one evaluation"""
+
+    def __init__(self, features: Features):
+        self.features = features
+        self.issues: Dict[str, List[str]] = {category: [] for category in CATEGORIES}
+        self.penalties: Dict[str, float] = {category: 0.0 for category in CATEGORIES}
+        # Seconds spent per rule, plus the shared feature pass
+        self.timings: Dict[str, float] = {}
+
+    def score(self, category: str) -> float:
+        return max(100.0 - self.penalties[category], 0)
+
+
+class RuleEngine:
+    """Evaluates a set of rules against a document
+
+    Features are computed once for the union of what the rules declare,
+    so adding a rule never adds a scan of the text.
+    """
+
+    def __init__(self, rules: Optional[Iterable[Rule]] = None):
+        self.rules = list(RULES if rules is None else rules)
+        self.features = frozenset().union(*(rule.features for rule in self.rules))
+
+    def evaluate(self, document: ResumeDocument, filename: str,
+                 source: Optional[ResumeDocument] = None,
+                 inspection: Optional[PdfInspection] = None) -> RuleReport:
+        started = time.perf_counter()
+        features = extract_features(document, filename, self.features, source, inspection)
+        return self.run(features, feature_time=time.perf_counter() - started)
+
+    def run(self, features: Features, feature_time: float = 0.0) -> RuleReport:
+        """Evaluate the rules against features the caller has already gathered"""
+        report = RuleReport(features)
+        report.timings['features'] = feature_time
+
+        for rule in self.rules:
+            started = time.perf_counter()
+            for issue, penalty in rule.check(features):
+                if issue is not None:
+                    report.issues[rule.category].append(issue)
+                report.penalties[rule.category] += penalty
+            report.timings[rule.name] = time.perf_counter() - started
+        return report
+
+
+# Formatting
+
+@ats_rule('formatting', SOURCE)
+def file_format(features: Features) -> Iterator[Finding]:
+    if features.file_ext not in ['.pdf', '.docx', '.doc']:
+        yield "Use PDF or DOCX format for better ATS compatibility", 20
+
+
+@ats_rule('formatting', CHARACTERS)
+def table_borders(features: Features) -> Iterator[Finding]:
+    if features.count(TABLE_BORDER_CHARS):
+        yield "Contains table borders or complex formatting that may confuse ATS", 15
+
+
+@ats_rule('formatting', CHARACTERS)
+def decorative_symbols(features: Features) -> Iterator[Finding]:
+    if features.count(DECORATIVE_CHARS) > 5:
+        yield "Too many special characters/symbols - use simple bullets (•)", 10
+
+
+@ats_rule('formatting', CHARACTERS)
+def bullet_points(features: Features) -> Iterator[Finding]:
+    bullet_types = sum(1 for char in BULLET_CHARS if features.characters[char])
+    if bullet_types == 0:
+        yield "No bullet points detected - use consistent bullet formatting", 10
+    elif bullet_types > 1:
+        yield "Inconsistent bullet point styles - stick to one type", 5
+
+
+@ats_rule('formatting', SOURCE)
+def images(features: Features) -> Iterator[Finding]:
+    inspection = features.inspection
+    if inspection is not None and inspection.has_images:
+        yield "Contains images or graphics - ATS cannot read text inside them", 10
+
+
+@ats_rule('formatting', SOURCE)
+def multi_column_layout(features: Features) -> Iterator[Finding]:
+    inspection = features.inspection
+    if inspection is not None and inspection.multi_column:
+        yield "Multi-column layout detected - ATS may read the columns out of order", 15
+
+
+# Spacing
+
+@ats_rule('spacing', LINE_STATS)
+def blank_lines(features: Features) -> Iterator[Finding]:
+    if features.max_consecutive_blanks > 2:
+        yield "Too many consecutive blank lines - limit to 1-2 for section breaks", 10
+
+
+@ats_rule('spacing', LINE_STATS)
+def line_lengths(features: Features) -> Iterator[Finding]:
+    lengths = features.line_lengths
+    if lengths:
+        avg_length = sum(lengths) / len(lengths)
+        long_lines = sum(1 for length in lengths if length > avg_length * 2)
+        if long_lines > len(lengths) * 0.1:  # More than 10% are unusually long
+            yield "Inconsistent line lengths may indicate formatting issues", 8
+
+
+@ats_rule('spacing', SECTIONS)
+def section_spacing(features: Features) -> Iterator[Finding]:
+    if len(features.sections.headers) < 3:
+        yield "Sections may not be clearly separated - use consistent header formatting", 12
+
+
+@ats_rule('spacing', CHARACTERS)
+def tab_characters(features: Features) -> Iterator[Finding]:
+    if features.characters['\t']:
+        yield "Contains tab characters - use spaces for consistent formatting", 5
+
+
+# Fonts
+
+@ats_rule('font', SOURCE)
+def pdf_fonts(features: Features) -> Iterator[Finding]:
+    if features.file_ext == '.pdf':
+        # Selectable text indicates proper font embedding
+        source = features.source
+        if source is None or source.page_count == 0:
+            yield "Could not analyze PDF font properties", 10
+        elif not source.text_selectable:
+            yield "PDF text is not selectable - may be an image or have font issues", 30
+
+
+def is_ats_friendly_font(family: str) -> bool:
+    return family.lower().replace(' ', '').startswith(_FRIENDLY_FAMILY_PREFIXES)
+
+
+@ats_rule('font', SOURCE)
+def font_families(features: Features) -> Iterator[Finding]:
+    inspection = features.inspection
+    if inspection is None:
+        return
+    families = inspection.font_families
+    uncommon = [family for family in families if not is_ats_friendly_font(family)]
+    if uncommon:
+        yield (f"Uncommon fonts may not parse reliably: {', '.join(uncommon)} - "
+               f"use Arial, Calibri, Times New Roman, or Helvetica"), 10
+    if len(families) > MAX_FONT_FAMILIES:
+        yield f"Uses {len(families)} font families - stick to one or two", 5
+
+
+@ats_rule('font', SOURCE)
+def font_embedding(features: Features) -> Iterator[Finding]:
+    inspection = features.inspection
+    if inspection is not None and inspection.unembedded_fonts:
+        yield (f"Fonts not embedded in the PDF: {', '.join(inspection.unembedded_fonts)} - "
+               f"embed fonts when exporting"), 15
+
+
+@ats_rule('font', SOURCE)
+def font_advice(features: Features) -> Iterator[Finding]:
+    # Without a PDF to inspect, fall back to general advice
+    if features.inspection is None:
+        yield "Use ATS-friendly fonts: Arial, Calibri, Times New Roman, or Helvetica", 0
+        yield "Font size should be 10-12pt for body text, 14-16pt for headers", 0
+
+
+# Sections
+
+REQUIRED_SECTIONS = ['experience', 'education', 'skills']
+
+
+@ats_rule('sections', SECTIONS)
+def required_sections(features: Features) -> Iterator[Finding]:
+    missing = [section for section in REQUIRED_SECTIONS if section not in features.sections]
+    if missing:
+        yield f"Missing required sections: {', '.join(missing)}", 15 * len(missing)
+
+
+@ats_rule('sections', LINE_STATS)
+def contact_first(features: Features) -> Iterator[Finding]:
+    first_line = (features.first_content_line or '').lower()
+    if 'experience' in first_line or 'education' in first_line:
+        yield "Contact information should appear before other sections", 10
+
+
+@ats_rule('sections', SECTIONS)
+def header_formatting(features: Features) -> Iterator[Finding]:
+    # Known headers in title case still count as sections, but not as formatted headers
+    if len(features.sections.caps_headers) < 2:
+        yield "Section headers should be in ALL CAPS or clearly formatted", 12
+
+
+@ats_rule('sections', CONTACT)
+def email_present(features: Features) -> Iterator[Finding]:
+    if features.contact.email is None:
+        yield "No email address found - essential for ATS parsing", 20
+
+
+@ats_rule('sections', CONTACT)
+def phone_present(features: Features) -> Iterator[Finding]:
+    if features.contact.phone is None:
+        yield "No phone number detected - include for better ATS compatibility", 10
+
+
+# Keywords: the category starts from 50 and earns up to 30 for variety and
+# 20 for density, expressed as points short of each maximum
+
+def keyword_density(features: Features) -> float:
+    total = sum(features.keyword_counts.values())
+    return (total / features.word_count) * 100 if features.word_count > 0 else 0
+
+
+@ats_rule('keywords', TOKENS)
+def keyword_variety(features: Features) -> Iterator[Finding]:
+    unique = len(features.keyword_counts)
+    if unique > 10:
+        yield None, 0
+    elif unique > 5:
+        yield None, 10
+    elif unique > 2:
+        yield None, 20
+    else:
+        yield None, 30
+
+
+@ats_rule('keywords', TOKENS)
+def keyword_density_range(features: Features) -> Iterator[Finding]:
+    density = keyword_density(features)
+    if 2.0 <= density <= 5.0:
+        yield None, 0
+    elif 1.0 <= density < 2.0 or 5.0 < density <= 7.0:
+        yield None, 10
+    else:
+        yield None, 20
+
+
+# Quick check: text-only rules for pasted resumes. They keep the quick
+# check's own wording and lighter penalties, which the /quick-check score
+# has always been built from, rather than the full validation's.
+
+QUICK_RULES: List[Rule] = []
+
+
+@ats_rule('formatting', TOKENS, registry=QUICK_RULES)
+def resume_length(features: Features) -> Iterator[Finding]:
+    if features.word_count < 200:
+        yield "Resume appears too short (< 200 words)", 20
+    elif features.word_count > 1000:
+        yield "Resume may be too long (> 1000 words)", 10
+
+
+@ats_rule('sections', CONTACT, registry=QUICK_RULES)
+def quick_email(features: Features) -> Iterator[Finding]:
+    if features.contact.email is None:
+        yield "No email address found", 15
+
+
+@ats_rule('sections', CONTACT, registry=QUICK_RULES)
+def quick_phone(features: Features) -> Iterator[Finding]:
+    if features.contact.phone is None:
+        yield "No phone number detected", 10
+
+
+@ats_rule('sections', SECTIONS, registry=QUICK_RULES)
+def quick_headers(features: Features) -> Iterator[Finding]:
+    # Any recognizable header counts here, ALL CAPS or not
+    if len(features.sections.headers) < 2:
+        yield "Sections may not be clearly defined", 15
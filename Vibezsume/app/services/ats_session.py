@@ -0,0 +1,213 @@
+"""
+Live ATS session service
+Keeps an edited resume's per-line features and re-scores only the lines an edit touches
+"""
+
+import logging
+import re
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate
+from typing import Dict, List, Optional, Set
+
+from app.models.resume_models import ATSValidationResult
+from app.services import patterns
+from app.services.ats_rules import Features
+from app.services.ats_validator import ATSValidator
+from app.services.contact_scanner import ContactDetails
+from app.services.section_index import classify_header
+from app.services.skills_taxonomy import skill_matcher
+
+logger = logging.getLogger(__name__)
+
+# PHONE allows three single-character separators, each of which may be a
+# newline, so a phone number spans at most this many lines
+PHONE_MAX_LINES = 4
+
+
+class LineFeatures:
+    """The rule features of a single line, the unit an edit invalidates"""
+
+    __slots__ = ('text', 'characters', 'word_count', 'keywords', 'header_name', 'is_header', 'is_caps',
+                 'email', 'phone_window')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.characters = Counter(text)
+        words = text.split()
+        self.word_count = len(words)
+        # Taxonomy terms never span lines (see extract_features)
+        self.keywords = Counter(keyword for _, _, keyword in skill_matcher.iter_matches(text)) if words else Counter()
+        self.header_name, self.is_caps = classify_header(text) if words else (None, False)
+        self.is_header = self.header_name is not None or self.is_caps
+        # Email addresses contain no whitespace, so they never span lines either
+        email = patterns.EMAIL.search(text) if '@' in text else None
+        self.email = email.group(1) if email else None
+        # Whether a phone number starts within the PHONE_MAX_LINES lines from
+        # this one; depends on the following lines, so computed by the session
+        self.phone_window: Optional[bool] = None
+
+    @property
+    def blank(self) -> bool:
+        return self.word_count == 0
+
+
+class SessionSections:
+    """The section view the ATS rules read, aggregated from per-line header flags
+
+    A stand-in for ``SectionIndex``: the rules only count headers and test
+    which sections are present, so the session never builds section spans.
+    """
+
+    def __init__(self, headers: List[str], caps_headers: List[str], names: Set[str]):
+        self.headers = headers
+        self.caps_headers = caps_headers
+        self.names = names
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.names
+
+
+class SessionFeatures(Features):
+    """Rule features of a session, whose section and contact views come from its lines"""
+
+    def __init__(self, filename: str, sections: SessionSections, contact: ContactDetails):
+        super().__init__(None, filename)
+        self._sections = sections
+        self._contact = contact
+
+    @property
+    def sections(self) -> SessionSections:
+        return self._sections
+
+    @property
+    def contact(self) -> ContactDetails:
+        return self._contact
+
+
+class ATSSession:
+    """A resume being edited live, re-scored after every edit
+
+    Character, keyword, header and email features are kept per line, so an
+    edit re-analyzes only the lines it touches; scoring then sums the cached
+    per-line values without rejoining or rescanning the text. Phone numbers
+    may wrap onto the next few lines, so each line also caches whether one
+    starts near it, and an edit clears that flag on the lines just above it.
+    Line start offsets are kept as a prefix sum for locating edits.
+    """
+
+    def __init__(self, text: str = "", filename: str = "resume.txt",
+                 validator: Optional[ATSValidator] = None):
+        self.filename = filename
+        self.validator = validator or ATSValidator()
+        self.lines: List[LineFeatures] = []
+        # Character offset at which each line starts
+        self.offsets: List[int] = []
+        self.characters: Counter = Counter()
+        self.word_count = 0
+        self.length = 0
+        self.reset(text)
+
+    @property
+    def text(self) -> str:
+        return '\n'.join(line.text for line in self.lines)
+
+    def reset(self, text: str) -> None:
+        """Replace the whole document"""
+        self.lines = []
+        self.offsets = []
+        self.characters = Counter()
+        self.word_count = 0
+        self._splice(0, 0, text.split('\n'))
+        self.length = len(text)
+
+    def apply(self, start: int, end: int, text: str) -> None:
+        """Replace the characters in ``[start, end)`` with ``text``
+
+        Offsets count Unicode code points of the current text.
+        """
+        if not 0 <= start <= end <= self.length:
+            raise ValueError(f"Edit range {start}-{end} is outside the document (length {self.length})")
+
+        # Find the lines holding both ends of the range
+        first = self._locate(start)
+        last = self._locate(end)
+        head = self.lines[first].text[:start - self.offsets[first]]
+        tail = self.lines[last].text[end - self.offsets[last]:]
+
+        self._splice(first, last + 1, (head + text + tail).split('\n'))
+        self.length += len(text) - (end - start)
+
+    def _locate(self, offset: int) -> int:
+        """Index of the line containing ``offset``"""
+        return bisect_right(self.offsets, offset) - 1
+
+    def _splice(self, first: int, last: int, new_lines: List[str]) -> None:
+        """Swap lines ``[first, last)`` for new ones, updating the running totals"""
+        for line in self.lines[first:last]:
+            self.characters.subtract(line.characters)
+            self.word_count -= line.word_count
+        replacement = [LineFeatures(text) for text in new_lines]
+        for line in replacement:
+            self.characters.update(line.characters)
+            self.word_count += line.word_count
+        self.lines[first:last] = replacement
+        # Phone windows reaching into the replaced lines are stale
+        for line in self.lines[max(first - PHONE_MAX_LINES + 1, 0):first]:
+            line.phone_window = None
+
+        # Offsets before ``first`` are unchanged; recompute the rest
+        start = self.offsets[first - 1] + len(self.lines[first - 1].text) + 1 if first else 0
+        self.offsets[first:] = accumulate((len(line.text) + 1 for line in self.lines[first:-1]), initial=start)
+
+    def _find_phone(self) -> Optional[re.Match]:
+        """The first phone number, found through the cached per-line windows"""
+        lines = self.lines
+        for index, line in enumerate(lines):
+            if line.phone_window is None:
+                window = '\n'.join(other.text for other in lines[index:index + PHONE_MAX_LINES])
+                line.phone_window = patterns.PHONE.search(window) is not None
+            if line.phone_window:
+                # No number starts before this line and one starts within
+                # PHONE_MAX_LINES of it, so it ends within twice that
+                end = index + 2 * PHONE_MAX_LINES - 1
+                return patterns.PHONE.search('\n'.join(other.text for other in lines[index:end]))
+        return None
+
+    def features(self) -> Features:
+        """Rule features of the current text, assembled from the per-line features"""
+        sections = SessionSections([], [], set())
+        phone = self._find_phone()
+        contact = ContactDetails(phone=phone.group() if phone else None,
+                                 phone_parts=list(phone.groups()) if phone else None)
+        features = SessionFeatures(self.filename, sections, contact)
+        features.characters = +self.characters
+        features.word_count = self.word_count
+
+        keyword_counts: Dict[str, int] = {}
+        consecutive_blanks = 0
+        for line in self.lines:
+            for keyword, count in line.keywords.items():
+                keyword_counts[keyword] = keyword_counts.get(keyword, 0) + count
+            if line.is_header:
+                sections.headers.append(line.text.strip())
+                if line.is_caps:
+                    sections.caps_headers.append(line.text.strip())
+                if line.header_name is not None:
+                    sections.names.add(line.header_name)
+            if contact.email is None:
+                contact.email = line.email
+            if line.blank:
+                consecutive_blanks += 1
+                features.max_consecutive_blanks = max(features.max_consecutive_blanks, consecutive_blanks)
+            else:
+                consecutive_blanks = 0
+                features.line_lengths.append(len(line.text))
+                if features.first_content_line is None:
+                    features.first_content_line = line.text.strip()
+        features.keyword_counts = keyword_counts
+        return features
+
+    def validate(self) -> ATSValidationResult:
+        """Score the current text"""
+        return self.validator.validate_features(self.features())
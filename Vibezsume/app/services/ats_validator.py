@@ -3,265 +3,177 @@ ATS (Applicant Tracking System) validator service
 Analyzes resume formatting, spacing, and ATS compatibility
 """
 
-import re
 import logging
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Sequence, Union
+
+import numpy as np
 from pathlib import Path
-import PyPDF2
-import docx
 from app.models.resume_models import ATSValidationResult
+from starlette.concurrency import run_in_threadpool
+
+from app.services.extraction_pool import extraction_pool
+from app.services.pdf_inspector import PdfInspection, inspect_pdf
+from app.services.text_extraction import ExtractedDocument
+from app.services.resume_document import ResumeDocument
+from app.services.ats_rules import (
+    ATS_FRIENDLY_FONTS, CATEGORIES, QUICK_RULES, RuleEngine, RuleReport, Features, extract_features, keyword_density
+)
+from app.services.ats_batch import evaluate_batch
 
 logger = logging.getLogger(__name__)
 
+# Share of the overall score carried by each rule category
+CATEGORY_WEIGHTS = {
+    'formatting': 0.25,
+    'spacing': 0.20,
+    'font': 0.15,
+    'sections': 0.25,
+    'keywords': 0.15
+}
+
 class ATSValidator:
     def __init__(self):
-        self.ats_friendly_fonts = [
-            'arial', 'calibri', 'times new roman', 'helvetica', 'georgia',
-            'verdana', 'tahoma', 'trebuchet ms', 'garamond'
-        ]
+        self.ats_friendly_fonts = list(ATS_FRIENDLY_FONTS)
         
         self.problematic_elements = [
             'text boxes', 'headers', 'footers', 'tables', 'images',
             'graphics', 'columns', 'watermarks'
         ]
-
-    async def validate_resume(self, file_path: str, resume_text: str) -> ATSValidationResult:
-        """Comprehensive ATS validation of resume"""
-        
-        # Perform various validation checks
-        formatting_score, formatting_issues = self._check_formatting(file_path, resume_text)
-        spacing_score, spacing_issues = self._check_spacing(resume_text)
-        font_score, font_issues = self._check_font_compatibility(file_path)
-        section_score, section_issues = self._check_section_structure(resume_text)
-        keyword_score, keyword_analysis = self._analyze_keyword_optimization(resume_text)
         
-        # Calculate overall score
-        overall_score = (
-            formatting_score * 0.25 +
-            spacing_score * 0.20 +
-            font_score * 0.15 +
-            section_score * 0.25 +
-            keyword_score * 0.15
-        )
+        self.engine = RuleEngine()
+        self.quick_engine = RuleEngine(QUICK_RULES)
+
+    async def validate_resume(self, file_path: str, resume_text: str,
+                              document: Optional[ExtractedDocument] = None) -> ATSValidationResult:
+        """Comprehensive ATS validation of resume
+
+        Pass the ``document`` already extracted for the resume parser to avoid
+        reading the file again; ``file_path`` then only needs to carry the
+        original filename, and the font and layout checks fall back to
+        general advice.
+        """
+        inspection = None
+        if document is None:
+            if Path(file_path).suffix.lower() != '.pdf':
+                return self.validate_text(resume_text, Path(file_path).suffix)
+            document = await extraction_pool.extract_document(file_path, '.pdf')
+            inspection = await run_in_threadpool(inspect_pdf, file_path)
+
+        return self.validate_document(document, file_path, resume_text, inspection=inspection)
+
+    def validate_text(self, resume_text: str, file_format: str = '.txt',
+                      include_timings: bool = False) -> ATSValidationResult:
+        """Validate resume text as if it came from a file of the declared format
+
+        Works entirely in memory. A declared PDF has no pages to inspect, so
+        its font check reports that fonts could not be analyzed.
+        """
+        file_ext = '.' + file_format.lower().lstrip('.')
+        document = ExtractedDocument.from_text(resume_text, file_ext)
+        return self.validate_document(document, f"resume{file_ext}", include_timings=include_timings)
+
+    def quick_check(self, resume_text: Union[str, ResumeDocument]) -> Dict[str, Any]:
+        """Score text on the quick-check rules: length, contact details and headers"""
+        report = self.quick_engine.evaluate(ResumeDocument.of(resume_text), "resume.txt")
+        return {
+            'quick_score': max(100.0 - sum(report.penalties.values()), 0),
+            'word_count': report.features.word_count,
+            'issues': [issue for category in CATEGORIES for issue in report.issues[category]]
+        }
+
+    def validate_document(self, document: ExtractedDocument, filename: str,
+                          resume_text: Optional[str] = None,
+                          include_timings: bool = False,
+                          inspection: Optional[PdfInspection] = None) -> ATSValidationResult:
+        """Run every ATS rule against a single extracted document
+
+        ``inspection`` is the source PDF's font and layout inspection (see
+        ``PdfInspector.inspect_upload``); without one the font checks give
+        general advice. With ``include_timings`` the result also reports the
+        seconds spent in the shared feature pass and in each rule.
+        """
+        
+        # Check the document's own views unless the caller supplied other text
+        if resume_text is None or resume_text == document.text:
+            resume = document
+        else:
+            resume = ResumeDocument(resume_text)
+        
+        # One feature pass over the text, then every rule
+        report = self.engine.evaluate(resume, filename, source=document, inspection=inspection)
+        
+        return self._build_result(report, self._overall_score(report), include_timings)
+
+    def validate_features(self, features: Features, include_timings: bool = False) -> ATSValidationResult:
+        """Run every ATS rule against features the caller maintains itself
+
+        Used by live editing sessions, which update their features line by
+        line as edits arrive instead of rescanning the whole text.
+        """
+        report = self.engine.run(features)
+        return self._build_result(report, self._overall_score(report), include_timings)
+
+    def validate_batch(self, documents: Sequence[ExtractedDocument], filenames: Sequence[str],
+                       inspections: Optional[Sequence[Optional[PdfInspection]]] = None) -> List[ATSValidationResult]:
+        """Validate many documents at once
+
+        Features are still gathered per document, but the rules and scores
+        are computed on NumPy arrays across the whole batch. Results are
+        identical to calling ``validate_document`` on each document.
+        """
+        if inspections is None:
+            inspections = [None] * len(documents)
+        batch = [extract_features(document, filename, self.engine.features, source=document, inspection=inspection)
+                 for document, filename, inspection in zip(documents, filenames, inspections)]
+        evaluated = evaluate_batch(batch, self.engine.rules)
+        if evaluated is None:
+            # Some rule only has a scalar implementation
+            return [self.validate_document(document, filename, inspection=inspection)
+                    for document, filename, inspection in zip(documents, filenames, inspections)]
+        
+        reports, scores = evaluated
+        overall_scores = np.zeros(len(reports))
+        for category, weight in CATEGORY_WEIGHTS.items():
+            overall_scores = overall_scores + scores[category] * weight
+        
+        return [self._build_result(report, float(overall_score))
+                for report, overall_score in zip(reports, overall_scores)]
+
+    @staticmethod
+    def _overall_score(report: RuleReport) -> float:
+        return sum(report.score(category) * weight for category, weight in CATEGORY_WEIGHTS.items())
+
+    def _build_result(self, report: RuleReport, overall_score: float,
+                      include_timings: bool = False) -> ATSValidationResult:
+        """Assemble the API result from a rule report and its overall score"""
+        keyword_analysis = self._keyword_analysis(report.features)
+        inspection = report.features.inspection
         
         # Generate recommendations
         recommendations = self._generate_recommendations(
-            formatting_issues, spacing_issues, font_issues, section_issues, keyword_analysis
+            report.issues['formatting'], report.issues['spacing'], report.issues['font'],
+            report.issues['sections'], keyword_analysis
         )
         
         return ATSValidationResult(
             overall_score=round(overall_score, 1),
-            formatting_issues=formatting_issues,
-            spacing_issues=spacing_issues,
-            font_issues=font_issues,
-            section_issues=section_issues,
+            formatting_issues=report.issues['formatting'],
+            spacing_issues=report.issues['spacing'],
+            font_issues=report.issues['font'],
+            section_issues=report.issues['sections'],
             keyword_optimization=keyword_analysis,
-            recommendations=recommendations
+            recommendations=recommendations,
+            rule_timings=report.timings if include_timings else None,
+            pdf_inspection=inspection.summary() if inspection is not None else None
         )
 
-    def _check_formatting(self, file_path: str, text: str) -> Tuple[float, List[str]]:
-        """Check for ATS-friendly formatting"""
-        issues = []
-        score = 100.0
-        
-        file_path = Path(file_path)
-        
-        # Check file format
-        if file_path.suffix.lower() not in ['.pdf', '.docx', '.doc']:
-            issues.append("Use PDF or DOCX format for better ATS compatibility")
-            score -= 20
-        
-        # Check for complex formatting indicators in text
-        if re.search(r'[│┌┐└┘├┤┬┴┼]', text):
-            issues.append("Contains table borders or complex formatting that may confuse ATS")
-            score -= 15
-        
-        # Check for excessive special characters
-        special_chars = len(re.findall(r'[★☆●○◆◇▪▫►▲▼◄]', text))
-        if special_chars > 5:
-            issues.append("Too many special characters/symbols - use simple bullets (•)")
-            score -= 10
-        
-        # Check for proper bullet points
-        if '•' not in text and '-' not in text and '*' not in text:
-            issues.append("No bullet points detected - use consistent bullet formatting")
-            score -= 10
-        
-        # Check for mixed bullet styles
-        bullet_types = sum([1 for char in ['•', '-', '*'] if char in text])
-        if bullet_types > 1:
-            issues.append("Inconsistent bullet point styles - stick to one type")
-            score -= 5
-        
-        return max(score, 0), issues
-
-    def _check_spacing(self, text: str) -> Tuple[float, List[str]]:
-        """Check spacing and layout issues"""
-        issues = []
-        score = 100.0
-        
-        lines = text.split('\n')
-        
-        # Check for excessive blank lines
-        consecutive_blanks = 0
-        max_consecutive_blanks = 0
-        for line in lines:
-            if not line.strip():
-                consecutive_blanks += 1
-                max_consecutive_blanks = max(max_consecutive_blanks, consecutive_blanks)
-            else:
-                consecutive_blanks = 0
-        
-        if max_consecutive_blanks > 2:
-            issues.append("Too many consecutive blank lines - limit to 1-2 for section breaks")
-            score -= 10
-        
-        # Check line length consistency
-        non_empty_lines = [line for line in lines if line.strip()]
-        if non_empty_lines:
-            avg_length = sum(len(line) for line in non_empty_lines) / len(non_empty_lines)
-            long_lines = sum(1 for line in non_empty_lines if len(line) > avg_length * 2)
-            
-            if long_lines > len(non_empty_lines) * 0.1:  # More than 10% are unusually long
-                issues.append("Inconsistent line lengths may indicate formatting issues")
-                score -= 8
-        
-        # Check for proper section spacing
-        section_headers = re.findall(r'\n([A-Z][A-Z\s]+)\n', text)
-        if len(section_headers) < 3:
-            issues.append("Sections may not be clearly separated - use consistent header formatting")
-            score -= 12
-        
-        # Check for tabs vs spaces (tabs can cause issues)
-        if '\t' in text:
-            issues.append("Contains tab characters - use spaces for consistent formatting")
-            score -= 5
-        
-        return max(score, 0), issues
-
-    def _check_font_compatibility(self, file_path: str) -> Tuple[float, List[str]]:
-        """Check font compatibility with ATS systems"""
-        issues = []
-        score = 100.0
-        
-        # For PDF files, we can do basic checks
-        if Path(file_path).suffix.lower() == '.pdf':
-            try:
-                with open(file_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    
-                    # Check if PDF is text-selectable (indicates proper font embedding)
-                    text_extractable = False
-                    for page in pdf_reader.pages:
-                        if page.extract_text().strip():
-                            text_extractable = True
-                            break
-                    
-                    if not text_extractable:
-                        issues.append("PDF text is not selectable - may be an image or have font issues")
-                        score -= 30
-                
-            except Exception as e:
-                issues.append("Could not analyze PDF font properties")
-                score -= 10
-        
-        # General font recommendations
-        issues.append("Use ATS-friendly fonts: Arial, Calibri, Times New Roman, or Helvetica")
-        issues.append("Font size should be 10-12pt for body text, 14-16pt for headers")
-        
-        return max(score, 0), issues
-
-    def _check_section_structure(self, text: str) -> Tuple[float, List[str]]:
-        """Check for proper resume section structure"""
-        issues = []
-        score = 100.0
-        
-        required_sections = ['experience', 'education', 'skills']
-        optional_sections = ['summary', 'objective', 'projects', 'certifications']
-        
-        text_lower = text.lower()
-        
-        # Check for required sections
-        missing_required = []
-        for section in required_sections:
-            if section not in text_lower:
-                missing_required.append(section)
-        
-        if missing_required:
-            issues.append(f"Missing required sections: {', '.join(missing_required)}")
-            score -= 15 * len(missing_required)
-        
-        # Check section order (contact info should be first)
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        if lines:
-            first_section = lines[0].lower()
-            if 'experience' in first_section or 'education' in first_section:
-                issues.append("Contact information should appear before other sections")
-                score -= 10
-        
-        # Check for clear section headers
-        potential_headers = re.findall(r'\n([A-Z][A-Z\s]{2,})\n', text)
-        if len(potential_headers) < 2:
-            issues.append("Section headers should be in ALL CAPS or clearly formatted")
-            score -= 12
-        
-        # Check for contact information
-        if not re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text):
-            issues.append("No email address found - essential for ATS parsing")
-            score -= 20
-        
-        if not re.search(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', text):
-            issues.append("No phone number detected - include for better ATS compatibility")
-            score -= 10
-        
-        return max(score, 0), issues
-
-    def _analyze_keyword_optimization(self, text: str) -> Tuple[float, Dict[str, Any]]:
-        """Analyze keyword density and optimization"""
-        
-        # Common industry keywords to check for
-        tech_keywords = [
-            'python', 'java', 'javascript', 'react', 'sql', 'aws', 'docker',
-            'kubernetes', 'git', 'agile', 'scrum', 'api', 'database', 'cloud',
-            'machine learning', 'data analysis', 'project management', 'leadership',
-            'problem solving', 'teamwork', 'communication', 'analytical'
-        ]
-        
-        text_lower = text.lower()
-        word_count = len(text.split())
-        
-        # Count keyword occurrences
-        keyword_counts = {}
-        total_keywords = 0
-        
-        for keyword in tech_keywords:
-            count = text_lower.count(keyword)
-            if count > 0:
-                keyword_counts[keyword] = count
-                total_keywords += count
-        
-        # Calculate keyword density
-        keyword_density = (total_keywords / word_count) * 100 if word_count > 0 else 0
-        
-        # Score based on keyword presence and density
-        score = 50.0  # Base score
-        
-        if len(keyword_counts) > 10:
-            score += 30  # Good keyword variety
-        elif len(keyword_counts) > 5:
-            score += 20
-        elif len(keyword_counts) > 2:
-            score += 10
-        
-        if 2.0 <= keyword_density <= 5.0:
-            score += 20  # Optimal keyword density
-        elif 1.0 <= keyword_density < 2.0 or 5.0 < keyword_density <= 7.0:
-            score += 10  # Acceptable density
-        
-        return min(score, 100), {
-            'keyword_density': round(keyword_density, 2),
+    def _keyword_analysis(self, features: Features) -> Dict[str, Any]:
+        """Keyword density and counts behind the keyword score"""
+        keyword_counts = {keyword.lower(): count for keyword, count in features.keyword_counts.items()}
+        return {
+            'keyword_density': round(keyword_density(features), 2),
             'found_keywords': keyword_counts,
-            'total_keywords': total_keywords,
+            'total_keywords': sum(keyword_counts.values()),
             'unique_keywords': len(keyword_counts)
         }
 
@@ -0,0 +1,95 @@
+"""
+Circuit breaker
+Tracks a backend's health so calls to it are skipped while it is known to be down
+"""
+
+import logging
+import time
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker with exponential backoff between retries
+
+    Closed: calls go through and consecutive failures are counted; reaching
+    ``failure_threshold`` (or a ``trip``) opens the breaker. Open: calls are
+    refused until the backoff elapses, then a single trial call is let
+    through (half-open). A successful trial closes the breaker; a failed one
+    reopens it with the backoff doubled, up to ``max_backoff``.
+    """
+
+    def __init__(self, failure_threshold: int = 3, backoff: float = 5.0, max_backoff: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic, name: str = "backend"):
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_backoff = backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.name = name
+        self.state = CLOSED
+        self.failures = 0
+        self.backoff = backoff
+        self.retry_at = 0.0
+        self.stats = {"opened": 0, "rejected": 0, "trials": 0}
+
+    @property
+    def closed(self) -> bool:
+        return self.state == CLOSED
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; claims the trial slot when one is due"""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and self.clock() >= self.retry_at:
+            self.state = HALF_OPEN
+            self.stats["trials"] += 1
+            return True
+        self.stats["rejected"] += 1
+        return False
+
+    def seconds_until_retry(self) -> float:
+        return max(self.retry_at - self.clock(), 0.0) if self.state == OPEN else 0.0
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            logger.info(f"{self.name} recovered - circuit closed")
+        self.state = CLOSED
+        self.failures = 0
+        self.backoff = self.base_backoff
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker at the threshold or after a failed trial"""
+        self.failures += 1
+        if self.state == HALF_OPEN:
+            self.backoff = min(self.backoff * 2, self.max_backoff)
+            self._open()
+        elif self.state == CLOSED and self.failures >= self.failure_threshold:
+            self._open()
+
+    def trip(self) -> None:
+        """Open the breaker at once, e.g. after a failed health probe"""
+        self.failures += 1
+        if self.state == HALF_OPEN:
+            self.backoff = min(self.backoff * 2, self.max_backoff)
+        if self.state != OPEN:
+            self._open()
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.retry_at = self.clock() + self.backoff
+        self.stats["opened"] += 1
+        logger.warning(f"{self.name} unavailable - circuit open, retrying in {self.backoff:.0f}s")
+
+    def status(self) -> Dict[str, object]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "backoff_seconds": self.backoff,
+            "retry_in_seconds": round(self.seconds_until_retry(), 1),
+            **self.stats
+        }
@@ -0,0 +1,76 @@
+"""
+Contact scanner service
+Finds email, phone, LinkedIn, GitHub and name in a single pass over resume text
+"""
+
+from typing import Any, Dict, List, Optional
+
+from app.services import patterns
+
+# The name is looked for among the first lines of the resume
+NAME_SEARCH_LINES = 5
+NAME_MAX_WORDS = 4
+
+
+class ContactDetails:
+    """Contact details found in a resume; None where nothing was found
+
+    Produced once per document (see ``ResumeDocument.contact``) and shared
+    by the parser, the ATS contact checks and the quick check.
+    """
+
+    __slots__ = ('full_name', 'email', 'phone', 'phone_parts', 'linkedin', 'github')
+
+    def __init__(self, full_name: Optional[str] = None, email: Optional[str] = None,
+                 phone: Optional[str] = None, phone_parts: Optional[List[str]] = None,
+                 linkedin: Optional[str] = None, github: Optional[str] = None):
+        self.full_name = full_name
+        self.email = email
+        # The phone number as written, and its area code/exchange/line digits
+        self.phone = phone
+        self.phone_parts = phone_parts
+        self.linkedin = linkedin
+        self.github = github
+
+    @property
+    def formatted_phone(self) -> Optional[str]:
+        """The phone number as "(555) 123-4567" """
+        if not self.phone_parts:
+            return None
+        area, exchange, line = self.phone_parts
+        return f"({area}) {exchange}-{line}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+def scan_contact(text: str) -> ContactDetails:
+    """Scan resume text for contact details, keeping the first of each kind
+
+    Each pattern is searched independently so a phone number or profile URL
+    running straight into an address cannot hide it; every search stops at
+    its first match and is linear in the text.
+    """
+    email = patterns.EMAIL.search(text)
+    phone = patterns.PHONE.search(text)
+    linkedin = patterns.LINKEDIN.search(text)
+    github = patterns.GITHUB.search(text)
+
+    return ContactDetails(
+        full_name=_find_name(text),
+        email=email.group(1) if email else None,
+        phone=phone.group() if phone else None,
+        phone_parts=list(phone.groups()) if phone else None,
+        linkedin=f"https://{linkedin.group()}" if linkedin else None,
+        github=f"https://{github.group()}" if github else None
+    )
+
+
+def _find_name(text: str) -> Optional[str]:
+    """First short line near the top without digits, links or an address"""
+    for line in text.split('\n', NAME_SEARCH_LINES)[:NAME_SEARCH_LINES]:
+        line = line.strip()
+        if (line and not any(char in line for char in ['@', 'http', '+'])
+                and len(line.split()) <= NAME_MAX_WORDS and not patterns.DIGIT.search(line)):
+            return line
+    return None
@@ -0,0 +1,195 @@
+"""
+Experience and education extraction
+Line-oriented state machines whose running time is linear in the input
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from app.services.patterns import DATE, CURRENT, DEGREE, INSTITUTION, YEARS_TOKEN, SEGMENT_SEPARATOR
+from app.services.skills_taxonomy import find_skills
+
+# Patterns are applied to a single line at a time and lines are visited
+# once, never rescanned.
+
+BULLET_CHARS = '•-*▪◦‣●○■□➢►·\x7f'
+MAX_DESCRIPTION_ITEMS = 5
+MAX_EXPERIENCE_YEARS = 60
+
+
+def _is_bullet(line: str) -> bool:
+    return line[0] in BULLET_CHARS or (line[0].isdigit() and line[1:3] in ('. ', ') '))
+
+
+def _strip_bullet(line: str) -> str:
+    return line.lstrip(BULLET_CHARS + '0123456789.) ').strip()
+
+
+def _has_date(line: str) -> bool:
+    return DATE.search(line) is not None or CURRENT.search(line) is not None
+
+
+class _Job:
+    __slots__ = ('header', 'description', 'dated')
+
+    def __init__(self, line: str):
+        self.header = [line]
+        self.description: List[str] = []
+        self.dated = _has_date(line)
+
+    def add_header(self, line: str) -> None:
+        self.header.append(line)
+        self.dated = self.dated or _has_date(line)
+
+
+def extract_experience_entries(lines: Iterable[str]) -> List[Dict[str, object]]:
+    """Split an experience section into jobs
+
+    A job is one to three header lines (title, company, dates in any order)
+    followed by bullet or free-text description lines. A dated line after
+    a job's description opens the next job; up to two undated lines just
+    before it are taken as that job's company/title.
+    """
+    jobs: List[_Job] = []
+    current: Optional[_Job] = None
+    in_description = False
+    pending: List[str] = []
+
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+
+        if _is_bullet(line):
+            if current is not None:
+                current.description.extend(pending)
+                current.description.append(_strip_bullet(line))
+                in_description = True
+            pending = []
+            continue
+
+        dated = _has_date(line)
+        if current is None:
+            current = _Job(line)
+            jobs.append(current)
+        elif in_description:
+            if dated:
+                current = _Job(pending[0] if pending else line)
+                for header in pending[1:] + ([line] if pending else []):
+                    current.add_header(header)
+                jobs.append(current)
+                pending = []
+                in_description = False
+            else:
+                pending.append(line)
+                if len(pending) > 2:
+                    current.description.append(pending.pop(0))
+        elif current.dated and dated:
+            # Back-to-back dated headers: one-line jobs without descriptions
+            current = _Job(line)
+            jobs.append(current)
+        elif current.dated or len(current.header) >= 3:
+            current.description.append(line)
+            in_description = True
+        else:
+            current.add_header(line)
+
+    if current is not None:
+        current.description.extend(pending)
+
+    return [_job_fields(job) for job in jobs if job.dated or job.description]
+
+
+def _job_fields(job: _Job) -> Dict[str, object]:
+    header_text = ' | '.join(job.header)
+    dates = DATE.findall(header_text)
+
+    parts = [part.strip() for part in header_text.split('|') if part.strip()] or [header_text]
+    labels = [part for part in parts if not _has_date(part)] or parts
+    if len(job.header) == 1 and len(labels) >= 2:
+        # "Title | Company | 2020 - 2023"
+        position, company = labels[0], labels[1]
+    elif len(labels) >= 2:
+        # "Company" / "Title" / "2020 - 2023" on separate lines
+        company, position = labels[0], labels[1]
+    else:
+        company, position = labels[0], "Position"
+
+    end_date = dates[1] if len(dates) > 1 else None
+    if CURRENT.search(header_text):
+        end_date = None
+
+    return {
+        "company": company,
+        "position": position,
+        "start_date": dates[0] if dates else "2020",
+        "end_date": end_date,
+        "description": job.description[:MAX_DESCRIPTION_ITEMS],
+        "technologies": find_skills('\n'.join(job.header + job.description)),
+    }
+
+
+def extract_education_entries(lines: Iterable[str]) -> List[Dict[str, Optional[str]]]:
+    """Group degree, institution and year lines of an education section into entries"""
+    entries: List[Dict[str, Optional[str]]] = []
+    current: Optional[Dict[str, Optional[str]]] = None
+
+    for raw in lines:
+        line = _strip_bullet(raw) if raw.strip() else ''
+        if not line:
+            continue
+
+        segments = [segment.strip() for segment in SEGMENT_SEPARATOR.split(line) if segment.strip()]
+        degree = next((segment for segment in segments if DEGREE.search(segment)), None)
+        institution = next((segment for segment in segments if INSTITUTION.search(segment)), None)
+        years = DATE.findall(line)
+
+        if degree is None and institution is None:
+            if years and current is not None and current["end_date"] is None:
+                current["end_date"] = years[-1]
+            continue
+
+        # A line completes the open entry when it supplies only the missing part
+        if (current is not None
+                and (degree is None or current["degree"] is None)
+                and (institution is None or current["institution"] is None)):
+            current["degree"] = current["degree"] or degree
+            current["institution"] = current["institution"] or institution
+        else:
+            current = {"degree": degree, "institution": institution, "end_date": None}
+            entries.append(current)
+        if years:
+            current["end_date"] = years[-1]
+
+    results = []
+    for entry in entries:
+        degree = entry["degree"] or entry["institution"]
+        _, _, field = degree.partition(' in ')
+        results.append({
+            "institution": entry["institution"] or "Institution",
+            "degree": degree,
+            "field_of_study": field.strip() or None,
+            "end_date": entry["end_date"],
+        })
+    return results
+
+
+def extract_experience_years(text: str) -> int:
+    """Years of experience claimed in free text, from a single token scan
+
+    Recognizes "N years of experience", "N+ years in ..." and any
+    "N years" mentioned after the word "experience"; the largest wins.
+    """
+    tokens = YEARS_TOKEN.findall(text.lower())
+    seen_experience = False
+    years = 0
+    for index, token in enumerate(tokens):
+        if token == 'experience':
+            seen_experience = True
+        elif token.isdigit() and index + 1 < len(tokens) and tokens[index + 1] in ('year', 'years', 'yrs'):
+            following = tokens[index + 2:index + 4]
+            if (seen_experience or 'experience' in following[:1]
+                    or following[:2] == ['of', 'experience'] or following[:1] == ['in']):
+                value = int(token[:3])
+                if value <= MAX_EXPERIENCE_YEARS:
+                    years = max(years, value)
+    return years
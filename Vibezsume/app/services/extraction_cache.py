@@ -0,0 +1,100 @@
+"""
+Extraction cache service
+Content-addressed cache of extracted documents and parsed resumes
+"""
+
+import json
+import logging
+import os
+from typing import Optional
+
+from app.models.resume_models import ResumeData
+from app.services.bloom_filter import BloomFilter
+from app.services.text_extraction import ExtractedDocument
+from app.services.tiered_cache import TieredCache
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+CACHE_PATH = os.getenv("EXTRACTION_CACHE_PATH", "cache/extraction_cache.sqlite3")
+MEMORY_MAX_BYTES = int(os.getenv("EXTRACTION_CACHE_MEMORY_MB", "64")) * 1024 * 1024
+DISK_MAX_BYTES = int(os.getenv("EXTRACTION_CACHE_DISK_MB", "512")) * 1024 * 1024
+BLOOM_CAPACITY = int(os.getenv("EXTRACTION_CACHE_BLOOM_CAPACITY", "100000"))
+
+# Version of the cached extraction and parse output. Bump it whenever the
+# extractors, the resume parser or the ExtractedDocument/ResumeData models
+# change what they produce; rows written under another version are dropped.
+CACHE_VERSION = 2
+
+
+class CachedExtraction:
+    """A cached extraction result and, once parsed, the resume data"""
+
+    def __init__(self, document: ExtractedDocument, resume_data: Optional[ResumeData] = None):
+        self.document = document
+        self.resume_data = resume_data
+
+
+class ExtractionCache(TieredCache):
+    """Two-tier cache keyed by the SHA-256 of the upload bytes
+
+    An in-process LRU answers repeat uploads without deserializing anything;
+    an on-disk SQLite tier survives restarts (see ``TieredCache``). A Bloom
+    filter over every key ever stored lets ``might_contain`` reject unknown
+    hashes without touching either tier. Rows carry the ``CACHE_VERSION``
+    they were written under, so an upgraded parser never serves parses made
+    by an older one.
+    """
+
+    def __init__(self, path: Optional[str] = CACHE_PATH, memory_max_bytes: int = MEMORY_MAX_BYTES,
+                 disk_max_bytes: int = DISK_MAX_BYTES, enabled: bool = CACHE_ENABLED):
+        super().__init__("extractions", path, memory_max_bytes, disk_max_bytes, enabled, version=CACHE_VERSION)
+        self._known = BloomFilter(BLOOM_CAPACITY)
+        self.stats["bloom_rejections"] = 0
+        if self._db is not None:
+            for (key,) in self._db.execute("SELECT cache_key FROM extractions"):
+                self._known.add(key)
+
+    @staticmethod
+    def make_key(sha256: str, file_ext: str) -> str:
+        # The extension picks the extractor, so identical bytes under another
+        # extension are a different entry
+        return f"{sha256}{file_ext.lower()}"
+
+    def might_contain(self, sha256: str, file_ext: str) -> bool:
+        """Cheap membership test - False means the content was never cached"""
+        if not self.enabled:
+            return False
+        if self.make_key(sha256, file_ext) in self._known:
+            return True
+        self.stats["bloom_rejections"] += 1
+        return False
+
+    def get(self, sha256: str, file_ext: str) -> Optional[CachedExtraction]:
+        """Look up an extraction, promoting disk hits into memory"""
+        return self._lookup(self.make_key(sha256, file_ext))
+
+    def put(self, sha256: str, file_ext: str, document: ExtractedDocument,
+            resume_data: Optional[ResumeData] = None) -> None:
+        """Store an extraction (and optionally its parse result) in both tiers"""
+        if not self.enabled:
+            return
+        key = self.make_key(sha256, file_ext)
+        text = json.dumps({
+            "document": document.to_dict(),
+            "resume_data": resume_data.model_dump(mode="json") if resume_data is not None else None
+        })
+        self._store(key, CachedExtraction(document, resume_data), text)
+        self._known.add(key)
+
+    def _decode(self, value: str) -> CachedExtraction:
+        data = json.loads(value)
+        resume_data = data["resume_data"]
+        return CachedExtraction(
+            ExtractedDocument.from_dict(data["document"]),
+            ResumeData.model_validate(resume_data) if resume_data is not None else None
+        )
+
+
+# Shared cache used by every upload endpoint
+extraction_cache = ExtractionCache()
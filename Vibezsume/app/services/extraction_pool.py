@@ -0,0 +1,283 @@
+"""
+Extraction process pool
+Runs CPU-bound PDF/DOCX extraction work in warm worker processes off the event loop
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.services import text_extraction
+from app.services.pdf_inspector import PdfInspection, inspect_pdf, pdf_inspector
+
+logger = logging.getLogger(__name__)
+
+POOL_ENABLED = os.getenv("EXTRACTION_POOL_ENABLED", "true").lower() not in ("0", "false", "no")
+POOL_SIZE = int(os.getenv("EXTRACTION_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+TASK_TIMEOUT = float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", "30"))
+MAX_TASKS_PER_CHILD = int(os.getenv("EXTRACTION_MAX_TASKS_PER_CHILD", "0")) or None
+START_METHOD = os.getenv("EXTRACTION_POOL_START_METHOD", "spawn")
+PDF_PAGES_PER_TASK = max(1, int(os.getenv("PDF_PAGES_PER_TASK", "8")))
+
+
+class ExtractionTimeout(Exception):
+    """Raised when an extraction task does not finish within its time budget"""
+
+
+def _warm_worker():
+    """Worker initializer - import the heavy document libraries once per process"""
+    import PyPDF2  # noqa: F401
+
+
+def _worker_pid() -> int:
+    return os.getpid()
+
+
+def _write_temp_file(data: bytes, suffix: str) -> str:
+    """Write bytes to a temporary file the workers can open, returning its path"""
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp:
+        temp.write(data)
+    return temp.name
+
+
+class ExtractionPool:
+    """Pre-forked process pool for document extraction tasks"""
+
+    def __init__(self, max_workers: int = POOL_SIZE, timeout: float = TASK_TIMEOUT,
+                 enabled: bool = POOL_ENABLED):
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.enabled = enabled
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.stats = {"submitted": 0, "completed": 0, "timeouts": 0, "cancelled": 0, "restarts": 0}
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        kwargs = {}
+        if MAX_TASKS_PER_CHILD and START_METHOD != "fork":
+            kwargs["max_tasks_per_child"] = MAX_TASKS_PER_CHILD
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(START_METHOD),
+            initializer=_warm_worker,
+            **kwargs
+        )
+
+    async def start(self):
+        """Create the pool and fork every worker up front so the first request is not cold"""
+        if not self.enabled or self._executor is not None:
+            return
+        self._executor = self._create_executor()
+        futures = [asyncio.wrap_future(self._executor.submit(_worker_pid)) for _ in range(self.max_workers)]
+        pids = set(await asyncio.gather(*futures))
+        logger.info(f"Extraction pool started with {len(pids)} warm workers")
+
+    def shutdown(self):
+        """Stop the workers, dropping any queued tasks"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _restart(self, executor: ProcessPoolExecutor, reason: str, terminate: bool = False):
+        """Replace ``executor`` with a fresh pool, unless another caller already did
+
+        With ``terminate`` the old workers are killed, which is the only way
+        to stop a task a worker has already started. Tasks still pending on
+        the old pool then fail with BrokenProcessPool and are retried by
+        ``run`` on the new one.
+        """
+        if self._executor is not executor:
+            return
+        logger.warning(f"{reason} - restarting workers")
+        self.stats["restarts"] += 1
+        processes = list((executor._processes or {}).values()) if terminate else []
+        executor.shutdown(wait=False, cancel_futures=not terminate)
+        for process in processes:
+            process.terminate()
+        self._executor = self._create_executor()
+
+    async def run(self, fn: Callable[..., Any], *args, timeout: Optional[float] = None,
+                  retry: bool = True) -> Any:
+        """Run ``fn(*args)`` in a worker process and await the result
+
+        Queued tasks are cancelled when the caller is cancelled. When the
+        timeout expires on a task a worker has already started, the workers
+        are killed and replaced so a hung parser cannot hold one forever;
+        other tasks caught in that restart are retried once.
+        """
+        timeout = self.timeout if timeout is None else timeout
+
+        if not self.enabled:
+            try:
+                return await asyncio.wait_for(run_in_threadpool(fn, *args), timeout)
+            except asyncio.TimeoutError:
+                self.stats["timeouts"] += 1
+                raise ExtractionTimeout(f"Extraction exceeded {timeout:.0f}s")
+
+        if self._executor is None:
+            self._executor = self._create_executor()
+
+        executor = self._executor
+        future = executor.submit(fn, *args)
+        self.stats["submitted"] += 1
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+            self.stats["completed"] += 1
+            return result
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            if not future.cancel():
+                # Already running in a worker - cancelling does not stop it
+                self._restart(executor, "Extraction task timed out in a worker", terminate=True)
+            raise ExtractionTimeout(f"Extraction exceeded {timeout:.0f}s")
+        except asyncio.CancelledError:
+            future.cancel()
+            self.stats["cancelled"] += 1
+            raise
+        except BrokenProcessPool:
+            if retry and self._executor is not executor:
+                # Caught in a restart triggered by another task's timeout
+                return await self.run(fn, *args, timeout=timeout, retry=False)
+            self._restart(executor, "Extraction pool broken")
+            raise
+
+    async def extract_document(self, source: text_extraction.DocumentSource,
+                               file_ext: str) -> text_extraction.ExtractedDocument:
+        """Extract a document, offloading PDF/DOCX parsing to workers"""
+        if file_ext.lower() == '.txt':
+            return text_extraction.extract_document(source, file_ext)
+        if hasattr(source, "read"):
+            # A spooled upload past its memory threshold is a file on disk
+            source = await run_in_threadpool(source.read)
+        if file_ext.lower() == '.pdf':
+            return await self.extract_pdf_document(source)
+        return await self.run(text_extraction.extract_document, source, file_ext)
+
+    async def extract_text(self, source: text_extraction.DocumentSource, file_ext: str) -> str:
+        """Extract text from a document, offloading PDF/DOCX parsing to workers"""
+        return (await self.extract_document(source, file_ext)).text
+
+    async def extract_pdf_text(self, source: text_extraction.DocumentSource,
+                               max_pages: Optional[int] = text_extraction.PDF_MAX_PAGES,
+                               max_chars: Optional[int] = text_extraction.PDF_MAX_CHARS,
+                               pages_per_task: int = PDF_PAGES_PER_TASK) -> str:
+        """Extract PDF text with page ranges split across workers"""
+        document = await self.extract_pdf_document(source, max_pages, max_chars, pages_per_task)
+        return document.text
+
+    async def extract_pdf_document(self, source: text_extraction.DocumentSource,
+                                   max_pages: Optional[int] = text_extraction.PDF_MAX_PAGES,
+                                   max_chars: Optional[int] = text_extraction.PDF_MAX_CHARS,
+                                   pages_per_task: int = PDF_PAGES_PER_TASK) -> text_extraction.ExtractedDocument:
+        """Extract a PDF with page ranges split across workers
+
+        The first range also reports the page count. Remaining ranges are
+        dispatched in waves of one range per worker, and no further waves are
+        sent once ``max_chars`` characters have been gathered. In-memory PDFs
+        are written to a temporary file once, so each range task ships a path
+        to its worker rather than another copy of the bytes.
+        """
+        if hasattr(source, "read"):
+            # A spooled upload past its memory threshold is a file on disk
+            source = await run_in_threadpool(source.read)
+        if not self.enabled or not isinstance(source, (bytes, bytearray, memoryview)):
+            return await self._extract_pdf_ranges(source, max_pages, max_chars, pages_per_task)
+
+        try:
+            path = await run_in_threadpool(_write_temp_file, source, '.pdf')
+        except OSError as e:
+            logger.warning(f"Could not spool PDF to disk, sending it to each worker: {e}")
+            return await self._extract_pdf_ranges(source, max_pages, max_chars, pages_per_task)
+        try:
+            return await self._extract_pdf_ranges(path, max_pages, max_chars, pages_per_task)
+        finally:
+            await run_in_threadpool(os.unlink, path)
+
+    async def _extract_pdf_ranges(self, source: text_extraction.DocumentSource, max_pages: Optional[int],
+                                  max_chars: Optional[int], pages_per_task: int) -> text_extraction.ExtractedDocument:
+        first_stop = pages_per_task if max_pages is None else min(pages_per_task, max_pages)
+        try:
+            document = await self.run(
+                text_extraction.extract_pdf_page_range, source, 0, first_stop, max_chars
+            )
+        except ExtractionTimeout:
+            raise
+        except Exception as e:
+            logger.error(f"Error extracting text from PDF: {e}")
+            return text_extraction.ExtractedDocument(file_ext='.pdf')
+
+        last_page = document.page_count if max_pages is None else min(document.page_count, max_pages)
+        ranges = [(start, min(start + pages_per_task, last_page))
+                  for start in range(first_stop, last_page, pages_per_task)]
+
+        while ranges and (max_chars is None or len(document.text) < max_chars):
+            wave, ranges = ranges[:self.max_workers], ranges[self.max_workers:]
+            remaining = None if max_chars is None else max_chars - len(document.text)
+            tasks = [asyncio.ensure_future(
+                self.run(text_extraction.extract_pdf_page_range, source, start, stop, remaining)
+            ) for start, stop in wave]
+            try:
+                results = await asyncio.gather(*tasks)
+            except Exception as e:
+                # gather leaves the other ranges running; free their workers
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                # Keep the pages gathered so far rather than failing the upload
+                logger.warning(f"Stopped PDF extraction after {len(document.pages)} pages: {e}")
+                break
+
+            for page_range in results:
+                document.extend(page_range)
+                if max_chars is not None and len(document.text) >= max_chars:
+                    ranges = []
+                    break
+
+        return document
+
+    async def inspect_pdf(self, sha256: str, source: text_extraction.DocumentSource) -> PdfInspection:
+        """Inspect a PDF in a worker, reusing the inspection of identical content
+
+        Tokenizing content streams holds the GIL, so like extraction it runs
+        in a worker process rather than a thread.
+        """
+        async def inspect() -> PdfInspection:
+            data = source
+            if hasattr(data, "read"):
+                data = await run_in_threadpool(data.read)
+            return await self.run(inspect_pdf, data)
+
+        return await pdf_inspector.inspect_with(sha256, inspect)
+
+    async def inspect_upload(self, upload) -> Optional[PdfInspection]:
+        """Inspect an ingested PDF upload; None for other formats
+
+        A PDF that cannot be inspected is scored without an inspection, as a
+        document with no PDF behind it would be.
+        """
+        if upload.extension != '.pdf':
+            return None
+        try:
+            return await self.inspect_pdf(upload.sha256, upload.rewind())
+        except Exception as e:
+            logger.warning(f"Could not inspect PDF {upload.filename}: {e}")
+            return None
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "running": self._executor is not None,
+            "workers": self.max_workers,
+            "timeout_seconds": self.timeout,
+            **self.stats
+        }
+
+
+# Shared pool - started and stopped by the application lifecycle in main.py
+extraction_pool = ExtractionPool()
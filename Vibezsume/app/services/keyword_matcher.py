@@ -0,0 +1,100 @@
+"""
+Keyword matcher service
+Aho-Corasick automaton that finds every keyword of a vocabulary in one pass
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class KeywordMatcher:
+    """Case-insensitive multi-keyword matcher with word-boundary awareness
+
+    All keywords are compiled into one automaton, so scanning a text costs
+    O(len(text) + matches) however many keywords there are. A keyword only
+    matches where its alphanumeric edges are not glued to other word
+    characters: "java" is not found inside "javascript", while "c++" and
+    ".net" still match next to punctuation.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        # Lowercased keyword -> the spelling it was registered with
+        self.keywords: Dict[str, str] = {}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+
+        for keyword in keywords:
+            key = keyword.strip().lower()
+            if key and key not in self.keywords:
+                self.keywords[key] = keyword.strip()
+                self._insert(key)
+        self._build_failure_links()
+
+    def _insert(self, key: str) -> None:
+        node = 0
+        for char in key:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append(key)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                # Inherit the keywords that end at the fallback state
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield ``(start, end, keyword)`` for every whole-word occurrence"""
+        text = text.lower()
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not output[node]:
+                continue
+            end = index + 1
+            for key in output[node]:
+                start = end - len(key)
+                if self._on_boundary(text, start, end, key):
+                    yield start, end, self.keywords[key]
+
+    @staticmethod
+    def _on_boundary(text: str, start: int, end: int, key: str) -> bool:
+        if key[0].isalnum() and start > 0 and (text[start - 1].isalnum() or text[start - 1] == '_'):
+            return False
+        if key[-1].isalnum() and end < len(text) and (text[end].isalnum() or text[end] == '_'):
+            return False
+        return True
+
+    def find(self, text: str) -> List[str]:
+        """Distinct keywords present in the text, in order of first occurrence"""
+        found = {}
+        for _, _, keyword in self.iter_matches(text):
+            found.setdefault(keyword, None)
+        return list(found)
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Occurrences of each keyword present in the text"""
+        counts: Dict[str, int] = {}
+        for _, _, keyword in self.iter_matches(text):
+            counts[keyword] = counts.get(keyword, 0) + 1
+        return counts
@@ -0,0 +1,57 @@
+"""
+LLM response cache service
+Persistent cache of deterministic LLM completions keyed by model and prompt
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from app.services.tiered_cache import TieredCache
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "cache/llm_cache.sqlite3")
+LLM_CACHE_MEMORY_MAX_BYTES = int(os.getenv("LLM_CACHE_MEMORY_MB", "16")) * 1024 * 1024
+LLM_CACHE_DISK_MAX_BYTES = int(os.getenv("LLM_CACHE_DISK_MB", "128")) * 1024 * 1024
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL_HOURS", "168")) * 3600
+
+
+class LLMCache(TieredCache):
+    """Two-tier cache of LLM responses keyed by a hash of the whole request
+
+    Only safe for deterministic generation (temperature 0 and a fixed seed),
+    where the same model, system prompt, prompt and options always produce
+    the same text. An in-process LRU answers repeats without touching SQLite;
+    the on-disk tier survives restarts (see ``TieredCache``). Entries expire
+    ``ttl`` seconds after they were generated.
+    """
+
+    def __init__(self, path: Optional[str] = LLM_CACHE_PATH, memory_max_bytes: int = LLM_CACHE_MEMORY_MAX_BYTES,
+                 disk_max_bytes: int = LLM_CACHE_DISK_MAX_BYTES, ttl: float = LLM_CACHE_TTL,
+                 enabled: bool = LLM_CACHE_ENABLED):
+        super().__init__("llm_responses", path, memory_max_bytes, disk_max_bytes, enabled, ttl=ttl)
+
+    @staticmethod
+    def make_key(model: str, prompt: str, system_prompt: Optional[str] = None,
+                 options: Optional[Dict[str, Any]] = None) -> str:
+        request = json.dumps([model, system_prompt or "", prompt, options or {}], sort_keys=True)
+        return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a response, promoting disk hits into memory"""
+        return self._lookup(key)
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response in both tiers"""
+        self._store(key, response, response)
+
+    def _decode(self, value: str) -> str:
+        return value
+
+
+# Shared cache used by the shared LLM service
+llm_cache = LLMCache()
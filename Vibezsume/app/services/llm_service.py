@@ -6,75 +6,356 @@ Supports Ollama and other local LLM solutions with fallback demo mode
 import asyncio
 import json
 import logging
-from typing import Dict, List, Optional, Any
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Any, Union
 import httpx
-import re
+from starlette.concurrency import run_in_threadpool
+
+from app.models.resume_models import ResumeData, JobDescription, AnalysisResult
+from app.services.circuit_breaker import CircuitBreaker, OPEN
+from app.services.llm_cache import LLMCache, llm_cache
+from app.services.skills_taxonomy import find_skills
+from app.services.experience_extraction import extract_experience_years
+from app.services.patterns import DIGIT
+from app.services.resume_document import ResumeDocument
 
 logger = logging.getLogger(__name__)
 
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
+
+# Connection pool and timeouts of the shared Ollama client
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "10"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "5"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY_SECONDS", "60"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "5"))
+LLM_READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT_SECONDS", "30"))
+LLM_POOL_TIMEOUT = float(os.getenv("LLM_POOL_TIMEOUT_SECONDS", "10"))
+# The availability probe only lists models, so it gets a short read timeout
+LLM_PROBE_TIMEOUT = float(os.getenv("LLM_PROBE_TIMEOUT_SECONDS", "5"))
+
+# Circuit breaker: consecutive generation failures that mark Ollama as down,
+# and the re-probe backoff (doubled after each failed probe, up to the max)
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "3"))
+LLM_BREAKER_BACKOFF = float(os.getenv("LLM_BREAKER_BACKOFF_SECONDS", "5"))
+LLM_BREAKER_MAX_BACKOFF = float(os.getenv("LLM_BREAKER_MAX_BACKOFF_SECONDS", "300"))
+# How often the background prober re-checks a healthy backend
+LLM_HEALTH_INTERVAL = float(os.getenv("LLM_HEALTH_INTERVAL_SECONDS", "30"))
+
+# Deterministic generation (temperature 0, fixed seed) makes responses cacheable
+LLM_DETERMINISTIC = os.getenv("LLM_DETERMINISTIC", "true").lower() not in ("0", "false", "no")
+LLM_SEED = int(os.getenv("LLM_SEED", "42"))
+
+
+class _Flight:
+    """One in-progress generation and the number of callers awaiting it"""
+
+    __slots__ = ('task', 'waiters')
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+ANALYSIS_SYSTEM_PROMPT = "You are an expert resume reviewer. Reply with short bullet points."
+SUGGESTION_KEYWORDS = ["add", "include", "consider", "use", "improve"]
+
 class LLMService:
-    def __init__(self, model_name: str = "llama3.2:3b"):
+    def __init__(self, model_name: str = "llama3.2:3b", ollama_url: Optional[str] = None,
+                 cache: Optional[LLMCache] = None):
         self.model_name = model_name
-        self.ollama_url = "http://localhost:11434"
+        self.ollama_url = ollama_url or OLLAMA_URL
+        # Responses are only cached in deterministic mode
+        self.cache = cache if LLM_DETERMINISTIC else None
+        # Long-lived keep-alive client, created on first use and closed on shutdown
+        self.client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Whether the last successful probe found a usable model
+        self.model_ready = False
+        self.breaker = CircuitBreaker(LLM_BREAKER_FAILURES, LLM_BREAKER_BACKOFF, LLM_BREAKER_MAX_BACKOFF,
+                                      name="Ollama")
+        self._prober: Optional[asyncio.Task] = None
+        # Generations in progress, keyed by the cache key, or by the request
+        # itself when responses are not cached
+        self._flights: Dict[Union[str, tuple], _Flight] = {}
+        self.pool_stats = {
+            "requests": 0, "in_flight": 0, "peak_in_flight": 0,
+            "pool_timeouts": 0, "connect_errors": 0, "timeouts": 0,
+            "coalesced": 0, "abandoned": 0
+        }
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """The shared client, recreated if it was closed or belongs to another event loop"""
+        loop = asyncio.get_running_loop()
+        if self.client is None or self.client.is_closed or self._client_loop is not loop:
+            self.client = httpx.AsyncClient(
+                base_url=self.ollama_url,
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=LLM_KEEPALIVE_EXPIRY
+                ),
+                timeout=httpx.Timeout(LLM_READ_TIMEOUT, connect=LLM_CONNECT_TIMEOUT, pool=LLM_POOL_TIMEOUT)
+            )
+            self._client_loop = loop
+        return self.client
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request on the pooled client, recording pool usage"""
+        async with self._tracked():
+            return await self._get_client().request(method, path, **kwargs)
+
+    @asynccontextmanager
+    async def _tracked(self):
+        """Record one request's pool usage and failures, streamed or not"""
+        stats = self.pool_stats
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+        stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+        try:
+            yield
+        except httpx.PoolTimeout:
+            # Every connection was busy for the whole pool timeout
+            stats["pool_timeouts"] += 1
+            raise
+        except httpx.ConnectError:
+            stats["connect_errors"] += 1
+            raise
+        except httpx.TimeoutException:
+            stats["timeouts"] += 1
+            raise
+        finally:
+            stats["in_flight"] -= 1
+
+    @property
+    def is_available(self) -> bool:
+        """Whether a model is ready and the backend is not known to be down"""
+        return self.model_ready and self.breaker.closed
+
+    async def close(self):
+        """Close the pooled client and its keep-alive connections"""
+        if self.client is not None and not self.client.is_closed:
+            await self.client.aclose()
         self.client = None
-        self.is_available = False
+        self._client_loop = None
+
+    def status(self) -> Dict[str, Any]:
+        """Client pool configuration and usage"""
+        return {
+            "available": self.is_available,
+            "model": self.model_name,
+            "circuit": self.breaker.status(),
+            "client_open": self.client is not None and not self.client.is_closed,
+            "max_connections": LLM_MAX_CONNECTIONS,
+            "max_keepalive_connections": LLM_MAX_KEEPALIVE_CONNECTIONS,
+            "saturation": round(self.pool_stats["in_flight"] / LLM_MAX_CONNECTIONS, 3),
+            **self.pool_stats
+        }
 
     async def initialize(self):
-        """Initialize the LLM service and check if Ollama is available"""
+        """Check whether Ollama is up and pick a model
+
+        Returns at once, without touching the network, while the circuit
+        breaker is open and its next retry is not yet due.
+        """
+        if not self.breaker.allow():
+            return
+
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.ollama_url}/api/tags")
-                if response.status_code == 200:
-                    models = response.json()
-                    available_models = [model["name"] for model in models.get("models", [])]
-                    
-                    if self.model_name in available_models:
-                        self.is_available = True
+            response = await self._request(
+                "GET", "/api/tags",
+                timeout=httpx.Timeout(LLM_PROBE_TIMEOUT, connect=LLM_CONNECT_TIMEOUT, pool=LLM_POOL_TIMEOUT)
+            )
+            if response.status_code == 200:
+                models = response.json()
+                available_models = [model["name"] for model in models.get("models", [])]
+                
+                self.breaker.record_success()
+                if self.model_name in available_models:
+                    if not self.model_ready:
                         logger.info(f"LLM service initialized with model: {self.model_name}")
-                    else:
-                        logger.warning(f"Model {self.model_name} not found. Available models: {available_models}")
-                        if available_models:
-                            self.model_name = available_models[0]
-                            self.is_available = True
-                            logger.info(f"Using alternative model: {self.model_name}")
+                    self.model_ready = True
                 else:
-                    logger.error(f"Ollama server not responding: {response.status_code}")
+                    logger.warning(f"Model {self.model_name} not found. Available models: {available_models}")
+                    self.model_ready = bool(available_models)
+                    if available_models:
+                        self.model_name = available_models[0]
+                        logger.info(f"Using alternative model: {self.model_name}")
+            else:
+                logger.error(f"Ollama server not responding: {response.status_code}")
+                self.breaker.trip()
         except Exception as e:
             logger.error(f"Could not connect to Ollama: {e}")
             logger.info("Running in demo mode with enhanced mock analysis")
+            self.breaker.trip()
+
+    def start_prober(self):
+        """Start re-probing Ollama in the background: on the breaker's backoff while
+        it is down, every ``LLM_HEALTH_INTERVAL`` seconds while it is up"""
+        if self._prober is None or self._prober.done():
+            self._prober = asyncio.create_task(self._probe_loop())
+
+    async def stop_prober(self):
+        if self._prober is not None:
+            self._prober.cancel()
+            try:
+                await self._prober
+            except asyncio.CancelledError:
+                pass
+            self._prober = None
+
+    async def _probe_loop(self):
+        while True:
+            delay = self.breaker.seconds_until_retry() if self.breaker.state == OPEN else LLM_HEALTH_INTERVAL
+            await asyncio.sleep(delay)
+            await self.initialize()
+
+    def _payload(self, prompt: str, system_prompt: Optional[str], stream: bool) -> Dict[str, Any]:
+        payload = {
+            "model": self.model_name,
+            "prompt": prompt,
+            "stream": stream
+        }
+        if system_prompt:
+            payload["system"] = system_prompt
+        if LLM_DETERMINISTIC:
+            payload["options"] = {"temperature": 0, "seed": LLM_SEED}
+        return payload
+
+    def _cache_key(self, payload: Dict[str, Any]) -> Optional[str]:
+        # Without fixed options the model samples, so there is nothing to reuse
+        if self.cache is None or "options" not in payload:
+            return None
+        return self.cache.make_key(payload["model"], payload["prompt"], payload.get("system"),
+                                   payload["options"])
 
     async def generate_response(self, prompt: str, system_prompt: str = None) -> str:
-        """Generate response from the local LLM with fallback"""
+        """Generate response from the local LLM with fallback
+        
+        Repeat requests are answered from the response cache, even while
+        Ollama is down. Concurrent identical requests (a double-clicked
+        Analyze, the same resume from several tabs) share one generation
+        instead of queueing duplicates on the model.
+        """
+        payload = self._payload(prompt, system_prompt, stream=False)
+        cache_key = self._cache_key(payload)
+        if cache_key is not None:
+            cached = await run_in_threadpool(self.cache.get, cache_key)
+            if cached is not None:
+                return cached
+
         if not self.is_available:
             return self._fallback_response(prompt)
 
+        key = cache_key or (payload["model"], system_prompt or "", prompt)
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.create_task(self._generate(payload, cache_key)))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._end_flight(key, flight))
+        else:
+            self.pool_stats["coalesced"] += 1
+
+        flight.waiters += 1
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                payload = {
-                    "model": self.model_name,
-                    "prompt": prompt,
-                    "stream": False
-                }
-                
-                if system_prompt:
-                    payload["system"] = system_prompt
+            # Shielded so a cancelled caller only stops waiting; the others still get the result
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller went away (e.g. the clients disconnected): stop generating,
+                # and let later callers start afresh rather than join a cancelled task
+                self._end_flight(key, flight)
+                flight.task.cancel()
+                self.pool_stats["abandoned"] += 1
+
+    def _end_flight(self, key: Union[str, tuple], flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
 
-                response = await client.post(
-                    f"{self.ollama_url}/api/generate",
-                    json=payload
-                )
+    async def _generate(self, payload: Dict[str, Any], cache_key: Optional[str]) -> str:
+        """One generation request, returning the fallback response on failure"""
+        prompt = payload["prompt"]
+        try:
+            response = await self._request("POST", "/api/generate", json=payload)
+            
+            if response.status_code == 200:
+                self.breaker.record_success()
+                result = response.json()
+                text = result.get("response", "").strip()
+                if cache_key is not None and text:
+                    await run_in_threadpool(self.cache.put, cache_key, text)
+                return text
+            else:
+                logger.error(f"LLM request failed: {response.status_code}")
+                if response.status_code >= 500:
+                    self.breaker.record_failure()
+                return self._fallback_response(prompt)
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    return result.get("response", "").strip()
-                else:
-                    logger.error(f"LLM request failed: {response.status_code}")
-                    return self._fallback_response(prompt)
-                    
         except Exception as e:
             logger.error(f"Error generating LLM response: {e}")
+            self.breaker.record_failure()
             return self._fallback_response(prompt)
 
+    async def stream_response(self, prompt: str, system_prompt: str = None) -> AsyncIterator[str]:
+        """Generate a response from the local LLM token by token
+        
+        Consumes Ollama's NDJSON stream, so the first text arrives after the
+        model's first-token latency instead of the whole completion. The read
+        timeout applies between tokens. A cached response, and the fallback
+        response when the LLM is unavailable or fails before its first token,
+        are yielded in one piece; a failure mid-stream ends the stream early.
+        """
+        payload = self._payload(prompt, system_prompt, stream=True)
+        cache_key = self._cache_key(payload)
+        if cache_key is not None:
+            cached = await run_in_threadpool(self.cache.get, cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        if not self.is_available:
+            yield self._fallback_response(prompt)
+            return
+
+        streamed = False
+        tokens = []
+        completed = False
+        try:
+            async with self._tracked():
+                async with self._get_client().stream("POST", "/api/generate", json=payload) as response:
+                    if response.status_code != 200:
+                        logger.error(f"LLM stream request failed: {response.status_code}")
+                        if response.status_code >= 500:
+                            self.breaker.record_failure()
+                        yield self._fallback_response(prompt)
+                        return
+
+                    async for line in response.aiter_lines():
+                        if not line.strip():
+                            continue
+                        chunk = json.loads(line)
+                        if "error" in chunk:
+                            raise RuntimeError(chunk["error"])
+                        token = chunk.get("response", "")
+                        if token:
+                            streamed = True
+                            tokens.append(token)
+                            yield token
+                        if chunk.get("done"):
+                            completed = True
+                            break
+            self.breaker.record_success()
+            # Only a complete response is cached, never one cut short
+            text = "".join(tokens).strip()
+            if cache_key is not None and completed and text:
+                await run_in_threadpool(self.cache.put, cache_key, text)
+        except Exception as e:
+            logger.error(f"Error streaming LLM response: {e}")
+            self.breaker.record_failure()
+            if not streamed:
+                yield self._fallback_response(prompt)
+
     def _fallback_response(self, prompt: str) -> str:
         """Enhanced fallback response with demo analysis"""
         if "resume" in prompt.lower():
@@ -133,20 +414,164 @@ class LLMService:
         • Show impact of previous work
         """
 
-    async def analyze_resume(self, text: str) -> Dict[str, Any]:
+    async def analyze_resume(self, resume_data: ResumeData,
+                             job_description: Optional[JobDescription] = None) -> AnalysisResult:
+        """Score a parsed resume, optionally against a target job"""
+        analysis = self.score_resume(resume_data, job_description)
+
+        if self.is_available:
+            response = await self.generate_response(
+                self._resume_prompt(resume_data, job_description), ANALYSIS_SYSTEM_PROMPT
+            )
+            self.add_llm_suggestions(analysis, response)
+
+        return analysis
+
+    def stream_analysis(self, resume_data: ResumeData,
+                        job_description: Optional[JobDescription] = None) -> AsyncIterator[str]:
+        """The LLM review of ``analyze_resume``, streamed token by token"""
+        return self.stream_response(self._resume_prompt(resume_data, job_description), ANALYSIS_SYSTEM_PROMPT)
+
+    def add_llm_suggestions(self, analysis: AnalysisResult, response: str) -> None:
+        """Add the suggestions found in an LLM review to a scored analysis"""
+        analysis.suggestions.extend(self._extract_list_items(response, SUGGESTION_KEYWORDS))
+
+    def score_resume(self, resume_data: ResumeData,
+                     job_description: Optional[JobDescription] = None) -> AnalysisResult:
+        """The rule-based part of ``analyze_resume``, without the LLM review"""
+        strengths = []
+        weaknesses = []
+        suggestions = []
+        score = 40.0
+
+        if resume_data.summary:
+            score += 10
+            strengths.append("Includes a professional summary")
+        else:
+            weaknesses.append("No professional summary")
+            suggestions.append("Add a 2-3 sentence summary tailored to your target role")
+
+        if resume_data.experience:
+            score += 20
+            strengths.append(f"Lists {len(resume_data.experience)} relevant position(s)")
+            if not any(DIGIT.search(line) for job in resume_data.experience for line in job.description):
+                weaknesses.append("Experience bullets lack measurable results")
+                suggestions.append("Add metrics to show impact (percentages, revenue, users, time saved)")
+        else:
+            weaknesses.append("No work experience section detected")
+            suggestions.append("Add an Experience section with role, company and dates")
+
+        if resume_data.education:
+            score += 10
+            strengths.append("Education history is included")
+        else:
+            weaknesses.append("No education section detected")
+
+        if len(resume_data.skills) >= 5:
+            score += 15
+            strengths.append(f"Strong skills section with {len(resume_data.skills)} skills")
+        elif resume_data.skills:
+            score += 5
+            suggestions.append("List more of the tools and technologies you work with")
+        else:
+            weaknesses.append("No skills section detected")
+            suggestions.append("Add a Skills section with relevant technologies")
+
+        if resume_data.projects or resume_data.certifications:
+            score += 5
+            strengths.append("Shows projects or certifications")
+
+        missing_skills = []
+        keyword_matches = {}
+        if job_description:
+            resume_skills = [skill.name.lower() for skill in resume_data.skills]
+            for required in job_description.required_skills + job_description.preferred_skills:
+                matched = any(required.lower() in skill for skill in resume_skills)
+                keyword_matches[required] = matched
+                if not matched and required in job_description.required_skills:
+                    missing_skills.append(required)
+            if missing_skills:
+                suggestions.append(f"Highlight experience with: {', '.join(missing_skills)}")
+
+        return AnalysisResult(
+            score=min(score, 100.0),
+            strengths=strengths,
+            weaknesses=weaknesses,
+            suggestions=suggestions,
+            missing_skills=missing_skills,
+            keyword_matches=keyword_matches
+        )
+
+    async def get_skill_gap_analysis(self, resume_data: ResumeData,
+                                     job_description: JobDescription) -> Dict[str, Any]:
+        """Compare resume skills with the skills a job asks for"""
+        current_skills = [skill.name.lower() for skill in resume_data.skills]
+        required = [skill.lower() for skill in job_description.required_skills]
+        preferred = [skill.lower() for skill in job_description.preferred_skills]
+
+        missing_required = [skill for skill in required
+                            if not any(skill in current for current in current_skills)]
+        missing_preferred = [skill for skill in preferred
+                             if not any(skill in current for current in current_skills)]
+
+        ai_recommendations = await self.generate_response(
+            f"Job: {job_description.title}\n{job_description.description[:1500]}\n\n"
+            f"Candidate skills: {', '.join(current_skills) or 'none listed'}\n"
+            f"Missing skills: {', '.join(missing_required + missing_preferred) or 'none'}\n\n"
+            "Suggest how the candidate can close the gap for this job."
+        )
+
+        return {
+            "skill_match_percentage": self._calculate_skill_match(current_skills, required),
+            "matching_skills": [skill for skill in required + preferred
+                                if skill not in missing_required + missing_preferred],
+            "missing_required_skills": missing_required,
+            "missing_preferred_skills": missing_preferred,
+            "ai_recommendations": ai_recommendations
+        }
+
+    async def vibe_check_feedback(self, resume_data: ResumeData, job_url: Optional[str] = None) -> str:
+        """Short, friendly overall impression of the resume"""
+        if self.is_available:
+            return await self.generate_response(
+                self._resume_prompt(resume_data) +
+                "\n\nGive a short, upbeat 'vibe check' of this resume in 2-3 sentences.",
+                "You are an encouraging career coach."
+            )
+
+        name = resume_data.contact_info.full_name.split()[0] if resume_data.contact_info.full_name else "there"
+        if resume_data.experience and len(resume_data.skills) >= 5:
+            return (f"Hey {name}, your resume has solid energy! Your experience and skills tell a clear story - "
+                    "add a few more numbers to your achievements to really make it pop.")
+        return (f"Hey {name}, there's a good foundation here! Flesh out your experience and skills sections "
+                "so recruiters can see what you bring to the table.")
+
+    def _resume_prompt(self, resume_data: ResumeData, job_description: Optional[JobDescription] = None) -> str:
+        """Compact plain-text rendering of a resume for LLM prompts"""
+        lines = [f"Resume of {resume_data.contact_info.full_name}"]
+        if resume_data.summary:
+            lines.append(f"Summary: {resume_data.summary}")
+        for job in resume_data.experience:
+            lines.append(f"Experience: {job.position} at {job.company} ({job.start_date} - {job.end_date or 'Present'})")
+            lines.extend(f"- {item}" for item in job.description[:5])
+        for school in resume_data.education:
+            lines.append(f"Education: {school.degree} at {school.institution}")
+        if resume_data.skills:
+            lines.append(f"Skills: {', '.join(skill.name for skill in resume_data.skills)}")
+        if job_description:
+            lines.append(f"\nTarget job: {job_description.title}\n{job_description.description[:1500]}")
+        return "\n".join(lines)
+
+    async def analyze_resume_text(self, text: Union[str, ResumeDocument]) -> Dict[str, Any]:
         """Analyze resume text and return structured data"""
-        # Extract basic info
-        basic_info = self.extract_basic_info(text)
+        document = ResumeDocument.of(text)
+        text = document.text
         
-        # Simple keyword extraction for skills
-        tech_keywords = [
-            'python', 'javascript', 'java', 'react', 'node.js', 'sql', 'aws', 'docker',
-            'git', 'html', 'css', 'mongodb', 'postgresql', 'kubernetes', 'jenkins',
-            'machine learning', 'data science', 'api', 'rest', 'microservices'
-        ]
+        # Extract basic info
+        basic_info = self.extract_basic_info(document)
         
-        text_lower = text.lower()
-        found_skills = [skill for skill in tech_keywords if skill in text_lower]
+        # Keyword extraction for skills
+        found_skills = [skill.lower() for skill in find_skills(text)]
         
         # Extract experience years
         experience_years = self._extract_experience_years(text)
@@ -177,50 +602,20 @@ class LLMService:
             "mode": "Demo mode - Enhanced analysis available with full AI integration"
         }
 
-    def extract_basic_info(self, text: str) -> Dict[str, Any]:
+    def extract_basic_info(self, text: Union[str, ResumeDocument]) -> Dict[str, Any]:
         """Extract basic information from resume text"""
-        # Extract email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        
-        # Extract phone
-        phone_pattern = r'(\+?1?[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})'
-        phones = re.findall(phone_pattern, text)
-        
-        # Extract name (first non-email line that looks like a name)
-        lines = text.split('\n')
-        name = ""
-        for line in lines[:5]:
-            line = line.strip()
-            if line and '@' not in line and len(line.split()) <= 3 and len(line) > 2:
-                name = line
-                break
+        # Email, phone and name come from the document's contact scan
+        contact = ResumeDocument.of(text).contact
         
         return {
-            "name": name or "Not specified",
-            "email": emails[0] if emails else "Not specified",
-            "phone": f"({phones[0][1]}) {phones[0][2]}-{phones[0][3]}" if phones else "Not specified"
+            "name": contact.full_name or "Not specified",
+            "email": contact.email or "Not specified",
+            "phone": contact.formatted_phone or "Not specified"
         }
 
     def _extract_experience_years(self, text: str) -> int:
         """Extract years of experience from text"""
-        experience_years = 0
-        exp_patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-            r'experience.*?(\d+)\+?\s*years?',
-            r'(\d+)\+?\s*years?\s*in'
-        ]
-        
-        text_lower = text.lower()
-        for pattern in exp_patterns:
-            matches = re.findall(pattern, text_lower)
-            if matches:
-                try:
-                    experience_years = max(experience_years, int(matches[0]))
-                except:
-                    pass
-        
-        return experience_years
+        return extract_experience_years(text)
 
     def _determine_career_level(self, years: int) -> str:
         """Determine career level based on years of experience"""
@@ -233,8 +628,10 @@ class LLMService:
         else:
             return "Entry-level"
 
-    async def validate_ats(self, text: str) -> Dict[str, Any]:
+    async def validate_ats(self, text: Union[str, ResumeDocument]) -> Dict[str, Any]:
         """Validate resume for ATS compatibility"""
+        document = ResumeDocument.of(text)
+        text = document.text
         issues = []
         score = 85  # Base score
         
@@ -243,13 +640,13 @@ class LLMService:
             issues.append("Resume content is too short")
             score -= 15
             
-        if not re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text):
+        if document.contact.email is None:
             issues.append("No email address found")
             score -= 10
             
         # Check for good structure indicators
         structure_keywords = ['experience', 'education', 'skills', 'summary']
-        found_sections = sum(1 for keyword in structure_keywords if keyword.lower() in text.lower())
+        found_sections = sum(1 for keyword in structure_keywords if keyword in document.lower)
         
         if found_sections < 3:
             issues.append("Missing key resume sections")
@@ -268,11 +665,12 @@ class LLMService:
             "formatting_score": 90
         }
 
-    async def analyze_job_fit(self, resume_text: str, job_text: str) -> Dict[str, Any]:
+    async def analyze_job_fit(self, resume_text: Union[str, ResumeDocument],
+                              job_text: Union[str, ResumeDocument]) -> Dict[str, Any]:
         """Analyze how well resume matches job description"""
         # Simple keyword matching
-        resume_words = set(resume_text.lower().split())
-        job_words = set(job_text.lower().split())
+        resume_words = ResumeDocument.of(resume_text).vocabulary
+        job_words = ResumeDocument.of(job_text).vocabulary
         
         common_words = resume_words.intersection(job_words)
         match_percentage = min(len(common_words) / len(job_words) * 100, 95) if job_words else 0
@@ -288,6 +686,10 @@ class LLMService:
             ],
             "vibe_check": f"{'Strong' if match_percentage > 70 else 'Moderate' if match_percentage > 40 else 'Weak'} alignment with job requirements"
         }
+
+    def _extract_list_items(self, response: str, keywords: List[str]) -> List[str]:
+        """Pull bullet points mentioning any of the keywords out of an LLM response"""
+        lines = response.split('\n')
         relevant_lines = []
         
         for line in lines:
@@ -306,3 +708,7 @@ class LLMService:
         
         matches = sum(1 for req_skill in required_skills if any(req_skill in curr_skill for curr_skill in current_skills))
         return (matches / len(required_skills)) * 100.0
+
+
+# Shared service - probed on startup and kept fresh by the background prober
+llm_service = LLMService(cache=llm_cache)
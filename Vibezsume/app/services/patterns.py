@@ -0,0 +1,42 @@
+"""
+Pattern registry
+Regular expressions shared by every extraction and validation path, compiled once
+"""
+
+import re
+
+# None of these patterns has nested or adjacent unbounded quantifiers that
+# can match the same characters, so each runs in time linear in its input.
+# Add new extraction patterns here rather than as inline string literals.
+
+# Contact details. The email local part may only start where a run of
+# address characters starts; letting it start anywhere inside a run (as a
+# plain \b does) rescans the run from every dot and goes quadratic on text
+# like "a.a.a.a...". Leading punctuation is skipped so the match still
+# begins at the first word character, as it did with \b.
+EMAIL = re.compile(
+    r'(?<![A-Za-z0-9._%+-])[.%+-]*'
+    r'([A-Za-z0-9_][A-Za-z0-9._%+-]*@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)'
+)
+# Groups: area code, exchange, line number
+PHONE = re.compile(r'(?:\+?\d{1,3}[-.\s]?)?\(?(\d{3})\)?[-.\s]?(\d{3})[-.\s]?(\d{4})')
+LINKEDIN = re.compile(r'linkedin\.com/in/[\w-]+')
+GITHUB = re.compile(r'github\.com/[\w-]+')
+
+DIGIT = re.compile(r'\d')
+
+# Dates and experience
+DATE = re.compile(r'\b(?:\d{1,2}/)?(?:19|20)\d{2}\b')
+CURRENT = re.compile(r'\bpresent\b', re.IGNORECASE)
+YEARS_TOKEN = re.compile(r'\d+|[a-z]+')
+
+# Education
+DEGREE = re.compile(
+    r'\b(?:(?i:bachelor|master|doctor|associate|ph\.?d|mba|b\.tech|m\.tech|b\.s|m\.s|b\.a|m\.a)'
+    r'|(?:BS|MS|BA|MA|BSc|MSc|BEng|MEng)\b)'
+)
+INSTITUTION = re.compile(r'\b(?:university|college|institute|school|academy)\b', re.IGNORECASE)
+SEGMENT_SEPARATOR = re.compile(r'[|,]')
+
+# Section headers written in capitals, matched against a whole stripped line
+CAPS_HEADER = re.compile(r'[A-Z][A-Z\s]{2,}')
@@ -0,0 +1,371 @@
+"""
+PDF inspector service
+Reads PDF fonts, images, annotations and layout hints without decoding any text
+"""
+
+import logging
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Awaitable, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import PyPDF2
+from PyPDF2.filters import ASCII85Decode
+
+logger = logging.getLogger(__name__)
+
+INSPECTION_MAX_PAGES = int(os.getenv("PDF_INSPECTION_MAX_PAGES", "50"))
+INSPECTION_CACHE_SIZE = int(os.getenv("PDF_INSPECTION_CACHE_SIZE", "1024"))
+# Content stream bytes scanned per page for column hints; streams are only
+# ever decompressed this far
+CONTENT_SCAN_BYTES = 512 * 1024
+
+# Fonts every PDF reader provides, so they never need embedding
+STANDARD_FONTS = ('Helvetica', 'Times', 'Courier', 'Symbol', 'ZapfDingbats')
+_FONT_FILES = ('/FontFile', '/FontFile2', '/FontFile3')
+# PostScript name suffixes that are not part of the family, e.g. "ArialMT"
+_FAMILY_SUFFIXES = ('PSMT', 'MT')
+
+# Column hints: a text edge is an x position where at least this many lines
+# (and this share of the page's lines) start; two edges this far apart, as a
+# share of the page width, suggest side-by-side columns
+COLUMN_EDGE_MIN_LINES = 5
+COLUMN_EDGE_MIN_SHARE = 0.1
+COLUMN_GAP = 0.25
+
+# Content stream tokens: strings (one level of nested parentheses), hex
+# strings, dictionary and array delimiters, names, comments, numbers, operators
+_CONTENT_TOKEN = re.compile(
+    rb'(?P<operand>\((?:\\.|[^\\()]|\((?:\\.|[^\\()])*\))*\)|<<|>>|<[^<>]*>|\[|\]'
+    rb'|/[^\s/\[\]()<>{}%]*|%[^\r\n]*|[-+]?(?:\d+\.?\d*|\.\d+)(?![^\s/\[\]()<>{}%]))'
+    rb'|(?P<operator>[^\s/\[\]()<>{}%]+)',
+    re.DOTALL
+)
+_NUMBER = re.compile(rb'[-+]?(?:\d+\.?\d*|\.\d+)')
+_SHOW_TEXT = {b'Tj', b'TJ', b"'", b'"'}
+
+# An affine transform [a b c d e f], as in the PDF cm and Tm operators
+Matrix = Tuple[float, float, float, float, float, float]
+_IDENTITY: Matrix = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+class PdfInspection:
+    """Fonts, images, annotations and layout hints of a PDF"""
+
+    __slots__ = ('page_count', 'inspected_pages', 'fonts', 'image_count', 'annotation_count',
+                 'multi_column_pages')
+
+    def __init__(self, page_count: int = 0, inspected_pages: int = 0, fonts: Optional[Dict[str, bool]] = None,
+                 image_count: int = 0, annotation_count: int = 0,
+                 multi_column_pages: Optional[List[int]] = None):
+        self.page_count = page_count
+        self.inspected_pages = inspected_pages
+        # Font name (subset tag removed) -> whether its glyphs are embedded
+        self.fonts = fonts if fonts is not None else {}
+        self.image_count = image_count
+        self.annotation_count = annotation_count
+        # Zero-based pages whose text lines start at two distant edges
+        self.multi_column_pages = multi_column_pages if multi_column_pages is not None else []
+
+    @property
+    def font_families(self) -> List[str]:
+        """Distinct font families, e.g. "Arial" for ArialMT and Arial-BoldMT"""
+        return sorted({font_family(name) for name in self.fonts})
+
+    @property
+    def unembedded_fonts(self) -> List[str]:
+        """Fonts that are neither embedded nor one of the standard PDF fonts"""
+        return sorted(name for name, embedded in self.fonts.items()
+                      if not embedded and not name.startswith(STANDARD_FONTS))
+
+    @property
+    def has_images(self) -> bool:
+        return self.image_count > 0
+
+    @property
+    def multi_column(self) -> bool:
+        return bool(self.multi_column_pages)
+
+    def merge(self, other: "PdfInspection") -> None:
+        """Add the findings of a later page range"""
+        self.page_count = max(self.page_count, other.page_count)
+        self.inspected_pages += other.inspected_pages
+        for name, embedded in other.fonts.items():
+            self.fonts[name] = self.fonts.get(name, False) or embedded
+        self.image_count += other.image_count
+        self.annotation_count += other.annotation_count
+        self.multi_column_pages = sorted(set(self.multi_column_pages) | set(other.multi_column_pages))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PdfInspection":
+        return cls(**data)
+
+    def summary(self) -> Dict[str, Any]:
+        """What the API reports about the PDF"""
+        return {
+            "fonts": [{"name": name, "embedded": embedded} for name, embedded in sorted(self.fonts.items())],
+            "font_families": self.font_families,
+            "image_count": self.image_count,
+            "annotation_count": self.annotation_count,
+            "multi_column": self.multi_column,
+            "multi_column_pages": [page + 1 for page in self.multi_column_pages],
+            "pages_inspected": self.inspected_pages,
+            "page_count": self.page_count
+        }
+
+
+def font_family(name: str) -> str:
+    """Family of a PostScript font name, e.g. "TimesNewRomanPSMT" -> "TimesNewRoman" """
+    family = re.split(r'[-,]', name, 1)[0]
+    for suffix in _FAMILY_SUFFIXES:
+        if family.endswith(suffix) and len(family) > len(suffix):
+            return family[:-len(suffix)]
+    return family
+
+
+def inspect_pdf(source: Union[str, Path, bytes, BinaryIO],
+                max_pages: Optional[int] = INSPECTION_MAX_PAGES) -> PdfInspection:
+    """Inspect a PDF page by page: resources, annotations and text positions"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = BytesIO(source)
+    reader = PyPDF2.PdfReader(str(source) if isinstance(source, Path) else source)
+    stop = len(reader.pages) if max_pages is None else min(max_pages, len(reader.pages))
+    return inspect_pages(reader, 0, stop)
+
+
+def inspect_pages(reader: PyPDF2.PdfReader, start: int, stop: int) -> PdfInspection:
+    """Inspect pages ``start``..``stop`` of an open PDF; pages are loaded one at a time"""
+    inspection = PdfInspection(page_count=len(reader.pages))
+    for index in range(start, stop):
+        inspect_page(reader.pages[index], index, inspection)
+    return inspection
+
+
+def inspect_page(page, index: int, inspection: PdfInspection) -> None:
+    """Add one page's fonts, images, annotations and column hint to an inspection"""
+    inspection.inspected_pages += 1
+    inspect_page_resources(page, inspection)
+    try:
+        if _has_columns(page):
+            inspection.multi_column_pages.append(index)
+    except Exception as e:
+        logger.debug(f"Could not scan PDF page layout: {e}")
+
+
+def inspect_page_resources(page, inspection: PdfInspection) -> None:
+    """Add one page's fonts, images and annotations; reads dictionaries only, no content streams"""
+    try:
+        resources = _resolve(page.get('/Resources'))
+        for font in _resolve(resources.get('/Font')).values():
+            font = font.get_object()
+            base_font = str(font.get('/BaseFont', '')).lstrip('/')
+            if base_font:
+                # Drop the subset tag, e.g. "ABCDEF+Calibri" -> "Calibri"
+                name = base_font.split('+', 1)[-1]
+                inspection.fonts[name] = inspection.fonts.get(name, False) or _font_embedded(font)
+        for xobject in _resolve(resources.get('/XObject')).values():
+            if xobject.get_object().get('/Subtype') == '/Image':
+                inspection.image_count += 1
+        annotations = page.get('/Annots')
+        if annotations is not None:
+            inspection.annotation_count += len(annotations.get_object())
+    except Exception as e:
+        logger.debug(f"Could not read PDF page resources: {e}")
+
+
+def _resolve(obj) -> dict:
+    """Dereference an optional (possibly indirect) PDF dictionary"""
+    return obj.get_object() if obj is not None else {}
+
+
+def _font_embedded(font) -> bool:
+    """Whether a font dictionary carries its glyph program"""
+    if font.get('/Subtype') == '/Type3':
+        # Glyphs are drawn by content streams inside the font itself
+        return True
+    descriptor = font.get('/FontDescriptor')
+    if descriptor is None and font.get('/Subtype') == '/Type0':
+        descendants = font.get('/DescendantFonts')
+        descendants = descendants.get_object() if descendants is not None else []
+        if descendants:
+            descriptor = descendants[0].get_object().get('/FontDescriptor')
+    if descriptor is None:
+        return False
+    descriptor = descriptor.get_object()
+    return any(key in descriptor for key in _FONT_FILES)
+
+
+def _has_columns(page) -> bool:
+    """Whether the page's text lines start at two edges far apart"""
+    contents = page.get('/Contents')
+    if contents is None:
+        return False
+    contents = contents.get_object()
+    streams = contents if isinstance(contents, list) else [contents]
+    data = _content_prefix(streams, CONTENT_SCAN_BYTES)
+    width = float(page.mediabox.width) or 1.0
+
+    # Lines per x position (rounded to whole points), counting each line once
+    edges: Dict[int, set] = {}
+    for x, y in _text_origins(data):
+        edges.setdefault(round(x), set()).add(round(y))
+    line_count = sum(len(lines) for lines in edges.values())
+    minimum = max(COLUMN_EDGE_MIN_LINES, line_count * COLUMN_EDGE_MIN_SHARE)
+    strong = sorted(x for x, lines in edges.items() if len(lines) >= minimum)
+    return len(strong) > 1 and strong[-1] - strong[0] >= width * COLUMN_GAP
+
+
+def _content_prefix(streams, budget: int) -> bytes:
+    """Up to ``budget`` decoded bytes of a page's content streams
+
+    Inflating stops at the budget, so a tiny stream that expands enormously
+    costs no more than a large plain one. PyPDF2's get_data() would decode
+    every stream in full. Only FlateDecode without parameters, optionally
+    behind ASCII85Decode (which only shrinks its input), is decoded; streams
+    with other filters are skipped.
+    """
+    chunks = []
+    for stream in streams:
+        if budget <= 0:
+            break
+        stream = stream.get_object()
+        filters = stream.get('/Filter')
+        filters = [] if filters is None else list(filters) if isinstance(filters, list) else [filters]
+        data = stream._data
+        if filters[:1] == ['/ASCII85Decode']:
+            data = ASCII85Decode.decode(data)
+            filters = filters[1:]
+        if not filters:
+            chunk = data[:budget]
+        elif filters == ['/FlateDecode'] and stream.get('/DecodeParms') is None:
+            chunk = zlib.decompressobj().decompress(data, budget)
+        else:
+            continue
+        chunks.append(chunk)
+        budget -= len(chunk) + 1
+    return b'\n'.join(chunks)
+
+
+def _text_origins(content: bytes) -> Iterator[Tuple[float, float]]:
+    """Page-space start of every text-showing operation in a content stream
+
+    Follows only the graphics state stack, the current transformation matrix
+    and the text line matrix; the shown strings are never decoded.
+    """
+    ctm = _IDENTITY
+    stack: List[Matrix] = []
+    line_matrix = _IDENTITY
+    leading = 0.0
+    operands: List[bytes] = []
+    tokens = _CONTENT_TOKEN.finditer(content)
+    for match in tokens:
+        token = match.group()
+        if match.lastgroup == 'operand':
+            operands.append(token)
+            continue
+
+        if token == b'q':
+            stack.append(ctm)
+        elif token == b'Q':
+            ctm = stack.pop() if stack else _IDENTITY
+        elif token == b'cm' and len(operands) >= 6:
+            ctm = _multiply(_numbers(operands[-6:]), ctm)
+        elif token == b'BT':
+            line_matrix = _IDENTITY
+        elif token == b'Tm' and len(operands) >= 6:
+            line_matrix = _numbers(operands[-6:])
+        elif token in (b'Td', b'TD') and len(operands) >= 2:
+            tx, ty = _numbers(operands[-2:])
+            if token == b'TD':
+                leading = -ty
+            line_matrix = _multiply((1.0, 0.0, 0.0, 1.0, tx, ty), line_matrix)
+        elif token == b'TL' and operands:
+            leading = float(operands[-1]) if _NUMBER.fullmatch(operands[-1]) else leading
+        elif token == b'T*':
+            line_matrix = _multiply((1.0, 0.0, 0.0, 1.0, 0.0, -leading), line_matrix)
+
+        if token in _SHOW_TEXT:
+            if token != b'Tj' and token != b'TJ':
+                # ' and " move to the next line first
+                line_matrix = _multiply((1.0, 0.0, 0.0, 1.0, 0.0, -leading), line_matrix)
+            origin = _multiply(line_matrix, ctm)
+            yield origin[4], origin[5]
+        elif token == b'ID':
+            # Inline image data is binary; skip to its end marker
+            end = content.find(b'EI', match.end())
+            if end < 0:
+                return
+            for match in tokens:
+                if match.start() >= end + 2:
+                    break
+        operands = []
+
+
+def _numbers(tokens: List[bytes]) -> Tuple[float, ...]:
+    return tuple(float(token) for token in tokens)
+
+
+def _multiply(m: Matrix, n: Matrix) -> Matrix:
+    """The transform m followed by n"""
+    a, b, c, d, e, f = m
+    a2, b2, c2, d2, e2, f2 = n
+    return (a * a2 + b * c2, a * b2 + b * d2,
+            c * a2 + d * c2, c * b2 + d * d2,
+            e * a2 + f * c2 + e2, e * b2 + f * d2 + f2)
+
+
+class PdfInspector:
+    """Inspections keyed by the SHA-256 of the PDF bytes, least recently used evicted first"""
+
+    def __init__(self, max_entries: int = INSPECTION_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, PdfInspection]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, sha256: str) -> Optional[PdfInspection]:
+        with self._lock:
+            inspection = self._entries.get(sha256)
+            if inspection is not None:
+                self._entries.move_to_end(sha256)
+                self.stats["hits"] += 1
+            return inspection
+
+    def put(self, sha256: str, inspection: PdfInspection) -> None:
+        with self._lock:
+            self._entries[sha256] = inspection
+            self._entries.move_to_end(sha256)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def inspect(self, sha256: str, source: Union[str, Path, bytes, BinaryIO]) -> PdfInspection:
+        """Inspect a PDF unless content with the same hash was inspected before"""
+        inspection = self.get(sha256)
+        if inspection is None:
+            self.stats["misses"] += 1
+            inspection = inspect_pdf(source)
+            self.put(sha256, inspection)
+        return inspection
+
+    async def inspect_with(self, sha256: str, inspect: Callable[[], Awaitable[PdfInspection]]) -> PdfInspection:
+        """Like ``inspect``, awaiting ``inspect()`` on a miss (see ``ExtractionPool.inspect_pdf``)"""
+        inspection = self.get(sha256)
+        if inspection is None:
+            self.stats["misses"] += 1
+            inspection = await inspect()
+            self.put(sha256, inspection)
+        return inspection
+
+    def status(self) -> Dict[str, object]:
+        return {"entries": len(self._entries), **self.stats}
+
+
+# Shared inspector used by the upload endpoints
+pdf_inspector = PdfInspector()
@@ -0,0 +1,93 @@
+"""
+Resume document model
+Resume text held once, with derived views computed lazily and cached
+"""
+
+from bisect import bisect_right
+from functools import cached_property
+from typing import FrozenSet, List, Union
+
+from app.services.contact_scanner import ContactDetails, scan_contact
+from app.services.section_index import SectionIndex
+
+
+class ResumeDocument:
+    """Resume text plus the views every service derives from it
+
+    Each view (lowercased text, lines, line offsets, tokens, section index,
+    contact details...) is computed on first access and then shared, so a
+    request that runs the parser, the ATS checks and the LLM heuristics
+    splits and lowercases the text once instead of once per check.
+    """
+
+    # Cached views, dropped when the text changes
+    _VIEWS = ('lower', 'lines', 'line_offsets', 'content_lines', 'tokens',
+              'word_count', 'vocabulary', 'sections', 'contact')
+
+    def __init__(self, text: str = ""):
+        self._text = text
+
+    @staticmethod
+    def of(source: Union[str, "ResumeDocument"]) -> "ResumeDocument":
+        """Wrap raw text as a document; documents are returned unchanged"""
+        return source if isinstance(source, ResumeDocument) else ResumeDocument(source)
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def _reset_views(self) -> None:
+        for view in self._VIEWS:
+            self.__dict__.pop(view, None)
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def lines(self) -> List[str]:
+        """Lines exactly as split on newlines, blank lines included"""
+        return self.text.split('\n')
+
+    @cached_property
+    def line_offsets(self) -> List[int]:
+        """Character offset at which each line starts"""
+        offsets = []
+        offset = 0
+        for line in self.lines:
+            offsets.append(offset)
+            offset += len(line) + 1
+        return offsets
+
+    def line_at(self, offset: int) -> int:
+        """Index of the line containing a character offset"""
+        return bisect_right(self.line_offsets, offset) - 1
+
+    @cached_property
+    def content_lines(self) -> List[str]:
+        """Non-blank lines with surrounding whitespace stripped"""
+        return [line.strip() for line in self.lines if line.strip()]
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        """Whitespace-separated words"""
+        return self.text.split()
+
+    @cached_property
+    def word_count(self) -> int:
+        return len(self.tokens)
+
+    @cached_property
+    def vocabulary(self) -> FrozenSet[str]:
+        """Distinct lowercased words"""
+        return frozenset(self.lower.split())
+
+    @cached_property
+    def sections(self) -> SectionIndex:
+        """Section index of the text"""
+        return SectionIndex(self.text, self.lines)
+
+    @cached_property
+    def contact(self) -> ContactDetails:
+        """Contact details found in the text"""
+        return scan_contact(self.text)
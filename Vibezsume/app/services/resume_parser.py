@@ -3,11 +3,9 @@ Resume parsing service for extracting data from uploaded files
 """
 
 import logging
-import re
-from typing import Dict, Any, List, Optional
-import PyPDF2
-import docx
+from typing import Dict, Any, List, Optional, BinaryIO, Tuple, Union
 from pathlib import Path
+from starlette.concurrency import run_in_threadpool
 
 # Setup logger first
 logger = logging.getLogger(__name__)
@@ -28,6 +26,16 @@ except ImportError:
     logger.warning("NLTK not available - using basic text processing")
 
 from app.models.resume_models import ResumeData, ContactInfo, Experience, Education, Skill, SkillLevel
+from app.services import text_extraction
+from app.services.text_extraction import ExtractedDocument
+from app.services.extraction_pool import extraction_pool
+from app.services.extraction_cache import extraction_cache
+from app.services.section_index import SectionIndex
+from app.services.contact_scanner import ContactDetails
+from app.services.resume_document import ResumeDocument
+from app.services.skills_taxonomy import find_skills, category_of
+from app.services.experience_extraction import extract_experience_entries, extract_education_entries
+from app.services.upload_ingestion import IngestedUpload
 
 class ResumeParser:
     def __init__(self):
@@ -58,19 +66,72 @@ class ResumeParser:
 
     async def parse_resume(self, file_path: str) -> ResumeData:
         """Parse resume file and extract structured data"""
-        
+
         # Extract text from file
         text = await self._extract_text_from_file(file_path)
-        
+
         if not text:
             raise ValueError("Could not extract text from resume file")
 
+        return self.parse_text(text)
+
+    async def parse_resume_from_buffer(self, buffer: BinaryIO, file_ext: str) -> ResumeData:
+        """Parse resume content held in memory without touching the filesystem"""
+
+        document = await self.extract_document_from_buffer(buffer, file_ext)
+        return self.parse_document(document)
+
+    async def extract_upload(self, upload: IngestedUpload) -> ExtractedDocument:
+        """Extract an upload, reusing the cached extraction for identical content"""
+
+        cached = await run_in_threadpool(extraction_cache.get, upload.sha256, upload.extension)
+        if cached is not None:
+            return cached.document
+
+        document = await self.extract_document_from_buffer(upload.rewind(), upload.extension)
+        if document.text:
+            await run_in_threadpool(extraction_cache.put, upload.sha256, upload.extension, document)
+        return document
+
+    async def parse_upload(self, upload: IngestedUpload) -> Tuple[ExtractedDocument, ResumeData]:
+        """Extract and parse an upload, skipping both steps for content seen before"""
+
+        cached = await run_in_threadpool(extraction_cache.get, upload.sha256, upload.extension)
+        if cached is not None and cached.resume_data is not None:
+            return cached.document, cached.resume_data
+
+        if cached is not None:
+            document = cached.document
+        else:
+            document = await self.extract_document_from_buffer(upload.rewind(), upload.extension)
+
+        # Parsing is CPU-bound; keep it off the event loop
+        resume_data = await run_in_threadpool(self.parse_document, document)
+        await run_in_threadpool(extraction_cache.put, upload.sha256, upload.extension, document, resume_data)
+        return document, resume_data
+
+    def parse_document(self, document: ResumeDocument) -> ResumeData:
+        """Parse a document that has already been extracted"""
+
+        if not document.text:
+            raise ValueError("Could not extract text from resume file")
+
+        return self.parse_text(document)
+
+    def parse_text(self, text: Union[str, ResumeDocument]) -> ResumeData:
+        """Parse already extracted resume text into structured data"""
+
+        # The document segments the text and scans contact details once;
+        # every extractor reads those shared views
+        document = ResumeDocument.of(text)
+        sections = document.sections
+
         # Parse different sections
-        contact_info = self._extract_contact_info(text)
-        summary = self._extract_summary(text)
-        experience = self._extract_experience(text)
-        education = self._extract_education(text)
-        skills = self._extract_skills(text)
+        contact_info = self._extract_contact_info(document.contact)
+        summary = self._extract_summary(sections)
+        experience = self._extract_experience(sections)
+        education = self._extract_education(sections)
+        skills = self._extract_skills(sections)
         
         return ResumeData(
             contact_info=contact_info,
@@ -86,244 +147,103 @@ class ResumeParser:
     async def _extract_text_from_file(self, file_path: str) -> str:
         """Extract text content from PDF, DOCX, or TXT file"""
         file_path = Path(file_path)
-        
-        if file_path.suffix.lower() == '.pdf':
-            return self._extract_from_pdf(file_path)
-        elif file_path.suffix.lower() in ['.docx', '.doc']:
-            return self._extract_from_docx(file_path)
-        elif file_path.suffix.lower() == '.txt':
-            return self._extract_from_txt(file_path)
-        else:
-            raise ValueError(f"Unsupported file format: {file_path.suffix}")
+        return await extraction_pool.extract_text(file_path, file_path.suffix)
+
+    async def extract_text_from_buffer(self, buffer: BinaryIO, file_ext: str) -> str:
+        """Extract text content from an in-memory PDF, DOCX, or TXT buffer"""
+        return await extraction_pool.extract_text(buffer, file_ext)
+
+    async def extract_document_from_buffer(self, buffer: BinaryIO, file_ext: str) -> ExtractedDocument:
+        """Extract text plus page/font metadata from an in-memory buffer in one pass"""
+        return await extraction_pool.extract_document(buffer, file_ext)
 
     def _extract_from_pdf(self, file_path: Path) -> str:
         """Extract text from PDF file"""
-        try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
-        except Exception as e:
-            logger.error(f"Error extracting text from PDF: {e}")
-            return ""
+        return text_extraction.extract_pdf_text(file_path)
 
     def _extract_from_docx(self, file_path: Path) -> str:
         """Extract text from DOCX file"""
-        try:
-            doc = docx.Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
-        except Exception as e:
-            logger.error(f"Error extracting text from DOCX: {e}")
-            return ""
+        return text_extraction.extract_docx_text(file_path)
 
     def _extract_from_txt(self, file_path: Path) -> str:
         """Extract text from TXT file"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
-        except Exception as e:
-            logger.error(f"Error extracting text from TXT: {e}")
-            return ""
-
-    def _extract_contact_info(self, text: str) -> ContactInfo:
-        """Extract contact information from resume text"""
-        
-        # Extract email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_match = re.search(email_pattern, text)
-        email = email_match.group() if email_match else "email@example.com"
-        
-        # Extract phone number
-        phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        phone_match = re.search(phone_pattern, text)
-        phone = phone_match.group() if phone_match else None
-        
-        # Extract name (usually in the first few lines)
-        lines = text.split('\n')
-        name = "Full Name"
-        for line in lines[:5]:
-            line = line.strip()
-            if line and not any(char in line for char in ['@', 'http', '+']) and len(line.split()) <= 4:
-                if not re.search(r'\d', line):  # No numbers in name
-                    name = line
-                    break
-        
-        # Extract LinkedIn
-        linkedin_pattern = r'linkedin\.com/in/[\w-]+'
-        linkedin_match = re.search(linkedin_pattern, text)
-        linkedin = f"https://{linkedin_match.group()}" if linkedin_match else None
-        
-        # Extract GitHub
-        github_pattern = r'github\.com/[\w-]+'
-        github_match = re.search(github_pattern, text)
-        github = f"https://{github_match.group()}" if github_match else None
+        return text_extraction.extract_txt_text(file_path)
+
+    def _extract_contact_info(self, contact: ContactDetails) -> ContactInfo:
+        """Build contact information from the document's contact scan"""
         
         return ContactInfo(
-            full_name=name,
-            email=email,
-            phone=phone,
-            linkedin=linkedin,
-            github=github
+            full_name=contact.full_name or "Full Name",
+            email=contact.email or "email@example.com",
+            phone=contact.phone,
+            linkedin=contact.linkedin,
+            github=contact.github
         )
 
-    def _extract_summary(self, text: str) -> Optional[str]:
+    def _extract_summary(self, sections: SectionIndex) -> Optional[str]:
         """Extract professional summary or objective"""
         
-        # Look for common summary section headers
-        summary_patterns = [
-            r'(?:SUMMARY|PROFESSIONAL SUMMARY|OBJECTIVE|PROFILE).*?\n(.*?)(?=\n[A-Z]|\n\n|\Z)',
-            r'(?:Summary|Professional Summary|Objective|Profile).*?\n(.*?)(?=\n[A-Z]|\n\n|\Z)'
-        ]
-        
-        for pattern in summary_patterns:
-            match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-            if match:
-                summary = match.group(1).strip()
-                # Clean up the summary
-                summary = re.sub(r'\n+', ' ', summary)
-                if len(summary) > 50:  # Reasonable length for a summary
-                    return summary
+        # First paragraph under a summary/objective/profile header
+        summary = sections.paragraph('summary')
+        if summary and len(summary) > 50:  # Reasonable length for a summary
+            return summary
         
         return None
 
-    def _extract_experience(self, text: str) -> List[Experience]:
+    def _extract_experience(self, sections: SectionIndex) -> List[Experience]:
         """Extract work experience from resume"""
         
         experiences = []
         
         # Find experience section
-        exp_pattern = r'(?:EXPERIENCE|WORK EXPERIENCE|EMPLOYMENT|PROFESSIONAL EXPERIENCE)(.*?)(?=\n(?:EDUCATION|SKILLS|PROJECTS|CERTIFICATIONS|\Z))'
-        exp_match = re.search(exp_pattern, text, re.DOTALL | re.IGNORECASE)
+        exp_section = sections.body('experience')
         
-        if not exp_match:
+        if exp_section is None:
             return experiences
         
-        exp_section = exp_match.group(1)
-        
-        # Split into individual jobs (look for patterns like company names, dates)
-        job_patterns = r'([A-Z][^,\n]*(?:Inc|LLC|Corp|Company|Ltd)?.*?\n.*?\d{4}.*?(?=\n[A-Z][^,\n]*(?:Inc|LLC|Corp|Company|Ltd)?|\Z))'
-        jobs = re.findall(job_patterns, exp_section, re.DOTALL)
-        
-        for job in jobs:
-            # Extract company, position, dates, and description
-            lines = [line.strip() for line in job.split('\n') if line.strip()]
-            
-            if len(lines) >= 2:
-                # First line often contains company/position
-                company = lines[0]
-                position = lines[1] if len(lines) > 1 else "Position"
-                
-                # Look for dates
-                date_pattern = r'(\d{1,2}/\d{4}|\d{4})'
-                dates = re.findall(date_pattern, job)
-                start_date = dates[0] if dates else "2020"
-                end_date = dates[1] if len(dates) > 1 else None
-                
-                # Extract description points
-                description = []
-                for line in lines[2:]:
-                    if line and not re.search(r'\d{4}', line):
-                        description.append(line.lstrip('•-* '))
-                
-                experiences.append(Experience(
-                    company=company,
-                    position=position,
-                    start_date=start_date,
-                    end_date=end_date,
-                    description=description[:5],  # Limit to 5 points
-                    technologies=[]
-                ))
+        # Walk the section line by line; runtime is linear in its length
+        for job in extract_experience_entries(exp_section.split('\n')):
+            experiences.append(Experience(**job))
         
         return experiences
 
-    def _extract_education(self, text: str) -> List[Education]:
+    def _extract_education(self, sections: SectionIndex) -> List[Education]:
         """Extract education information"""
         
         education_list = []
         
         # Find education section
-        edu_pattern = r'(?:EDUCATION|ACADEMIC BACKGROUND)(.*?)(?=\n(?:EXPERIENCE|SKILLS|PROJECTS|CERTIFICATIONS|\Z))'
-        edu_match = re.search(edu_pattern, text, re.DOTALL | re.IGNORECASE)
+        edu_section = sections.body('education')
         
-        if not edu_match:
+        if edu_section is None:
             return education_list
         
-        edu_section = edu_match.group(1)
-        
-        # Look for degree patterns
-        degree_patterns = [
-            r'(Bachelor|Master|PhD|B\.S\.|M\.S\.|B\.A\.|M\.A\.|MBA).*?(?=\n\n|\Z)',
-            r'([A-Z][^,\n]*(?:University|College|Institute).*?\d{4})'
-        ]
-        
-        for pattern in degree_patterns:
-            matches = re.findall(pattern, edu_section, re.DOTALL | re.IGNORECASE)
-            for match in matches:
-                # Parse degree information
-                lines = [line.strip() for line in match.split('\n') if line.strip()]
-                
-                if lines:
-                    institution = "Institution"
-                    degree = lines[0]
-                    
-                    # Look for university/college name
-                    for line in lines:
-                        if any(word in line.lower() for word in ['university', 'college', 'institute']):
-                            institution = line
-                            break
-                    
-                    # Extract graduation year
-                    year_pattern = r'\d{4}'
-                    year_match = re.search(year_pattern, match)
-                    year = year_match.group() if year_match else None
-                    
-                    education_list.append(Education(
-                        institution=institution,
-                        degree=degree,
-                        end_date=year
-                    ))
+        # Group degree, institution and year lines into entries
+        for entry in extract_education_entries(edu_section.split('\n')):
+            education_list.append(Education(**entry))
         
         return education_list
 
-    def _extract_skills(self, text: str) -> List[Skill]:
+    def _extract_skills(self, sections: SectionIndex) -> List[Skill]:
         """Extract skills from resume"""
         
         skills = []
         
         # Find skills section
-        skills_pattern = r'(?:SKILLS|TECHNICAL SKILLS|CORE COMPETENCIES)(.*?)(?=\n(?:EXPERIENCE|EDUCATION|PROJECTS|CERTIFICATIONS|\Z))'
-        skills_match = re.search(skills_pattern, text, re.DOTALL | re.IGNORECASE)
+        skills_section = sections.body('skills')
         
-        if skills_match:
-            skills_section = skills_match.group(1)
-        else:
+        if skills_section is None:
             # Look for skills throughout the document
-            skills_section = text
-        
-        # Common technical skills to look for
-        tech_skills = [
-            'Python', 'Java', 'JavaScript', 'React', 'Node.js', 'SQL', 'MongoDB',
-            'AWS', 'Docker', 'Kubernetes', 'Git', 'HTML', 'CSS', 'TypeScript',
-            'Angular', 'Vue.js', 'Django', 'Flask', 'FastAPI', 'PostgreSQL',
-            'Redis', 'Elasticsearch', 'Jenkins', 'CI/CD', 'Machine Learning',
-            'Data Science', 'TensorFlow', 'PyTorch', 'Pandas', 'NumPy',
-            'C++', 'C#', '.NET', 'Spring Boot', 'Microservices', 'REST API',
-            'GraphQL', 'Terraform', 'Ansible', 'Linux', 'Bash', 'PowerShell'
-        ]
+            skills_section = sections.text
         
-        # Find mentioned skills
+        # Find mentioned skills from the shared taxonomy in one pass
         found_skills = []
-        for skill in tech_skills:
-            if skill.lower() in skills_section.lower():
-                found_skills.append(Skill(
-                    name=skill,
-                    level=SkillLevel.INTERMEDIATE  # Default level
-                ))
+        for skill in find_skills(skills_section):
+            found_skills.append(Skill(
+                name=skill,
+                level=SkillLevel.INTERMEDIATE,  # Default level
+                category=category_of(skill)
+            ))
         
         # Also extract skills from comma-separated lists
         lines = skills_section.split('\n')
@@ -0,0 +1,100 @@
+"""
+Section index service
+Single-pass segmentation of resume text into section headers and spans
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from app.services.patterns import CAPS_HEADER
+
+# Canonical section name -> header spellings, compared lowercased with
+# surrounding punctuation stripped
+SECTION_HEADERS = {
+    'summary': ['summary', 'professional summary', 'objective', 'career objective',
+                'profile', 'professional profile'],
+    'experience': ['experience', 'work experience', 'professional experience',
+                   'employment', 'employment history', 'work history'],
+    'education': ['education', 'academic background'],
+    'skills': ['skills', 'technical skills', 'core competencies'],
+    'projects': ['projects'],
+    'certifications': ['certifications'],
+}
+
+_HEADER_LOOKUP = {alias: name for name, aliases in SECTION_HEADERS.items() for alias in aliases}
+
+
+def classify_header(line: str) -> Tuple[Optional[str], bool]:
+    """The canonical section a line is a header for (or None), and whether it is in ALL CAPS"""
+    stripped = line.strip()
+    return _HEADER_LOOKUP.get(stripped.strip(':').strip().lower()), CAPS_HEADER.fullmatch(stripped) is not None
+
+
+class Section:
+    """A recognized section: its header line and the character span of its body"""
+
+    __slots__ = ('name', 'header', 'header_line', 'start', 'end')
+
+    def __init__(self, name: str, header: str, header_line: int, start: int, end: int):
+        self.name = name
+        self.header = header
+        self.header_line = header_line
+        self.start = start
+        self.end = end
+
+
+class SectionIndex:
+    """Header positions and section spans of a resume, built in one pass over its lines
+
+    Built once per document and shared by the parser and the ATS checks,
+    which slice section bodies out of it instead of rescanning the text.
+    """
+
+    def __init__(self, text: str, lines: Optional[List[str]] = None):
+        self.text = text
+        # ``lines`` may be passed in when the caller has already split the text
+        self.lines = lines if lines is not None else text.split('\n')
+        # Every line that looks like a header (known name or ALL CAPS), in order
+        self.headers: List[str] = []
+        # The subset written in ALL CAPS, the formatting ATS parsers recognize best
+        self.caps_headers: List[str] = []
+        # Sections keyed by canonical name; the first occurrence wins
+        self.sections: Dict[str, Section] = {}
+
+        current: Optional[Section] = None
+        offset = 0
+        for number, line in enumerate(self.lines):
+            name, is_caps = classify_header(line)
+            if name is not None or is_caps:
+                self.headers.append(line.strip())
+            if is_caps:
+                self.caps_headers.append(line.strip())
+            if name is not None:
+                if current is not None:
+                    current.end = offset
+                current = None
+                if name not in self.sections:
+                    body_start = min(offset + len(line) + 1, len(text))
+                    current = Section(name, line.strip(), number, body_start, len(text))
+                    self.sections[name] = current
+            offset += len(line) + 1
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sections
+
+    def body(self, name: str) -> Optional[str]:
+        """Text of a section without its header, or None when the section is absent"""
+        section = self.sections.get(name)
+        return self.text[section.start:section.end] if section is not None else None
+
+    def paragraph(self, name: str) -> Optional[str]:
+        """The first block of non-blank lines in a section, joined into one line"""
+        body = self.body(name)
+        if body is None:
+            return None
+        lines = []
+        for line in body.split('\n'):
+            if line.strip():
+                lines.append(line.strip())
+            elif lines:
+                break
+        return ' '.join(lines)
@@ -0,0 +1,111 @@
+"""
+Skills taxonomy
+The single list of skills and keywords, compiled once into a shared matcher
+"""
+
+import logging
+import os
+from typing import Dict, Iterable, List, Optional
+
+from app.services.keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+# Optional file with extra terms, one "term" or "term,category" per line
+TAXONOMY_PATH = os.getenv("SKILLS_TAXONOMY_PATH")
+
+SKILL_CATEGORIES: Dict[str, List[str]] = {
+    "Programming": [
+        'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Rust', 'Ruby',
+        'PHP', 'Kotlin', 'Swift', 'Scala', 'HTML', 'CSS', 'SQL', 'Bash', 'PowerShell', 'Golang'
+    ],
+    "Framework": [
+        'React', 'Angular', 'Vue.js', 'Node.js', 'Django', 'Flask', 'FastAPI',
+        'Spring Boot', '.NET', 'Express.js', 'Next.js'
+    ],
+    "Database": [
+        'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch'
+    ],
+    "Cloud & DevOps": [
+        'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Terraform', 'Ansible',
+        'Jenkins', 'CI/CD', 'Git', 'Linux'
+    ],
+    "Data & AI": [
+        'Machine Learning', 'Data Science', 'Data Analysis', 'TensorFlow', 'PyTorch',
+        'Pandas', 'NumPy'
+    ],
+    "Architecture": [
+        'REST API', 'GraphQL', 'Microservices'
+    ],
+    "Practice": [
+        'Agile', 'Scrum', 'Project Management'
+    ],
+    # Broad terms that count as ATS keywords but are too generic to list as skills
+    "General": [
+        'API', 'REST', 'Cloud', 'Database'
+    ],
+    "Soft Skill": [
+        'Leadership', 'Problem Solving', 'Teamwork', 'Communication', 'Analytical'
+    ],
+}
+
+
+def _load_extra_terms(path: str) -> Dict[str, List[str]]:
+    extra: Dict[str, List[str]] = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                term, _, category = line.strip().partition(',')
+                if term:
+                    extra.setdefault(category.strip() or "Custom", []).append(term.strip())
+    except OSError as e:
+        logger.error(f"Could not load skills taxonomy from {path}: {e}")
+    return extra
+
+
+def _build_category_index(categories: Dict[str, List[str]]) -> Dict[str, str]:
+    index: Dict[str, str] = {}
+    for category, terms in categories.items():
+        for term in terms:
+            index.setdefault(term.lower(), category)
+    return index
+
+
+if TAXONOMY_PATH:
+    for _category, _terms in _load_extra_terms(TAXONOMY_PATH).items():
+        SKILL_CATEGORIES.setdefault(_category, []).extend(_terms)
+
+# Categories that describe concrete hard skills
+TECHNICAL_CATEGORIES = frozenset(SKILL_CATEGORIES) - {"General", "Soft Skill"}
+
+# Skill (lowercased) -> category
+CATEGORY_OF = _build_category_index(SKILL_CATEGORIES)
+
+# Compiled once at import; every service scans text through this automaton
+skill_matcher = KeywordMatcher(term for terms in SKILL_CATEGORIES.values() for term in terms)
+
+
+def find_skills(text: str, categories: Optional[Iterable[str]] = TECHNICAL_CATEGORIES) -> List[str]:
+    """Skills mentioned in the text, in order of first mention
+
+    ``categories`` limits the result to those categories; pass None for
+    every term in the taxonomy.
+    """
+    found = skill_matcher.find(text)
+    if categories is None:
+        return found
+    categories = set(categories)
+    return [skill for skill in found if CATEGORY_OF[skill.lower()] in categories]
+
+
+def count_keywords(text: str, categories: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """Occurrences of each taxonomy term in the text"""
+    counts = skill_matcher.count(text)
+    if categories is None:
+        return counts
+    categories = set(categories)
+    return {term: count for term, count in counts.items() if CATEGORY_OF[term.lower()] in categories}
+
+
+def category_of(skill: str) -> Optional[str]:
+    return CATEGORY_OF.get(skill.lower())
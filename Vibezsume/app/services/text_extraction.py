@@ -0,0 +1,283 @@
+"""
+Text extraction service
+Extracts plain text from PDF, DOCX and TXT content held in memory or on disk
+"""
+
+import logging
+import os
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from io import BytesIO
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Union
+
+import PyPDF2
+
+from app.services.pdf_inspector import PdfInspection, inspect_page_resources
+from app.services.resume_document import ResumeDocument
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = {'.pdf', '.docx', '.doc', '.txt'}
+
+# Budgets that keep pathological PDFs from monopolizing a worker. A resume
+# needs a few thousand characters for analysis, so these are generous.
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "200000"))
+
+# A path on disk, raw bytes, or a binary file-like object positioned at the start
+DocumentSource = Union[str, Path, bytes, BinaryIO]
+
+
+class ExtractedDocument(ResumeDocument):
+    """Everything pulled out of an uploaded document in a single extraction pass
+
+    Produced once per upload and shared by the resume parser and every ATS
+    check, so the source file is never parsed twice.
+    """
+
+    def __init__(self, file_ext: str, pages: Optional[List[str]] = None,
+                 page_count: Optional[int] = None, fonts: Iterable[str] = (),
+                 image_count: int = 0):
+        super().__init__()
+        self.file_ext = file_ext.lower()
+        self.pages = pages if pages is not None else []
+        # Pages in the source; may exceed len(pages) when a budget cut extraction short
+        self.page_count = page_count if page_count is not None else len(self.pages)
+        self.fonts = sorted(set(fonts))
+        self.image_count = image_count
+        # Joined from the pages on first use
+        self._text = None
+
+    @classmethod
+    def from_text(cls, text: str, file_ext: str = '.txt') -> "ExtractedDocument":
+        """Wrap plain text (TXT uploads, pasted resumes) as a single-page document"""
+        return cls(file_ext=file_ext, pages=[text] if text else [], page_count=1)
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = "".join(self.pages)
+        return self._text
+
+    @property
+    def text_selectable(self) -> bool:
+        """Whether any page yielded text - for PDFs this indicates usable embedded fonts"""
+        return any(page.strip() for page in self.pages)
+
+    @property
+    def truncated(self) -> bool:
+        return len(self.pages) < self.page_count
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "file_ext": self.file_ext,
+            "pages": self.pages,
+            "page_count": self.page_count,
+            "fonts": self.fonts,
+            "image_count": self.image_count
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExtractedDocument":
+        return cls(**data)
+
+    def extend(self, other: "ExtractedDocument") -> None:
+        """Append the pages and resources of a later page range"""
+        self.pages.extend(other.pages)
+        self.fonts = sorted(set(self.fonts) | set(other.fonts))
+        self.image_count += other.image_count
+        self._text = None
+        self._reset_views()
+
+
+def _as_stream(source: DocumentSource) -> Union[Path, BinaryIO]:
+    """Normalize a document source into something PyPDF2/zipfile can open"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return BytesIO(source)
+    if isinstance(source, str):
+        return Path(source)
+    return source
+
+
+def extract_document(source: DocumentSource, file_ext: str) -> ExtractedDocument:
+    """Extract text and layout metadata from a PDF, DOCX, or TXT source"""
+    file_ext = file_ext.lower()
+
+    if file_ext == '.pdf':
+        return extract_pdf_document(source)
+    elif file_ext in ['.docx', '.doc']:
+        return ExtractedDocument.from_text(extract_docx_text(source), file_ext)
+    elif file_ext == '.txt':
+        return ExtractedDocument.from_text(extract_txt_text(source), file_ext)
+    else:
+        raise ValueError(f"Unsupported file format: {file_ext}")
+
+
+def extract_text(source: DocumentSource, file_ext: str) -> str:
+    """Extract text content from a PDF, DOCX, or TXT source"""
+    return extract_document(source, file_ext).text
+
+
+def extract_pdf_text(source: DocumentSource, max_pages: Optional[int] = PDF_MAX_PAGES,
+                     max_chars: Optional[int] = PDF_MAX_CHARS) -> str:
+    """Extract text from PDF content, stopping once the page or character budget is spent"""
+    return extract_pdf_document(source, max_pages, max_chars).text
+
+
+def extract_pdf_document(source: DocumentSource, max_pages: Optional[int] = PDF_MAX_PAGES,
+                         max_chars: Optional[int] = PDF_MAX_CHARS) -> ExtractedDocument:
+    """Extract a PDF into an ExtractedDocument within the page and character budgets"""
+    try:
+        return extract_pdf_page_range(source, 0, max_pages, max_chars)
+    except Exception as e:
+        logger.error(f"Error extracting text from PDF: {e}")
+        return ExtractedDocument(file_ext='.pdf')
+
+
+def extract_pdf_page_range(source: DocumentSource, start: int, stop: Optional[int] = None,
+                           max_chars: Optional[int] = None) -> ExtractedDocument:
+    """Extract pages ``start``..``stop`` with their font and image resources
+
+    ``page_count`` on the result is the document's total page count so a
+    caller can plan the remaining ranges. Extraction stops early once
+    ``max_chars`` characters have been collected. Layout hints are left to
+    the ATS paths (see ``ExtractionPool.inspect_upload``), which need them.
+    """
+    pdf_reader = _open_pdf(source)
+    page_count = len(pdf_reader.pages)
+    stop = page_count if stop is None else min(stop, page_count)
+
+    pages = []
+    resources = PdfInspection(page_count=page_count)
+    collected = 0
+    for index in range(start, stop):
+        page = pdf_reader.pages[index]
+        page_text = page.extract_text() + "\n"
+        pages.append(page_text)
+        inspect_page_resources(page, resources)
+        collected += len(page_text)
+        if max_chars is not None and collected >= max_chars:
+            break
+
+    return ExtractedDocument(
+        file_ext='.pdf',
+        pages=pages,
+        page_count=page_count,
+        fonts=resources.fonts,
+        image_count=resources.image_count
+    )
+
+
+def _open_pdf(source: DocumentSource) -> PyPDF2.PdfReader:
+    stream = _as_stream(source)
+    return PyPDF2.PdfReader(str(stream) if isinstance(stream, Path) else stream)
+
+
+def extract_docx_text(source: DocumentSource) -> str:
+    """Extract text from DOCX content"""
+    try:
+        return "".join(block + "\n" for block in iter_docx_blocks(source))
+    except Exception as e:
+        logger.error(f"Error extracting text from DOCX: {e}")
+        return ""
+
+
+# WordprocessingML element names
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# Subtrees without body text: paragraph properties (tab stops look like tabs)
+# and markup-compatibility fallbacks that repeat a text box in legacy VML
+_SKIPPED = {_W + "pPr", "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"}
+_HEADER_PART = re.compile(r"^word/header(\d+)\.xml$")
+
+
+def iter_docx_blocks(source: DocumentSource) -> Iterator[str]:
+    """Yield the paragraphs and table cells of a DOCX in document order
+
+    Reads the XML parts straight from the zip with an incremental parser, so
+    memory stays flat no matter how large the document or its embedded
+    images are. Header text comes first (contact details often live there),
+    followed by the body; text boxes are yielded where they are anchored.
+    """
+    stream = _as_stream(source)
+    with zipfile.ZipFile(stream) as archive:
+        headers = sorted(
+            (int(match.group(1)), name) for name in archive.namelist()
+            for match in [_HEADER_PART.match(name)] if match
+        )
+        # Sections usually repeat the same header, so emit each block once
+        seen_headers = set()
+        for _, name in headers:
+            with archive.open(name) as part:
+                for block in _iter_part_blocks(part):
+                    if block not in seen_headers:
+                        seen_headers.add(block)
+                        yield block
+
+        with archive.open("word/document.xml") as part:
+            yield from _iter_part_blocks(part)
+
+
+def _iter_part_blocks(part: BinaryIO) -> Iterator[str]:
+    # Open paragraphs form a stack because a text box paragraph can be
+    # nested inside the run of another paragraph
+    paragraphs: List[List[str]] = []
+    cells: List[List[str]] = []
+    container = None
+    depth = container_depth = 0
+    skip_depth = 0
+
+    for event, elem in ET.iterparse(part, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            depth += 1
+            if container is None or tag == _W + "body":
+                container, container_depth = elem, depth
+            if tag in _SKIPPED:
+                skip_depth += 1
+            elif skip_depth:
+                continue
+            elif tag == _W + "p":
+                paragraphs.append([])
+            elif tag == _W + "tc":
+                cells.append([])
+            continue
+
+        depth -= 1
+        if tag in _SKIPPED:
+            skip_depth -= 1
+        elif skip_depth:
+            pass
+        elif tag == _W + "t" and paragraphs:
+            paragraphs[-1].append(elem.text or "")
+        elif tag == _W + "tab" and paragraphs:
+            paragraphs[-1].append("\t")
+        elif tag in (_W + "br", _W + "cr") and paragraphs:
+            paragraphs[-1].append("\n")
+        elif tag == _W + "p":
+            text = "".join(paragraphs.pop())
+            if cells and not paragraphs:
+                cells[-1].append(text)
+            else:
+                yield text
+        elif tag == _W + "tc":
+            yield "\n".join(cells.pop())
+
+        # Drop finished top-level blocks so the parsed tree never grows
+        if depth == container_depth:
+            container.clear()
+
+
+def extract_txt_text(source: DocumentSource) -> str:
+    """Extract text from TXT content"""
+    try:
+        stream = _as_stream(source)
+        if isinstance(stream, Path):
+            with open(stream, 'r', encoding='utf-8') as file:
+                return file.read()
+        # Match the universal-newline translation of reading from disk
+        return stream.read().decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    except Exception as e:
+        logger.error(f"Error extracting text from TXT: {e}")
+        return ""
@@ -0,0 +1,257 @@
+"""
+Tiered cache service
+Size-capped in-process LRU in front of a size-capped SQLite table
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Relative cache paths are resolved against the application directory, not
+# the working directory the server happens to be started from
+APP_ROOT = Path(__file__).resolve().parents[2]
+
+# Disk hits buffered before their access times are written without a put
+TOUCH_BATCH = 64
+
+
+def resolve_cache_path(path: str) -> str:
+    """Absolute location of a cache database; ":memory:" is left alone"""
+    if path == ":memory:":
+        return path
+    return str(APP_ROOT / Path(path).expanduser())
+
+
+class TieredCache:
+    """Two-tier cache of serialized values, the base of the extraction and LLM caches
+
+    The in-process LRU keeps decoded values, so repeats skip deserialization;
+    the SQLite tier keeps their text form and survives restarts. Both tiers
+    evict least recently used entries beyond their byte caps, the disk tier
+    against a running total rather than a scan. Rows carry the ``version``
+    they were written under and rows from any other version are dropped on
+    open. With a ``ttl``, entries expire that many seconds after they were
+    stored.
+
+    Disk hits never commit on their own: their access times are buffered and
+    written with the next put, every ``TOUCH_BATCH`` hits, or on close.
+    Every method blocks on SQLite, so async callers go through
+    ``run_in_threadpool``.
+
+    Subclasses expose typed ``get``/``put`` methods over ``_lookup`` and
+    ``_store`` and implement ``_decode``.
+    """
+
+    COLUMNS = ('cache_key', 'value', 'size', 'created', 'last_accessed', 'version')
+
+    def __init__(self, table: str, path: Optional[str], memory_max_bytes: int, disk_max_bytes: int,
+                 enabled: bool = True, version: int = 1, ttl: Optional[float] = None):
+        self.table = table
+        self.enabled = enabled
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self.version = version
+        self.ttl = ttl
+        # key -> (decoded value, size, created)
+        self._memory: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+        # key -> access time of disk entries not yet written back
+        self._touched: Dict[str, float] = {}
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+
+        if enabled and path:
+            try:
+                self._db = self._open_db(resolve_cache_path(path))
+                self._disk_bytes = self._db.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+            except sqlite3.Error as e:
+                logger.warning(f"{type(self).__name__} running memory-only - could not open {path}: {e}")
+
+    def _open_db(self, path: str) -> sqlite3.Connection:
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL keeps commits free of fsync
+        db.execute("PRAGMA synchronous=NORMAL")
+        columns = tuple(row[1] for row in db.execute(f"PRAGMA table_info({self.table})"))
+        if columns and columns != self.COLUMNS:
+            # Written in an older layout
+            db.execute(f"DROP TABLE {self.table}")
+        db.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                cache_key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_accessed REAL NOT NULL,
+                version INTEGER NOT NULL
+            )
+        """)
+        db.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_accessed ON {self.table} (last_accessed)")
+        db.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_created ON {self.table} (created)")
+        stale = db.execute(f"DELETE FROM {self.table} WHERE version != ?", (self.version,)).rowcount
+        if stale > 0:
+            logger.info(f"Dropped {stale} {self.table} cache entries written by another version")
+        db.commit()
+        return db
+
+    def _decode(self, value: str) -> Any:
+        """Rebuild a value from its stored text"""
+        raise NotImplementedError
+
+    def _lookup(self, key: str) -> Optional[Any]:
+        """Look up a value, promoting disk hits into memory"""
+        if not self.enabled:
+            return None
+        now = time.time()
+
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                if self._fresh(cached[2], now):
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return cached[0]
+                self._forget(key)
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        f"SELECT value, size, created FROM {self.table} WHERE cache_key = ? AND version = ?",
+                        (key, self.version)
+                    ).fetchone()
+                    if row is not None and not self._fresh(row[2], now):
+                        self._delete(key, row[1])
+                        self._db.commit()
+                        self.stats["expired"] += 1
+                    elif row is not None:
+                        try:
+                            value = self._decode(row[0])
+                        except (ValueError, TypeError, KeyError) as e:
+                            logger.warning(f"Dropping unreadable {self.table} cache entry {key}: {e}")
+                            self._delete(key, row[1])
+                            self._db.commit()
+                        else:
+                            self._touch(key, now)
+                            self._remember(key, value, row[1], row[2])
+                            self.stats["disk_hits"] += 1
+                            return value
+                except sqlite3.Error as e:
+                    logger.error(f"Error reading {self.table} cache: {e}")
+
+            self.stats["misses"] += 1
+            return None
+
+    def _store(self, key: str, value: Any, text: str) -> None:
+        """Store a value in memory and its text form on disk"""
+        if not self.enabled:
+            return
+        now = time.time()
+        size = len(text)
+
+        with self._lock:
+            self._remember(key, value, size, now)
+            if self._db is not None:
+                try:
+                    self._touched.pop(key, None)
+                    self._write_touches()
+                    previous = self._db.execute(
+                        f"SELECT size FROM {self.table} WHERE cache_key = ?", (key,)
+                    ).fetchone()
+                    self._db.execute(
+                        f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, text, size, now, now, self.version)
+                    )
+                    self._disk_bytes += size - (previous[0] if previous else 0)
+                    self._evict_disk(now)
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.error(f"Error writing {self.table} cache: {e}")
+
+    def _fresh(self, created: float, now: float) -> bool:
+        return self.ttl is None or now - created < self.ttl
+
+    def _touch(self, key: str, now: float) -> None:
+        self._touched[key] = now
+        if len(self._touched) >= TOUCH_BATCH:
+            self._write_touches()
+            self._db.commit()
+
+    def _write_touches(self) -> None:
+        """Write buffered access times; the caller commits"""
+        if self._touched:
+            self._db.executemany(
+                f"UPDATE {self.table} SET last_accessed = ? WHERE cache_key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _remember(self, key: str, value: Any, size: int, created: float) -> None:
+        self._forget(key)
+        if size > self.memory_max_bytes:
+            return
+        self._memory[key] = (value, size, created)
+        self._memory_bytes += size
+        while self._memory_bytes > self.memory_max_bytes:
+            _, (_, evicted_size, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self.stats["evictions"] += 1
+
+    def _forget(self, key: str) -> None:
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous[1]
+
+    def _delete(self, key: str, size: int) -> None:
+        self._db.execute(f"DELETE FROM {self.table} WHERE cache_key = ?", (key,))
+        self._disk_bytes -= size
+
+    def _evict_disk(self, now: float) -> None:
+        if self.ttl is not None:
+            for key, size in self._db.execute(
+                    f"SELECT cache_key, size FROM {self.table} WHERE created <= ?", (now - self.ttl,)).fetchall():
+                self._delete(key, size)
+                self.stats["expired"] += 1
+
+        if self._disk_bytes <= self.disk_max_bytes:
+            return
+        rows = self._db.execute(f"SELECT cache_key, size FROM {self.table} ORDER BY last_accessed")
+        for key, size in rows.fetchall():
+            if self._disk_bytes <= self.disk_max_bytes:
+                break
+            self._delete(key, size)
+            self.stats["evictions"] += 1
+
+    def status(self) -> Dict[str, object]:
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "persistent": self._db is not None,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_bytes": self._disk_bytes,
+            "version": self.version,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            **self.stats
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                try:
+                    self._write_touches()
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.error(f"Error writing {self.table} cache access times: {e}")
+                self._db.close()
+                self._db = None
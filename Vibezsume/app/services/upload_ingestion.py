@@ -0,0 +1,242 @@
+"""
+Upload ingestion service
+Streams multipart uploads in chunks, enforces the size limit and hashes content
+"""
+
+import hashlib
+import logging
+import os
+import zipfile
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional
+
+from fastapi import HTTPException, UploadFile
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_EXTENSIONS = {'.pdf', '.docx', '.doc', '.txt'}
+MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE_MB", "10")) * 1024 * 1024
+CHUNK_SIZE = 64 * 1024  # 64KB
+
+# Allowance for multipart boundaries and small form fields (job description, url)
+MULTIPART_OVERHEAD = 1024 * 1024  # 1MB
+
+# Batch endpoints accept many files in one request, under a larger total
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "200"))
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE_MB", "100")) * 1024 * 1024
+# Files of a batch request (/bulk, /validate-batch) processed at once
+BULK_WINDOW = int(os.getenv("BULK_WINDOW", "8"))
+
+
+class IngestedUpload:
+    """An uploaded file that has been size-checked and hashed.
+
+    ``buffer`` is the spooled file backing the ``UploadFile`` itself, rewound to
+    the start, so downstream stages read the bytes without another copy.
+    """
+
+    def __init__(self, filename: str, extension: str, size: int, sha256: str, buffer: BinaryIO):
+        self.filename = filename
+        self.extension = extension
+        self.size = size
+        self.sha256 = sha256
+        self.buffer = buffer
+
+    def rewind(self) -> BinaryIO:
+        """Seek the buffer back to the start and return it"""
+        self.buffer.seek(0)
+        return self.buffer
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large. Maximum size: {MAX_FILE_SIZE // (1024 * 1024)}MB"
+    )
+
+
+async def ingest_upload(file: UploadFile,
+                        allowed_extensions: Iterable[str] = ALLOWED_EXTENSIONS,
+                        max_size: int = MAX_FILE_SIZE) -> IngestedUpload:
+    """Validate, size-check and hash an upload chunk by chunk"""
+
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No file provided")
+
+    allowed_extensions = set(allowed_extensions)
+    file_ext = Path(file.filename).suffix.lower()
+    if file_ext not in allowed_extensions:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type. Allowed: {', '.join(allowed_extensions)}"
+        )
+
+    # Starlette records the size while spooling the part, so oversized files
+    # can be rejected before reading a single byte back
+    if file.size is not None and file.size > max_size:
+        raise _too_large()
+
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = await file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_size:
+            raise _too_large()
+        digest.update(chunk)
+
+    await file.seek(0)
+    return IngestedUpload(
+        filename=file.filename,
+        extension=file_ext,
+        size=size,
+        sha256=digest.hexdigest(),
+        buffer=file.file
+    )
+
+
+def detach_upload(file: UploadFile) -> UploadFile:
+    """Take over an upload's spooled file so it outlives the request handler
+
+    FastAPI closes form uploads as soon as the endpoint returns; a streaming
+    response that reads them afterwards needs its own handle, which the
+    caller closes when the stream ends.
+    """
+    detached = UploadFile(file.file, size=file.size, filename=file.filename, headers=file.headers)
+    file.file = BytesIO()
+    return detached
+
+
+def list_zip_members(archive: zipfile.ZipFile, max_files: int = MAX_BATCH_FILES) -> List[zipfile.ZipInfo]:
+    """Files inside an uploaded zip, skipping directories and macOS metadata"""
+    members = [
+        info for info in archive.infolist()
+        if not info.is_dir() and not info.filename.startswith('__MACOSX/')
+        and not Path(info.filename).name.startswith('.')
+    ]
+    if len(members) > max_files:
+        raise HTTPException(status_code=400, detail=f"Too many files. Maximum per batch: {max_files}")
+    return members
+
+
+def ingest_zip_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo,
+                      allowed_extensions: Iterable[str] = ALLOWED_EXTENSIONS,
+                      max_size: int = MAX_FILE_SIZE) -> IngestedUpload:
+    """Validate, size-check and hash one member of an uploaded zip
+
+    The declared size is checked first, then the inflated stream is counted
+    as it is read, so a member lying about its size cannot exceed the limit.
+    """
+    filename = Path(info.filename).name
+    allowed_extensions = set(allowed_extensions)
+    file_ext = Path(filename).suffix.lower()
+    if file_ext not in allowed_extensions:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type. Allowed: {', '.join(allowed_extensions)}"
+        )
+    if info.file_size > max_size:
+        raise _too_large()
+
+    digest = hashlib.sha256()
+    buffer = BytesIO()
+    size = 0
+    with archive.open(info) as member:
+        while True:
+            chunk = member.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_size:
+                raise _too_large()
+            digest.update(chunk)
+            buffer.write(chunk)
+
+    buffer.seek(0)
+    return IngestedUpload(
+        filename=filename,
+        extension=file_ext,
+        size=size,
+        sha256=digest.hexdigest(),
+        buffer=buffer
+    )
+
+
+class _RequestTooLarge(Exception):
+    pass
+
+
+class UploadSizeLimitMiddleware:
+    """ASGI middleware that aborts multipart uploads as soon as the body
+    crosses the size limit, instead of spooling the whole request first.
+    """
+
+    def __init__(self, app, max_body_size: Optional[int] = None,
+                 path_limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.max_body_size = max_body_size or (MAX_FILE_SIZE + MULTIPART_OVERHEAD)
+        # Per-path overrides, e.g. for batch endpoints
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") not in ("POST", "PUT"):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        content_type = headers.get(b"content-type", b"")
+        if not content_type.startswith(b"multipart/"):
+            await self.app(scope, receive, send)
+            return
+
+        max_body_size = self.path_limits.get(scope.get("path"), self.max_body_size)
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() \
+                and int(content_length) > max_body_size:
+            await self._reject(scope, receive, send, max_body_size)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body_size:
+                    exceeded = True
+                    raise _RequestTooLarge()
+            return message
+
+        async def guarded_send(message):
+            nonlocal response_started
+            if exceeded:
+                # Form parsing turned our abort into a generic error response;
+                # drop it and answer with 413 instead
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except _RequestTooLarge:
+            pass
+
+        if exceeded and not response_started:
+            logger.warning(f"Rejected upload to {scope.get('path')}: body exceeded {max_body_size} bytes")
+            await self._reject(scope, receive, send, max_body_size)
+
+    async def _reject(self, scope, receive, send, max_body_size: int):
+        if max_body_size == self.max_body_size:
+            detail = f"File too large. Maximum size: {MAX_FILE_SIZE // (1024 * 1024)}MB"
+        else:
+            detail = f"Upload too large. Maximum size: {max_body_size // (1024 * 1024)}MB"
+        response = JSONResponse(status_code=413, content={"detail": detail})
+        await response(scope, receive, send)
@@ -767,16 +767,25 @@ class VibezsumApp {
         this.showLoading('Analyzing your resume...');
 
         try {
-            const formData = new FormData();
-            formData.append('file', this.selectedFile);
-            
             const jobDescription = document.getElementById('jobDescription').value;
             const jobUrl = document.getElementById('jobUrl').value;
-            
+
+            // Skip the upload entirely when the server already has this file
+            const cached = await this.precheckResume(this.selectedFile, jobDescription, jobUrl);
+            if (cached) {
+                this.displayAnalysisResults(cached);
+                this.showToast('Resume analysis completed!', 'success');
+                return;
+            }
+
+            const formData = new FormData();
+            formData.append('file', this.selectedFile);
+
             if (jobDescription) formData.append('job_description', jobDescription);
             if (jobUrl) formData.append('job_url', jobUrl);
 
-            const response = await fetch('/api/resume/upload', {
+            // One upload covers parsing, analysis and ATS validation
+            const response = await fetch('/api/resume/report', {
                 method: 'POST',
                 body: formData
             });
@@ -787,6 +796,7 @@ class VibezsumApp {
 
             const result = await response.json();
             this.displayAnalysisResults(result);
+            this.lastReport = { file: this.selectedFile, validation_result: result.validation_result };
             
             this.showToast('Resume analysis completed!', 'success');
         } catch (error) {
@@ -797,6 +807,36 @@ class VibezsumApp {
         }
     }
 
+    async precheckResume(file, jobDescription, jobUrl) {
+        // Returns the analysis if the server has already processed this exact file, otherwise null
+        if (!window.crypto || !window.crypto.subtle) return null;
+
+        try {
+            const digest = await window.crypto.subtle.digest('SHA-256', await file.arrayBuffer());
+            const sha256 = Array.from(new Uint8Array(digest))
+                .map(byte => byte.toString(16).padStart(2, '0'))
+                .join('');
+
+            const formData = new FormData();
+            formData.append('sha256', sha256);
+            formData.append('filename', file.name);
+            if (jobDescription) formData.append('job_description', jobDescription);
+            if (jobUrl) formData.append('job_url', jobUrl);
+
+            const response = await fetch('/api/resume/precheck', {
+                method: 'POST',
+                body: formData
+            });
+            if (!response.ok) return null;
+
+            const result = await response.json();
+            return result.found ? result : null;
+        } catch (error) {
+            console.warn('Precheck failed, uploading instead:', error);
+            return null;
+        }
+    }
+
     displayAnalysisResults(result) {
         const resultsDiv = document.getElementById('analysisResults');
         resultsDiv.style.display = 'block';
@@ -1112,6 +1152,15 @@ class VibezsumApp {
                     return;
                 }
                 
+                // Reuse the ATS result from the analysis report for the same file
+                const report = this.lastReport;
+                if (report && report.validation_result && this.isSameFile(report.file, this.selectedValidatorFile)) {
+                    this.displayValidationResults(report);
+                    this.showToast('ATS validation completed!', 'success');
+                    this.hideLoading();
+                    return;
+                }
+                
                 const formData = new FormData();
                 formData.append('file', this.selectedValidatorFile);
                 
@@ -1152,6 +1201,10 @@ class VibezsumApp {
         }
     }
 
+    isSameFile(a, b) {
+        return a.name === b.name && a.size === b.size && a.lastModified === b.lastModified;
+    }
+
     displayValidationResults(result) {
         const resultsDiv = document.getElementById('validationResults');
         resultsDiv.style.display = 'block';
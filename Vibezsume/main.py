@@ -14,7 +14,12 @@ from datetime import datetime
 from pathlib import Path
 
 from app.routers import resume_analysis, resume_builder, ats_validator
-from app.services.llm_service import LLMService
+from app.services.llm_service import llm_service
+from app.services.llm_cache import llm_cache
+from app.services.upload_ingestion import UploadSizeLimitMiddleware, MAX_BATCH_SIZE
+from app.services.extraction_pool import extraction_pool
+from app.services.extraction_cache import extraction_cache
+from app.services.pdf_inspector import pdf_inspector
 from app.models.resume_models import ResumeData, JobDescription
 
 # Initialize FastAPI app
@@ -26,6 +31,13 @@ app = FastAPI(
     redoc_url="/api/redoc"
 )
 
+# Reject oversized uploads while the body is still streaming in. Added before
+# CORS so CORS stays outermost and the early 413s carry its headers too
+app.add_middleware(UploadSizeLimitMiddleware, path_limits={
+    "/api/ats/validate-batch": MAX_BATCH_SIZE,
+    "/api/resume/bulk": MAX_BATCH_SIZE
+})
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -52,9 +64,6 @@ app.include_router(resume_analysis.router, prefix="/api/resume", tags=["Resume A
 app.include_router(resume_builder.router, prefix="/api/builder", tags=["Resume Builder"])
 app.include_router(ats_validator.router, prefix="/api/ats", tags=["ATS Validator"])
 
-# Initialize LLM service
-llm_service = LLMService()
-
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
     """Main page"""
@@ -72,8 +81,13 @@ async def health_check():
         "timestamp": datetime.now().isoformat(),
         "services": {
             "llm_service": llm_service.is_available if llm_service else False,
+            "llm_client": llm_service.status(),
+            "llm_cache": llm_cache.status(),
             "static_files": static_dir.exists(),
             "templates": templates is not None,
+            "extraction_pool": extraction_pool.status(),
+            "extraction_cache": extraction_cache.status(),
+            "pdf_inspector": pdf_inspector.status(),
         },
         "endpoints": [
             "/api/resume/upload",
@@ -87,6 +101,9 @@ async def health_check():
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup"""
+    # Fork the extraction workers before the first upload arrives
+    await extraction_pool.start()
+
     try:
         await llm_service.initialize()
         if llm_service.is_available:
@@ -96,6 +113,18 @@ async def startup_event():
     except Exception as e:
         print(f"ℹ️ LLM service unavailable: {e}")
         print("The application will run with basic functionality.")
+    # Keep the availability state fresh so requests never probe Ollama themselves
+    llm_service.start_prober()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release service resources on shutdown"""
+    extraction_pool.shutdown()
+    extraction_cache.close()
+    # Stop probing and release the LLM client's keep-alive connections
+    await llm_service.stop_prober()
+    await llm_service.close()
+    llm_cache.close()
 
 if __name__ == "__main__":
     import os
@@ -11,9 +11,12 @@ import os
 import tempfile
 import PyPDF2
 from io import BytesIO
-import re
 import logging
 
+from app.services.skills_taxonomy import find_skills
+from app.services.experience_extraction import extract_experience_years
+from app.services.resume_document import ResumeDocument
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -54,48 +57,15 @@ class SimpleLLMService:
 
     def analyze_resume(self, text: str) -> dict:
         """Analyze resume text and return structured data"""
-        # Extract email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        
-        # Extract phone
-        phone_pattern = r'(\+?1?[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})'
-        phones = re.findall(phone_pattern, text)
-        
-        # Extract name (first line that looks like a name)
-        lines = text.split('\n')
-        name = ""
-        for line in lines[:5]:
-            line = line.strip()
-            if line and '@' not in line and len(line.split()) <= 3 and len(line) > 2:
-                name = line
-                break
+        # Email, phone and name come from the document's contact scan
+        document = ResumeDocument(text)
+        contact = document.contact
         
-        # Simple keyword extraction for skills
-        tech_keywords = [
-            'python', 'javascript', 'java', 'react', 'node.js', 'sql', 'aws', 'docker',
-            'git', 'html', 'css', 'mongodb', 'postgresql', 'kubernetes', 'jenkins',
-            'machine learning', 'data science', 'api', 'rest', 'microservices'
-        ]
-        
-        text_lower = text.lower()
-        found_skills = [skill for skill in tech_keywords if skill in text_lower]
+        # Keyword extraction for skills
+        found_skills = [skill.lower() for skill in find_skills(text)]
         
         # Extract experience years
-        experience_years = 0
-        exp_patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-            r'experience.*?(\d+)\+?\s*years?',
-            r'(\d+)\+?\s*years?\s*in'
-        ]
-        
-        for pattern in exp_patterns:
-            matches = re.findall(pattern, text_lower)
-            if matches:
-                try:
-                    experience_years = max(experience_years, int(matches[0]))
-                except:
-                    pass
+        experience_years = extract_experience_years(text)
         
         # Determine career level
         if experience_years >= 8:
@@ -108,9 +78,9 @@ class SimpleLLMService:
             career_level = "Entry-level"
         
         return {
-            "name": name or "Not specified",
-            "email": emails[0] if emails else "Not specified",
-            "phone": f"({phones[0][1]}) {phones[0][2]}-{phones[0][3]}" if phones else "Not specified",
+            "name": contact.full_name or "Not specified",
+            "email": contact.email or "Not specified",
+            "phone": contact.formatted_phone or "Not specified",
             "experience_years": experience_years,
             "career_level": career_level,
             "skills": found_skills[:10],
@@ -131,6 +101,7 @@ class SimpleLLMService:
 
     def validate_ats(self, text: str) -> dict:
         """Validate resume for ATS compatibility"""
+        document = ResumeDocument(text)
         issues = []
         score = 85
         
@@ -138,12 +109,12 @@ class SimpleLLMService:
             issues.append("Resume content is too short")
             score -= 15
             
-        if not re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text):
+        if document.contact.email is None:
             issues.append("No email address found")
             score -= 10
             
         structure_keywords = ['experience', 'education', 'skills', 'summary']
-        found_sections = sum(1 for keyword in structure_keywords if keyword.lower() in text.lower())
+        found_sections = sum(1 for keyword in structure_keywords if keyword in document.lower)
         
         if found_sections < 3:
             issues.append("Missing key resume sections")
@@ -164,8 +135,8 @@ class SimpleLLMService:
 
     def analyze_job_fit(self, resume_text: str, job_text: str) -> dict:
         """Analyze job fit"""
-        resume_words = set(resume_text.lower().split())
-        job_words = set(job_text.lower().split())
+        resume_words = ResumeDocument.of(resume_text).vocabulary
+        job_words = ResumeDocument.of(job_text).vocabulary
         
         common_words = resume_words.intersection(job_words)
         match_percentage = min(len(common_words) / len(job_words) * 100, 95) if job_words else 0
@@ -296,18 +267,11 @@ async def analyze_job_skills(
     try:
         job_text = f"{job_title} {job_description}".lower()
         
-        # Extract common tech skills from job description
-        tech_keywords = [
-            'python', 'javascript', 'java', 'react', 'node.js', 'sql', 'aws', 'docker',
-            'git', 'html', 'css', 'mongodb', 'postgresql', 'kubernetes', 'jenkins',
-            'machine learning', 'data science', 'api', 'rest', 'microservices'
-        ]
-        
-        found_skills = [skill for skill in tech_keywords if skill in job_text]
+        # Extract tech skills from job description
+        found_skills = [skill.lower() for skill in find_skills(job_text)]
         
         # Extract experience requirements
-        exp_match = re.search(r'(\d+)\+?\s*years?\s*(?:of\s*)?experience', job_text)
-        required_experience = int(exp_match.group(1)) if exp_match else 0
+        required_experience = extract_experience_years(job_text)
         
         return {
             "job_title": job_title,
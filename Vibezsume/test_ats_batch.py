@@ -0,0 +1,129 @@
+"""
+Test batch ATS scoring against the one-document-at-a-time path
+"""
+
+import random
+import sys
+from pathlib import Path
+sys.path.append('.')
+
+from fastapi.testclient import TestClient
+
+from app.services.ats_rules import Rule, RuleEngine, RULES, TOKENS
+from app.services.ats_validator import ATSValidator
+from app.services.text_extraction import ExtractedDocument, extract_document
+
+PIECES = [
+    "Jane Doe\n", "jane@example.com\n", "(555) 123-4567\n", "\n", "\n\n\n", "EXPERIENCE\n", "EDUCATION\n",
+    "SKILLS\n", "Summary\n", "• Built Python services on AWS\n", "- Led Agile teams\n", "* Docker, Kubernetes\n",
+    "Senior Engineer | Acme | 2019 - Present\n", "\t", "★ ☆ ● ○ ◆ ◇ ", "┌──┐│", "Leadership and teamwork. ",
+    "A very long line of prose that goes on and on about machine learning and data science work. ",
+    "B.S. Computer Science, State University, 2015\n", "SQL ", "REST API ", "Experience at the top\n",
+]
+
+
+def _random_batch(count):
+    random.seed(314)
+    documents, filenames = [], []
+    for index in range(count):
+        text = "".join(random.choice(PIECES) for _ in range(random.randint(0, 40)))
+        extension = random.choice(['.pdf', '.docx', '.txt', '.doc'])
+        if extension == '.pdf' and random.random() < 0.3:
+            # Image-only PDFs and PDFs without pages
+            document = ExtractedDocument(file_ext='.pdf', pages=[" "] if index % 2 else [], page_count=index % 2)
+        else:
+            document = ExtractedDocument.from_text(text, extension)
+        documents.append(document)
+        filenames.append(f"resume{index}{extension}")
+    return documents, filenames
+
+
+def test_batch_matches_scalar_path():
+    documents, filenames = _random_batch(400)
+    for path in sorted(Path("generated_resumes").glob("*.pdf")):
+        documents.append(extract_document(path, '.pdf'))
+        filenames.append(path.name)
+
+    validator = ATSValidator()
+    batch = validator.validate_batch(documents, filenames)
+    assert len(batch) == len(documents)
+    for document, filename, result in zip(documents, filenames, batch):
+        assert result == validator.validate_document(document, filename), filename
+
+
+def test_scalar_only_rules_fall_back():
+    def short_resume(features):
+        if features.word_count < 50:
+            yield "Too short", 25
+
+    validator = ATSValidator()
+    validator.engine = RuleEngine(RULES + [Rule("short_resume", "spacing", [TOKENS], short_resume)])
+    documents, filenames = _random_batch(20)
+    results = validator.validate_batch(documents, filenames)
+    assert any("Too short" in result.spacing_issues for result in results)
+    assert validator.validate_batch([], []) == []
+
+
+def test_batch_endpoint():
+    from main import app
+    client = TestClient(app)
+    files = [
+        ("files", ("one.txt", b"Jane Doe\njane@example.com\nEXPERIENCE\n- Python\n", "text/plain")),
+        ("files", ("two.exe", b"binary", "application/octet-stream")),
+        ("files", ("three.txt", b"", "text/plain")),
+    ]
+    response = client.post("/api/ats/validate-batch", files=files)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 3 and data["validated"] == 1
+    assert "overall_score" in data["results"][0]["validation_result"]
+    assert data["results"][1]["error"].startswith("Unsupported file type")
+    assert data["results"][2]["error"]
+
+
+def test_batch_endpoint_isolates_extraction_failures():
+    """A failing extraction fails its file only, and extraction runs a window at a time"""
+    import asyncio
+    from main import app
+    from app.routers import ats_validator as router
+    from app.services.extraction_pool import ExtractionTimeout
+    from app.services.upload_ingestion import BULK_WINDOW
+
+    extract_upload = router.resume_parser.extract_upload
+    running = peak = 0
+
+    async def flaky_extract(upload):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            await asyncio.sleep(0.01)
+            if upload.filename == "stuck.txt":
+                raise ExtractionTimeout("Extraction exceeded 30s")
+            return await extract_upload(upload)
+        finally:
+            running -= 1
+
+    router.resume_parser.extract_upload = flaky_extract
+    try:
+        client = TestClient(app)
+        resume = b"Jane Doe\njane@example.com\nEXPERIENCE\n- Python\n"
+        files = [("files", ("stuck.txt", resume, "text/plain"))]
+        files += [("files", (f"ok{number}.txt", resume, "text/plain")) for number in range(BULK_WINDOW * 2)]
+        response = client.post("/api/ats/validate-batch", files=files)
+    finally:
+        router.resume_parser.extract_upload = extract_upload
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["results"][0]["error"] == "Extraction exceeded 30s"
+    assert data["validated"] == BULK_WINDOW * 2
+    assert peak <= BULK_WINDOW
+
+
+if __name__ == "__main__":
+    test_batch_matches_scalar_path()
+    test_scalar_only_rules_fall_back()
+    test_batch_endpoint()
+    test_batch_endpoint_isolates_extraction_failures()
+    print("✅ Batch ATS scoring tests passed")
@@ -0,0 +1,156 @@
+"""
+Test the declarative ATS rule engine
+"""
+
+import random
+import sys
+sys.path.append('.')
+
+from fastapi.testclient import TestClient
+
+from app.services.ats_rules import RULES, RuleEngine, Rule, extract_features, CHARACTERS, LINE_STATS, TOKENS
+from app.services.ats_validator import ATSValidator
+from app.services.resume_document import ResumeDocument
+from app.services.skills_taxonomy import count_keywords
+from app.services.text_extraction import ExtractedDocument
+
+RESUME = """Jane Doe
+jane.doe@example.com | (555) 123-4567
+
+SUMMARY
+Backend engineer building Python and SQL services on AWS with Docker.
+
+EXPERIENCE
+Senior Engineer | Acme Corp | 2019 - Present
+• Built payment services with FastAPI and PostgreSQL
+• Led a team of five
+
+
+EDUCATION
+B.S. Computer Science | State University | 2015
+
+SKILLS
+Python, SQL, Docker, Kubernetes, Leadership
+"""
+
+
+def test_features_from_one_line_pass():
+    document = ResumeDocument(RESUME)
+    features = extract_features(document, "resume.pdf", [LINE_STATS, CHARACTERS, TOKENS])
+    assert features.max_consecutive_blanks == 2
+    assert features.first_content_line == "Jane Doe"
+    assert features.characters['•'] == 2 and features.count('•-*') == 4
+    assert features.word_count == len(RESUME.split())
+    assert features.keyword_counts == count_keywords(RESUME)
+
+
+def test_per_line_keyword_counts_match_whole_text():
+    random.seed(5)
+    pieces = ["Python", "machine learning", "Machine", "Learning", "C++", ".NET", "SQL", " ", "\n", ",", "-"]
+    for _ in range(300):
+        text = "".join(random.choice(pieces) for _ in range(40))
+        features = extract_features(ResumeDocument(text), "resume.txt", [TOKENS])
+        assert features.keyword_counts == count_keywords(text), text
+
+
+def test_unrequested_features_are_skipped():
+    features = extract_features(ResumeDocument(RESUME), "resume.pdf", [CHARACTERS])
+    assert features.word_count == 0 and features.line_lengths == []
+
+
+def test_custom_rules_and_timings():
+    def long_resume(features):
+        if features.word_count > 10:
+            yield "Too long", 40
+
+    engine = RuleEngine([Rule("long_resume", "spacing", [TOKENS], long_resume)])
+    report = engine.evaluate(ResumeDocument(RESUME), "resume.pdf")
+    assert report.issues["spacing"] == ["Too long"]
+    assert report.score("spacing") == 60 and report.score("formatting") == 100
+    assert set(report.timings) == {"features", "long_resume"}
+
+
+def test_validator_reports_rule_timings():
+    result = ATSValidator().validate_document(ExtractedDocument.from_text(RESUME, ".pdf"), "resume.pdf",
+                                              include_timings=True)
+    assert set(result.rule_timings) == {"features"} | {rule.name for rule in RULES}
+    assert "Could not analyze PDF font properties" not in result.font_issues
+    assert ATSValidator().validate_document(ExtractedDocument.from_text(RESUME), "resume.txt").rule_timings is None
+
+    import asyncio
+    from main import app
+    from app.routers import ats_validator as ats_router
+    on_loop = []
+    validate_document = ats_router.ats_validator.validate_document
+
+    def record(*args, **kwargs):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(args)
+        except RuntimeError:
+            pass
+        return validate_document(*args, **kwargs)
+
+    client = TestClient(app)
+    ats_router.ats_validator.validate_document = record
+    try:
+        response = client.post("/api/ats/validate?timings=true",
+                               files={"file": ("resume.txt", RESUME.encode(), "text/plain")})
+    finally:
+        ats_router.ats_validator.validate_document = validate_document
+    assert response.status_code == 200
+    assert "features" in response.json()["validation_result"]["rule_timings"]
+    # Scored in a worker thread, not on the event loop
+    assert on_loop == []
+
+
+def test_text_validation_in_memory():
+    import asyncio
+    import os
+    validator = ATSValidator()
+    expected = asyncio.run(validator.validate_resume("resume.docx", RESUME))
+    assert validator.validate_text(RESUME, "docx") == expected
+    assert validator.validate_text(RESUME, ".DOCX") == expected
+    assert "Use PDF or DOCX format for better ATS compatibility" in validator.validate_text(RESUME).formatting_issues
+
+    from main import app
+    client = TestClient(app)
+    uploads = set(os.listdir("uploads")) if os.path.isdir("uploads") else set()
+    response = client.post("/api/ats/validate-text", data={"resume_text": RESUME, "file_format": "docx"})
+    assert response.status_code == 200
+    assert response.json()["validation_result"] == expected.model_dump()
+    assert (set(os.listdir("uploads")) if os.path.isdir("uploads") else set()) == uploads
+
+
+def test_quick_check_uses_rule_engine():
+    quick = ATSValidator().quick_check(RESUME)
+    assert quick["issues"] == ["Resume appears too short (< 200 words)"]
+    assert quick["quick_score"] == 80 and quick["word_count"] == len(RESUME.split())
+
+    from main import app
+    client = TestClient(app)
+    response = client.post("/api/ats/quick-check", data={"resume_text": "hello", "target_keywords": "python, hello"})
+    body = response.json()
+    # The quick check keeps its own wording and penalties
+    assert body["issues"] == [
+        "Resume appears too short (< 200 words)",
+        "No email address found",
+        "No phone number detected",
+        "Sections may not be clearly defined",
+    ]
+    assert body["quick_score"] == 100 - 20 - 15 - 10 - 15
+    # Title-case headers count as sections here
+    titled = ATSValidator().quick_check("Jane\njane@example.com 555-123-4567\nExperience\nEducation")
+    assert titled["issues"] == ["Resume appears too short (< 200 words)"] and titled["quick_score"] == 80
+    assert body["keyword_analysis"] == {"python": {"count": 0, "found": False}, "hello": {"count": 1, "found": True}}
+
+
+if __name__ == "__main__":
+    test_features_from_one_line_pass()
+    test_per_line_keyword_counts_match_whole_text()
+    test_unrequested_features_are_skipped()
+    test_custom_rules_and_timings()
+    test_validator_reports_rule_timings()
+    test_text_validation_in_memory()
+    test_quick_check_uses_rule_engine()
+    print("✅ ATS rule engine tests passed")
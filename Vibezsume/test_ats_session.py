@@ -0,0 +1,101 @@
+"""
+Test incremental ATS scoring for live editing sessions
+"""
+
+import random
+import sys
+sys.path.append('.')
+
+from fastapi.testclient import TestClient
+
+from app.services.ats_session import ATSSession
+from app.services.ats_validator import ATSValidator
+from app.services.resume_document import ResumeDocument
+
+RESUME = """Jane Doe
+jane.doe@example.com | (555) 123-4567
+
+SUMMARY
+Backend engineer building Python and SQL services on AWS with Docker.
+
+EXPERIENCE
+Senior Engineer | Acme Corp | 2019 - Present
+• Built payment services with FastAPI and PostgreSQL
+"""
+
+
+def test_edits_match_full_validation():
+    random.seed(11)
+    validator = ATSValidator()
+    pieces = ["Python", "machine learning", "SKILLS\n", "EDUCATION", "\n", "\n\n", " ", "•", "-", "\t", "│",
+              "x@y.io", "555-987-6543", "é"]
+    session = ATSSession(RESUME, validator=validator)
+    text = RESUME
+    for step in range(600):
+        start = random.randint(0, len(text))
+        end = random.randint(start, min(len(text), start + random.choice([0, 1, 8, 60])))
+        inserted = "".join(random.choice(pieces) for _ in range(random.randint(0, 3)))
+        session.apply(start, end, inserted)
+        text = text[:start] + inserted + text[end:]
+        assert session.text == text
+        if step % 5 == 0:
+            expected = validator.validate_document(ResumeDocument(text), "resume.txt").model_dump()
+            assert session.validate().model_dump() == expected, text
+
+
+def test_edits_reanalyze_only_touched_lines():
+    validator = ATSValidator()
+    text = RESUME + "\n".join(f"Line {number} with Python" for number in range(2000))
+    session = ATSSession(text, validator=validator)
+    session.validate()
+    before = list(session.lines)
+    start = text.index("Line 1500")
+    session.apply(start, start + 4, "Row")
+    assert sum(old is not new for old, new in zip(before, session.lines)) == 1
+    assert session.offsets[-1] == len(session.text) - len(session.lines[-1].text)
+    
+    # A phone number wrapped across lines is still found, and losing it is noticed
+    session.reset("Jane Doe\nSKILLS\nPython\n555\n123\n4567\n")
+    assert session.features().contact.phone == "555\n123\n4567"
+    session.apply(len("Jane Doe\nSKILLS\nPython\n555"), len("Jane Doe\nSKILLS\nPython\n555\n123"), "")
+    assert session.features().contact.phone is None
+    assert session.validate().model_dump() == validator.validate_document(
+        ResumeDocument(session.text), "resume.txt").model_dump()
+
+
+def test_rejects_edits_outside_the_document():
+    session = ATSSession("short")
+    try:
+        session.apply(2, 9, "")
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+    assert session.text == "short"
+
+
+def test_live_websocket():
+    from main import app
+    client = TestClient(app)
+    with client.websocket_connect("/api/ats/live?filename=resume.pdf") as websocket:
+        websocket.send_json({"version": 1, "text": RESUME})
+        first = websocket.receive_json()
+        assert first["version"] == 1
+        assert "No email address found - essential for ATS parsing" not in first["validation_result"]["section_issues"]
+        
+        start = RESUME.index("jane.doe")
+        websocket.send_json({"version": 2, "changes": [{"start": start, "end": start + 20, "text": ""}]})
+        second = websocket.receive_json()
+        assert second["version"] == 2 and second["elapsed_ms"] >= 0
+        assert "No email address found - essential for ATS parsing" in second["validation_result"]["section_issues"]
+        assert second["validation_result"]["overall_score"] < first["validation_result"]["overall_score"]
+        
+        websocket.send_json({"version": 3, "changes": [{"start": 0, "end": 10 ** 6}]})
+        assert websocket.receive_json()["error"].startswith("Invalid edit")
+
+
+if __name__ == "__main__":
+    test_edits_match_full_validation()
+    test_edits_reanalyze_only_touched_lines()
+    test_rejects_edits_outside_the_document()
+    test_live_websocket()
+    print("✅ ATS session tests passed")
@@ -0,0 +1,136 @@
+"""
+Test the streaming /api/resume/bulk endpoint
+"""
+
+import asyncio
+import io
+import json
+import sys
+import zipfile
+sys.path.append('.')
+
+from fastapi.testclient import TestClient
+
+from main import app
+from app.routers import resume_analysis
+
+client = TestClient(app)
+
+
+def _resume_bytes() -> bytes:
+    with open("test_resume.txt", "rb") as f:
+        return f.read()
+
+
+def _lines(response):
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_bulk_streams_one_line_per_file():
+    files = [
+        ("files", ("first.txt", _resume_bytes(), "text/plain")),
+        ("files", ("notes.exe", b"binary", "application/octet-stream")),
+        ("files", ("second.txt", _resume_bytes().replace(b"John", b"Jane"), "text/plain")),
+    ]
+    response = client.post("/api/resume/bulk", files=files)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["x-bulk-count"] == "3"
+
+    results = sorted(_lines(response), key=lambda line: line["index"])
+    assert [line["filename"] for line in results] == ["first.txt", "notes.exe", "second.txt"]
+    assert 0 <= results[0]["validation_result"]["overall_score"] <= 100
+    assert results[0]["stages"] == ["ats"]
+    assert results[1]["error"].startswith("Unsupported file type")
+    assert "validation_result" in results[2]
+
+
+def test_bulk_parses_and_scores_off_the_event_loop():
+    """Parsing and ATS scoring run in worker threads, not on the event loop"""
+    on_loop = []
+    parse_document = resume_analysis.resume_parser.parse_document
+    validate_document = resume_analysis.ats_validator.validate_document
+
+    def record(fn):
+        def wrapper(*args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(fn.__name__)
+            except RuntimeError:
+                pass
+            return fn(*args, **kwargs)
+        return wrapper
+
+    resume_analysis.resume_parser.parse_document = record(parse_document)
+    resume_analysis.ats_validator.validate_document = record(validate_document)
+    try:
+        files = [("files", (f"resume{number}.txt", _resume_bytes() + str(number).encode(), "text/plain"))
+                 for number in range(3)]
+        response = client.post("/api/resume/bulk", files=files, data={"stages": "parse,ats"})
+    finally:
+        resume_analysis.resume_parser.parse_document = parse_document
+        resume_analysis.ats_validator.validate_document = validate_document
+
+    assert response.status_code == 200
+    assert all("validation_result" in line for line in _lines(response))
+    assert on_loop == []
+
+
+def test_bulk_expands_zip_archives():
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("resumes/alice.txt", _resume_bytes())
+        zf.writestr("resumes/bob.txt", b"")
+        zf.writestr("__MACOSX/resumes/._alice.txt", b"junk")
+        zf.writestr("resumes/", b"")
+    files = [
+        ("files", ("batch.zip", archive.getvalue(), "application/zip")),
+        ("files", ("carol.txt", _resume_bytes(), "text/plain")),
+    ]
+    response = client.post("/api/resume/bulk", files=files, data={"stages": "parse,ats"})
+    assert response.status_code == 200
+
+    results = {line["filename"]: line for line in _lines(response)}
+    assert set(results) == {"alice.txt", "bob.txt", "carol.txt"}
+    assert results["alice.txt"]["resume_data"]["contact_info"]["email"]
+    assert results["bob.txt"]["error"] == "Could not extract text from file"
+
+    response = client.post("/api/resume/bulk", files=[("files", ("bad.zip", b"not a zip", "application/zip"))])
+    assert response.status_code == 400
+
+
+def test_bulk_keeps_window_bounded():
+    original_build, original_window = resume_analysis._build_report, resume_analysis.BULK_WINDOW
+    in_flight = {"now": 0, "peak": 0}
+
+    async def slow_report(upload, requested, job_description=None, job_url=None):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return {"filename": upload.filename}
+
+    resume_analysis._build_report, resume_analysis.BULK_WINDOW = slow_report, 3
+    try:
+        files = [("files", (f"resume{index}.txt", b"text", "text/plain")) for index in range(10)]
+        response = client.post("/api/resume/bulk", files=files)
+    finally:
+        resume_analysis._build_report, resume_analysis.BULK_WINDOW = original_build, original_window
+
+    assert sorted(line["index"] for line in _lines(response)) == list(range(10))
+    assert in_flight["peak"] == 3
+
+
+def test_bulk_rejects_unknown_stage():
+    response = client.post("/api/resume/bulk", files=[("files", ("a.txt", b"text", "text/plain"))],
+                           data={"stages": "ats,bogus"})
+    assert response.status_code == 400
+
+
+if __name__ == "__main__":
+    test_bulk_streams_one_line_per_file()
+    test_bulk_parses_and_scores_off_the_event_loop()
+    test_bulk_expands_zip_archives()
+    test_bulk_keeps_window_bounded()
+    test_bulk_rejects_unknown_stage()
+    print("✅ Bulk report tests passed")
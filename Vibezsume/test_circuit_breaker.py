@@ -0,0 +1,122 @@
+"""
+Test the circuit breaker guarding the Ollama backend
+"""
+
+import asyncio
+import sys
+sys.path.append('.')
+
+from app.services.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+from app.services.llm_service import LLMService
+from test_llm_client import _fake_ollama
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_opens_after_consecutive_failures():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, backoff=5, clock=clock)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.seconds_until_retry() == 5
+    assert breaker.stats["rejected"] == 1
+
+
+def test_half_open_trial_and_backoff_doubling():
+    clock = FakeClock()
+    breaker = CircuitBreaker(backoff=5, max_backoff=15, clock=clock)
+    breaker.trip()
+    assert breaker.state == OPEN
+
+    # One trial once the backoff has elapsed; others are refused meanwhile
+    clock.now = 5
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow()
+
+    # A failed trial reopens with the backoff doubled, capped at the maximum
+    breaker.trip()
+    assert breaker.state == OPEN and breaker.backoff == 10
+    clock.now = 15
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.backoff == 15 and breaker.seconds_until_retry() == 15
+
+    # A successful trial closes it and resets the backoff
+    clock.now = 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.closed and breaker.backoff == 5 and breaker.failures == 0
+    assert breaker.stats["opened"] == 3 and breaker.stats["trials"] == 3
+
+
+def test_open_breaker_skips_the_network():
+    async def scenario():
+        clock = FakeClock()
+        service = LLMService(ollama_url="http://127.0.0.1:9")
+        service.breaker = CircuitBreaker(backoff=5, clock=clock, name="Ollama")
+        await service.initialize()
+        assert not service.is_available and service.breaker.state == OPEN
+        assert service.pool_stats["connect_errors"] == 1
+
+        # Neither requests nor re-probes touch the network while open
+        for _ in range(10):
+            await service.initialize()
+            assert await service.generate_response("hello")
+        assert service.pool_stats["requests"] == 1
+
+        # Once due, a single re-probe goes out and fails again
+        clock.now = 5
+        await service.initialize()
+        assert service.pool_stats["requests"] == 2
+        assert service.breaker.state == OPEN and service.breaker.backoff == 10
+        assert service.status()["circuit"]["state"] == OPEN
+        await service.close()
+
+    asyncio.run(scenario())
+
+
+def test_prober_recovers_service():
+    async def scenario():
+        connections = []
+        server = await _fake_ollama(connections)
+        port = server.sockets[0].getsockname()[1]
+        service = LLMService(ollama_url=f"http://127.0.0.1:{port}")
+        service.breaker = CircuitBreaker(backoff=0.05, name="Ollama")
+        try:
+            # Down at first (as if Ollama had not started yet)
+            service.breaker.trip()
+            assert not service.is_available
+            service.start_prober()
+            for _ in range(50):
+                if service.is_available:
+                    break
+                await asyncio.sleep(0.02)
+            assert service.is_available and service.breaker.closed
+            assert await service.generate_response("hi") == "echo: hi"
+        finally:
+            await service.stop_prober()
+            await service.close()
+            server.close()
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_opens_after_consecutive_failures()
+    test_half_open_trial_and_backoff_doubling()
+    test_open_breaker_skips_the_network()
+    test_prober_recovers_service()
+    print("✅ Circuit breaker tests passed")
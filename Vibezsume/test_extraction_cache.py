@@ -0,0 +1,191 @@
+"""
+Test the content-addressed extraction cache (memory LRU + SQLite tier)
+"""
+
+import hashlib
+import sqlite3
+import sys
+sys.path.append('.')
+
+from fastapi.testclient import TestClient
+
+from app.models.resume_models import ResumeData, ContactInfo
+from app.services.bloom_filter import BloomFilter
+from app.services import extraction_cache as extraction_cache_module
+from app.services.extraction_cache import ExtractionCache, extraction_cache
+from app.services.text_extraction import ExtractedDocument
+
+
+def _resume_data() -> ResumeData:
+    return ResumeData(contact_info=ContactInfo(full_name="Jane Doe", email="jane@example.com"))
+
+
+def test_memory_and_disk_tiers(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ExtractionCache(path=path)
+    document = ExtractedDocument.from_text("Jane Doe\njane@example.com\n")
+
+    assert cache.get("abc", ".txt") is None
+    cache.put("abc", ".txt", document, _resume_data())
+    assert cache.get("abc", ".txt").document is document
+    assert cache.get("abc", ".pdf") is None
+    cache.close()
+
+    # A fresh instance (e.g. after a restart) is served from SQLite
+    restarted = ExtractionCache(path=path)
+    entry = restarted.get("abc", ".txt")
+    assert entry.document.text == document.text
+    assert entry.resume_data == _resume_data()
+    print(f"Cache stats: {restarted.status()}")
+    assert restarted.stats["disk_hits"] == 1
+    restarted.close()
+
+
+def test_size_based_eviction():
+    cache = ExtractionCache(path=None, memory_max_bytes=400)
+    for number in range(5):
+        cache.put(f"key{number}", ".txt", ExtractedDocument.from_text("x" * 100))
+    assert cache.status()["memory_bytes"] <= 400
+    assert cache.get("key0", ".txt") is None
+    assert cache.get("key4", ".txt") is not None
+    assert cache.stats["evictions"] > 0
+
+
+def test_entries_from_other_parser_versions_are_dropped(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ExtractionCache(path=path)
+    cache.put("abc", ".txt", ExtractedDocument.from_text("Jane Doe\n"), _resume_data())
+    cache.close()
+
+    version = extraction_cache_module.CACHE_VERSION
+    extraction_cache_module.CACHE_VERSION = version + 1
+    try:
+        upgraded = ExtractionCache(path=path)
+        assert upgraded.get("abc", ".txt") is None
+        assert not upgraded.might_contain("abc", ".txt")
+        assert upgraded.status()["disk_bytes"] == 0
+        upgraded.close()
+    finally:
+        extraction_cache_module.CACHE_VERSION = version
+
+    # A table from before rows were versioned is replaced
+    db = sqlite3.connect(path)
+    db.execute("DROP TABLE extractions")
+    db.execute("CREATE TABLE extractions (cache_key TEXT PRIMARY KEY, document TEXT NOT NULL, "
+               "resume_data TEXT, size INTEGER NOT NULL, last_accessed REAL NOT NULL)")
+    db.execute("INSERT INTO extractions VALUES ('abc.txt', '{}', NULL, 2, 0)")
+    db.commit()
+    db.close()
+    legacy = ExtractionCache(path=path)
+    assert legacy.get("abc", ".txt") is None
+    legacy.put("abc", ".txt", ExtractedDocument.from_text("Jane Doe\n"))
+    assert legacy.get("abc", ".txt") is not None
+    legacy.close()
+
+
+def test_disk_total_is_tracked_across_replacements(tmp_path):
+    cache = ExtractionCache(path=str(tmp_path / "cache.sqlite3"), memory_max_bytes=0, disk_max_bytes=10 ** 9)
+    for text in ("short\n", "a much longer document\n", "mid length\n"):
+        cache.put("abc", ".txt", ExtractedDocument.from_text(text))
+    cache.put("def", ".txt", ExtractedDocument.from_text("other\n"))
+    total = cache._db.execute("SELECT SUM(size) FROM extractions").fetchone()[0]
+    assert cache.status()["disk_bytes"] == total
+
+    cache.disk_max_bytes = total - 1
+    cache.put("ghi", ".txt", ExtractedDocument.from_text("x\n"))
+    remaining = cache._db.execute("SELECT SUM(size) FROM extractions").fetchone()[0]
+    assert cache.status()["disk_bytes"] == remaining <= cache.disk_max_bytes
+    cache.close()
+
+
+def test_repeat_upload_hits_cache():
+    from main import app
+
+    client = TestClient(app)
+    with open("test_resume.txt", "rb") as f:
+        content = f.read()
+    sha256 = hashlib.sha256(content).hexdigest()
+
+    for _ in range(2):
+        response = client.post("/api/ats/validate", files={"file": ("resume.txt", content, "text/plain")})
+        assert response.status_code == 200
+
+    assert extraction_cache.get(sha256, ".txt") is not None
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"key{number}" for number in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+
+    false_positives = sum(f"other{number}" in bloom for number in range(10000))
+    print(f"Bloom false positives: {false_positives}/10000")
+    assert false_positives < 300
+
+
+def test_precheck_skips_known_uploads():
+    from main import app
+
+    client = TestClient(app)
+    with open("test_resume.txt", "rb") as f:
+        content = f.read()
+    sha256 = hashlib.sha256(content).hexdigest()
+
+    response = client.post("/api/resume/precheck", data={"sha256": "0" * 64, "filename": "resume.txt"})
+    assert response.status_code == 200
+    assert response.json() == {"found": False}
+
+    response = client.post("/api/resume/precheck", data={"sha256": "not-a-hash", "filename": "resume.txt"})
+    assert response.status_code == 400
+
+    client.post("/api/ats/validate", files={"file": ("resume.txt", content, "text/plain")})
+    assert extraction_cache.might_contain(sha256, ".txt")
+    assert not extraction_cache.might_contain(sha256, ".pdf")
+
+
+
+def test_precheck_parses_cached_extractions_off_the_event_loop():
+    import asyncio
+    from main import app
+    from app.routers import resume_analysis
+
+    with open("test_resume.txt", "rb") as f:
+        content = f.read() + b"\nprecheck"
+    sha256 = hashlib.sha256(content).hexdigest()
+    extraction_cache.put(sha256, ".txt", ExtractedDocument.from_text(content.decode()))
+
+    on_loop = []
+    parse_document = resume_analysis.resume_parser.parse_document
+
+    def record(document):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(document)
+        except RuntimeError:
+            pass
+        return parse_document(document)
+
+    resume_analysis.resume_parser.parse_document = record
+    try:
+        response = TestClient(app).post("/api/resume/precheck", data={"sha256": sha256, "filename": "resume.txt"})
+    finally:
+        resume_analysis.resume_parser.parse_document = parse_document
+    assert response.status_code == 200 and response.json()["found"]
+    assert on_loop == []
+    assert extraction_cache.get(sha256, ".txt").resume_data is not None
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_memory_and_disk_tiers(Path(tempfile.mkdtemp()))
+    test_size_based_eviction()
+    test_entries_from_other_parser_versions_are_dropped(Path(tempfile.mkdtemp()))
+    test_disk_total_is_tracked_across_replacements(Path(tempfile.mkdtemp()))
+    test_repeat_upload_hits_cache()
+    test_bloom_filter_has_no_false_negatives()
+    test_precheck_skips_known_uploads()
+    test_precheck_parses_cached_extractions_off_the_event_loop()
+    print("✅ Extraction cache tests passed")
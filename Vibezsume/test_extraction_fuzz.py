@@ -0,0 +1,150 @@
+"""
+Fuzz and benchmark harness for experience/education and contact extraction
+
+Feeds adversarial and random inputs through the line-oriented extractors
+and the contact scanner, and asserts a per-document time ceiling plus linear scaling.
+"""
+
+import random
+import re
+import sys
+import time
+sys.path.append('.')
+
+from app.services.experience_extraction import (
+    extract_experience_entries, extract_education_entries, extract_experience_years
+)
+from app.services.contact_scanner import scan_contact
+from app.services.resume_parser import ResumeParser
+from app.services.section_index import SectionIndex
+from app.services.text_extraction import ExtractedDocument
+
+# Budget for one document of PDF_MAX_CHARS (200k) characters
+TIME_CEILING_SECONDS = 2.0
+DOCUMENT_SIZE = 200_000
+
+
+def _repeat(unit: str, size: int = DOCUMENT_SIZE) -> str:
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+def adversarial_inputs(size: int = DOCUMENT_SIZE):
+    """Inputs that made the old DOTALL/lazy-quantifier patterns backtrack"""
+    return {
+        "experience_words": _repeat("experience ", size) + "5 years",
+        "no_newlines_caps": "A" + _repeat("Inc ", size),
+        "year_soup": _repeat("2019 ", size),
+        "capitalized_lines": _repeat("Acme Corp\n", size),
+        "dated_lines": _repeat("Engineer | Acme | 2019 - 2021\n", size),
+        "bullets_only": _repeat("- 2020 shipped things\n", size),
+        "degrees_no_blank_lines": _repeat("Bachelor Master PhD MBA ", size),
+        "institutions": _repeat("University, College, Institute, 2019\n", size),
+        "digits": _repeat("1", size) + " years of experience",
+        "pipes": _repeat("|", size),
+        "email_local_parts": _repeat("a.", size),
+        "email_domains": "a@" + _repeat("b.", size),
+        "at_signs": _repeat("a.b@", size),
+        "phone_digits": _repeat("555-", size),
+    }
+
+
+def _run_extractors(text: str) -> float:
+    parser = ResumeParser()
+    started = time.perf_counter()
+    for header in ("EXPERIENCE", "EDUCATION"):
+        sections = SectionIndex(f"{header}\n{text}")
+        parser._extract_experience(sections)
+        parser._extract_education(sections)
+    extract_experience_years(text)
+    scan_contact(text)
+    return time.perf_counter() - started
+
+
+def test_adversarial_inputs_stay_under_ceiling():
+    for name, text in adversarial_inputs().items():
+        elapsed = _run_extractors(text)
+        print(f"{name:>24}: {elapsed * 1000:7.1f}ms")
+        assert elapsed < TIME_CEILING_SECONDS, f"{name} took {elapsed:.2f}s"
+
+
+def test_runtime_scales_linearly():
+    for name in ("experience_words", "dated_lines", "institutions", "email_local_parts"):
+        small = min(_run_extractors(adversarial_inputs(DOCUMENT_SIZE // 8)[name]) for _ in range(3))
+        large = min(_run_extractors(adversarial_inputs(DOCUMENT_SIZE)[name]) for _ in range(3))
+        print(f"{name}: 8x input -> {large / small:.1f}x time")
+        # Linear work gives ~8x; quadratic would give ~64x
+        assert large < small * 20 + 0.01
+
+
+def test_random_inputs_never_fail():
+    random.seed(2024)
+    pieces = ["Engineer", "Acme Inc", "|", " ", "\n", "- ", "• ", "2019", "Present", "01/2020",
+              "Bachelor", "University", ",", " in ", "experience", "5", "years", "\x7f", "1. "]
+    for _ in range(500):
+        text = "".join(random.choice(pieces) for _ in range(random.randint(0, 60)))
+        for entry in extract_experience_entries(text.split("\n")):
+            assert entry["company"] and entry["position"]
+        for entry in extract_education_entries(text.split("\n")):
+            assert entry["degree"] and entry["institution"]
+        assert 0 <= extract_experience_years(text) <= 60
+        _run_extractors(text)
+
+
+def test_extracts_common_layouts():
+    jobs = extract_experience_entries([
+        "Senior Engineer | Acme Corp | 2021 - Present",
+        "- Led the payments team",
+        "Globex",
+        "Software Engineer",
+        "01/2018 - 12/2020",
+        "• Built APIs in Python",
+    ])
+    assert [(job["company"], job["position"]) for job in jobs] == [
+        ("Acme Corp", "Senior Engineer"), ("Globex", "Software Engineer")
+    ]
+    assert jobs[0]["end_date"] is None
+    assert jobs[1]["start_date"] == "01/2018" and jobs[1]["end_date"] == "12/2020"
+    assert jobs[1]["technologies"] == ["Python"]
+
+    schools = extract_education_entries([
+        "Master of Science in Data Science",
+        "State University, 2020",
+        "B.S. Mathematics | City College | 2016",
+    ])
+    assert [(school["degree"], school["institution"], school["end_date"]) for school in schools] == [
+        ("Master of Science in Data Science", "State University", "2020"),
+        ("B.S. Mathematics", "City College", "2016"),
+    ]
+    assert extract_experience_years("Engineer with 7+ years of experience; 3 years in fintech") == 7
+
+
+def test_contact_scan_matches_reference_patterns():
+    """The linear-time contact patterns find what the old inline regexes found"""
+    email = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+    phone = re.compile(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+    random.seed(99)
+    pieces = ["john", ".", "_", "-", "+", "@", "acme", ".com", ".io", " ", "\n", "555", "1234", "(", ")",
+              "linkedin.com/in/", "github.com/", "jd", "/"]
+    for _ in range(2000):
+        text = "".join(random.choice(pieces) for _ in range(random.randint(0, 30)))
+        contact = scan_contact(text)
+        expected_email = email.search(text)
+        assert contact.email == (expected_email.group() if expected_email else None), text
+        expected_phone = phone.search(text)
+        assert contact.phone == (expected_phone.group() if expected_phone else None), text
+
+    document = ExtractedDocument.from_text("Jane Roe\n.jane.roe@example.com | +1 (555) 123-4567\nlinkedin.com/in/janeroe")
+    contact = document.contact
+    assert document.contact is contact
+    assert (contact.full_name, contact.email, contact.formatted_phone, contact.linkedin) == (
+        "Jane Roe", "jane.roe@example.com", "(555) 123-4567", "https://linkedin.com/in/janeroe"
+    )
+
+
+if __name__ == "__main__":
+    test_adversarial_inputs_stay_under_ceiling()
+    test_runtime_scales_linearly()
+    test_random_inputs_never_fail()
+    test_extracts_common_layouts()
+    test_contact_scan_matches_reference_patterns()
+    print("✅ Extraction fuzz tests passed")
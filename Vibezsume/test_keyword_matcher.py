@@ -0,0 +1,81 @@
+"""
+Test the Aho-Corasick keyword matcher and the shared skills taxonomy
+"""
+
+import random
+import re
+import sys
+import time
+sys.path.append('.')
+
+from app.services.keyword_matcher import KeywordMatcher
+from app.services.skills_taxonomy import find_skills, count_keywords, category_of
+
+
+def _naive_count(keywords, text):
+    """Reference implementation: one boundary-aware regex per keyword"""
+    counts = {}
+    lowered = text.lower()
+    for keyword in keywords:
+        key = keyword.lower()
+        left = r'(?<![\w])' if key[0].isalnum() else ''
+        right = r'(?![\w])' if key[-1].isalnum() else ''
+        # Overlapping occurrences count, as they do in the automaton
+        count = len(re.findall(f'(?=({left}{re.escape(key)}{right}))', lowered))
+        if count:
+            counts[keyword] = count
+    return counts
+
+
+def test_word_boundaries():
+    matcher = KeywordMatcher(['Java', 'JavaScript', 'C++', '.NET', 'Node.js', 'Machine Learning', 'Learning'])
+    text = "JavaScript and Java, C++/C#, ASP.NET, node.js; machine learning (learning!)"
+    assert matcher.count(text) == {
+        'JavaScript': 1, 'Java': 1, 'C++': 1, '.NET': 1, 'Node.js': 1, 'Machine Learning': 1, 'Learning': 2
+    }
+    assert matcher.find("javascripting in javas") == []
+
+
+def test_matches_naive_scan():
+    vocabulary = ['go', 'golang', 'sql', 'postgresql', 'ci/cd', 'c#', 'data', 'data science', 'science']
+    matcher = KeywordMatcher(vocabulary)
+    random.seed(7)
+    pieces = vocabulary + ['my', 'x', ' ', ' ', ',', '\n', '-', 'ing']
+    for _ in range(200):
+        text = "".join(random.choice(pieces) for _ in range(40))
+        assert matcher.count(text) == _naive_count(vocabulary, text), text
+
+
+def test_cost_stays_flat_as_vocabulary_grows():
+    random.seed(11)
+    text = " ".join(random.choice(['python', 'developer', 'sql', 'team', 'aws']) for _ in range(20000))
+    small = KeywordMatcher(['python', 'sql', 'aws'])
+    large = KeywordMatcher(['python', 'sql', 'aws'] + [f'skill{number}' for number in range(20000)])
+
+    started = time.perf_counter()
+    small_counts = small.count(text)
+    small_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    large_counts = large.count(text)
+    large_time = time.perf_counter() - started
+
+    print(f"3 terms: {small_time * 1000:.1f}ms, 20003 terms: {large_time * 1000:.1f}ms")
+    assert small_counts == large_counts
+    assert large_time < small_time * 3 + 0.05
+
+
+def test_taxonomy_helpers():
+    text = "Python developer. Leadership, teamwork, REST APIs on AWS with Docker."
+    assert find_skills(text) == ['Python', 'AWS', 'Docker']
+    assert 'Leadership' in find_skills(text, categories=None)
+    assert count_keywords(text, categories=['Soft Skill']) == {'Leadership': 1, 'Teamwork': 1}
+    assert category_of('docker') == 'Cloud & DevOps'
+
+
+if __name__ == "__main__":
+    test_word_boundaries()
+    test_matches_naive_scan()
+    test_cost_stays_flat_as_vocabulary_grows()
+    test_taxonomy_helpers()
+    print("✅ Keyword matcher tests passed")
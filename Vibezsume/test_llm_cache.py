@@ -0,0 +1,180 @@
+"""
+Test the persistent LLM response cache
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+sys.path.append('.')
+
+from app.services import llm_service as llm_service_module
+from app.services.llm_cache import LLMCache
+from app.services.llm_service import LLMService
+from app.services.tiered_cache import APP_ROOT, resolve_cache_path
+from test_llm_client import _fake_ollama
+from test_llm_streaming import _fake_streaming_ollama
+
+
+def test_keys_cover_the_whole_request():
+    key = LLMCache.make_key("llama3.2:3b", "Review", "Be brief", {"temperature": 0, "seed": 42})
+    assert key == LLMCache.make_key("llama3.2:3b", "Review", "Be brief", {"seed": 42, "temperature": 0})
+    assert key != LLMCache.make_key("mistral:7b", "Review", "Be brief", {"temperature": 0, "seed": 42})
+    assert key != LLMCache.make_key("llama3.2:3b", "Review", "Be kind", {"temperature": 0, "seed": 42})
+    assert key != LLMCache.make_key("llama3.2:3b", "Review", "Be brief", {"temperature": 0, "seed": 7})
+
+
+def test_disk_tier_survives_restarts():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "llm.sqlite3")
+        cache = LLMCache(path)
+        key = cache.make_key("llama3.2:3b", "Review this resume")
+        assert cache.get(key) is None
+        cache.put(key, "Add metrics")
+        assert cache.get(key) == "Add metrics"
+        cache.close()
+
+        reopened = LLMCache(path)
+        assert reopened.get(key) == "Add metrics"
+        assert reopened.get(key) == "Add metrics"
+        status = reopened.status()
+        assert status["disk_hits"] == 1 and status["memory_hits"] == 1 and status["hit_ratio"] == 1.0
+        reopened.close()
+
+
+def test_disk_hits_defer_access_time_writes():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "llm.sqlite3")
+        cache = LLMCache(path)
+        cache.put("key", "Add metrics")
+        cache.close()
+
+        cache = LLMCache(path)
+        changes = cache._db.total_changes
+        assert cache.get("key") == "Add metrics"
+        assert cache._db.total_changes == changes and "key" in cache._touched
+        cache.close()
+
+        db = sqlite3.connect(path)
+        created, accessed = db.execute("SELECT created, last_accessed FROM llm_responses").fetchone()
+        db.close()
+        assert accessed > created
+
+    # Relative paths are relative to the app, not the working directory
+    assert resolve_cache_path("cache/llm_cache.sqlite3") == str(APP_ROOT / "cache" / "llm_cache.sqlite3")
+    assert resolve_cache_path("/tmp/llm.sqlite3") == "/tmp/llm.sqlite3"
+    assert resolve_cache_path(":memory:") == ":memory:"
+
+
+def test_ttl_and_size_caps():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMCache(os.path.join(tmp, "llm.sqlite3"), ttl=0.05)
+        cache.put("stale", "old answer")
+        time.sleep(0.1)
+        assert cache.get("stale") is None
+        assert cache.stats["misses"] == 1
+        cache.close()
+
+        # Ten-byte responses: memory holds two, disk holds three
+        cache = LLMCache(os.path.join(tmp, "sized.sqlite3"), memory_max_bytes=20, disk_max_bytes=30)
+        for number in range(3):
+            cache.put(f"key{number}", f"answer {number:03d}")
+        assert cache.status()["memory_entries"] == 2
+        assert cache.get("key0") == "answer 000"
+        assert cache.stats["disk_hits"] == 1
+
+        # key0 was just used, so key1 is the least recently used on disk
+        cache.put("key3", "answer 003")
+        cache._memory.clear()
+        assert cache.get("key1") is None
+        assert [cache.get(key) for key in ("key0", "key2", "key3")] == ["answer 000", "answer 002", "answer 003"]
+        cache.close()
+
+
+def test_service_answers_repeats_from_cache():
+    async def scenario():
+        connections = []
+        server = await _fake_ollama(connections)
+        port = server.sockets[0].getsockname()[1]
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = LLMCache(os.path.join(tmp, "llm.sqlite3"))
+            service = LLMService(ollama_url=f"http://127.0.0.1:{port}", cache=cache)
+            try:
+                await service.initialize()
+                assert await service.generate_response("hello", "Be brief") == "echo: hello"
+                requests = service.pool_stats["requests"]
+
+                # The repeat never reaches Ollama, even once it goes down
+                assert await service.generate_response("hello", "Be brief") == "echo: hello"
+                service.breaker.trip()
+                assert await service.generate_response("hello", "Be brief") == "echo: hello"
+                assert service.pool_stats["requests"] == requests
+
+                # A different system prompt is a different request
+                assert await service.generate_response("hello", "Be kind") != "echo: hello"
+                assert cache.status()["hit_ratio"] == 0.5
+            finally:
+                await service.close()
+                cache.close()
+                server.close()
+
+    asyncio.run(scenario())
+
+
+def test_streamed_responses_are_cached_once_complete():
+    async def scenario():
+        release = asyncio.Event()
+        release.set()
+        server = await _fake_streaming_ollama(["Add ", "metrics"], release)
+        port = server.sockets[0].getsockname()[1]
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = LLMCache(os.path.join(tmp, "llm.sqlite3"))
+            service = LLMService(ollama_url=f"http://127.0.0.1:{port}", cache=cache)
+            service.model_ready = True
+            try:
+                assert [token async for token in service.stream_response("Review")] == ["Add ", "metrics"]
+                assert [token async for token in service.stream_response("Review")] == ["Add metrics"]
+                assert service.pool_stats["requests"] == 1
+                # Streamed and plain generation share entries
+                assert await service.generate_response("Review") == "Add metrics"
+            finally:
+                await service.close()
+                cache.close()
+                server.close()
+
+    asyncio.run(scenario())
+
+
+def test_sampled_responses_are_not_cached():
+    async def scenario():
+        server = await _fake_ollama([])
+        port = server.sockets[0].getsockname()[1]
+        cache = LLMCache(None)
+        service = LLMService(ollama_url=f"http://127.0.0.1:{port}", cache=cache)
+        deterministic = llm_service_module.LLM_DETERMINISTIC
+        llm_service_module.LLM_DETERMINISTIC = False
+        try:
+            await service.initialize()
+            assert await service.generate_response("hello") == "echo: hello"
+            assert await service.generate_response("hello") == "echo: hello"
+            status = cache.status()
+            assert status["memory_entries"] == 0 and status["misses"] == 0
+        finally:
+            llm_service_module.LLM_DETERMINISTIC = deterministic
+            await service.close()
+            server.close()
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_keys_cover_the_whole_request()
+    test_disk_tier_survives_restarts()
+    test_disk_hits_defer_access_time_writes()
+    test_ttl_and_size_caps()
+    test_service_answers_repeats_from_cache()
+    test_streamed_responses_are_cached_once_complete()
+    test_sampled_responses_are_not_cached()
+    print("✅ LLM cache tests passed")
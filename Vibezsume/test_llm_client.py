@@ -0,0 +1,85 @@
+"""
+Test the pooled keep-alive HTTP client of the LLM service
+"""
+
+import asyncio
+import json
+import sys
+sys.path.append('.')
+
+from app.services.llm_service import LLMService, LLM_MAX_CONNECTIONS
+
+
+async def _fake_ollama(connections: list):
+    """A minimal keep-alive HTTP server answering the two Ollama endpoints"""
+    async def handle(reader, writer):
+        connections.append(writer)
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.IncompleteReadError:
+                break
+            request_line, *header_lines = head.decode().split("\r\n")
+            length = next((int(line.split(":")[1]) for line in header_lines
+                           if line.lower().startswith("content-length")), 0)
+            body = json.loads(await reader.readexactly(length)) if length else {}
+            if request_line.startswith("GET /api/tags"):
+                payload = {"models": [{"name": "llama3.2:3b"}]}
+            else:
+                payload = {"response": f"echo: {body['prompt']}"}
+            data = json.dumps(payload).encode()
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                         b"Content-Length: " + str(len(data)).encode() + b"\r\n\r\n" + data)
+            await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+def test_requests_reuse_one_connection():
+    async def scenario():
+        connections = []
+        server = await _fake_ollama(connections)
+        port = server.sockets[0].getsockname()[1]
+        service = LLMService(ollama_url=f"http://127.0.0.1:{port}")
+        try:
+            await service.initialize()
+            assert service.is_available
+            for number in range(5):
+                assert await service.generate_response(f"hello {number}") == f"echo: hello {number}"
+            client = service.client
+
+            # Sequential calls share one keep-alive connection and one client
+            assert len(connections) == 1
+            assert service.client is client
+            status = service.status()
+            assert status["requests"] == 6 and status["in_flight"] == 0 and status["peak_in_flight"] == 1
+            assert status["max_connections"] == LLM_MAX_CONNECTIONS and status["client_open"]
+
+            # Concurrent distinct calls open more connections, up to the pool limit
+            await asyncio.gather(*(service.generate_response(f"together {number}") for number in range(3)))
+            assert 1 < service.pool_stats["peak_in_flight"] <= 3
+            assert len(connections) <= 3
+        finally:
+            await service.close()
+            server.close()
+        assert not service.status()["client_open"]
+    
+    asyncio.run(scenario())
+
+
+def test_unreachable_server_counts_connect_errors():
+    async def scenario():
+        service = LLMService(ollama_url="http://127.0.0.1:9")
+        await service.initialize()
+        assert not service.is_available
+        assert service.pool_stats["connect_errors"] == 1
+        await service.close()
+    
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_requests_reuse_one_connection()
+    test_unreachable_server_counts_connect_errors()
+    print("✅ LLM client tests passed")
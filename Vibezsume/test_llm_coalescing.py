@@ -0,0 +1,112 @@
+"""
+Test single-flight coalescing of concurrent identical LLM requests
+"""
+
+import asyncio
+import json
+import sys
+sys.path.append('.')
+
+from app.services.llm_service import LLMService
+
+
+async def _slow_ollama(prompts: list, release: asyncio.Event):
+    """Answers /api/generate only once ``release`` is set, recording each prompt"""
+    async def handle(reader, writer):
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            length = next((int(line.split(b":")[1]) for line in head.split(b"\r\n")
+                           if line.lower().startswith(b"content-length")), 0)
+            body = json.loads(await reader.readexactly(length)) if length else {}
+            prompts.append(body["prompt"])
+            await release.wait()
+            data = json.dumps({"response": f"echo: {body['prompt']}"}).encode()
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                         b"Content-Length: " + str(len(data)).encode() + b"\r\n\r\n" + data)
+            await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+def _run(scenario):
+    async def wrapper():
+        prompts = []
+        release = asyncio.Event()
+        server = await _slow_ollama(prompts, release)
+        port = server.sockets[0].getsockname()[1]
+        service = LLMService(ollama_url=f"http://127.0.0.1:{port}")
+        service.model_ready = True
+        try:
+            await scenario(service, prompts, release)
+        finally:
+            await service.close()
+            server.close()
+
+    asyncio.run(wrapper())
+
+
+def test_identical_requests_share_one_generation():
+    async def scenario(service, prompts, release):
+        same = [asyncio.create_task(service.generate_response("analyze", "Be brief")) for _ in range(5)]
+        other = asyncio.create_task(service.generate_response("analyze", "Be kind"))
+        await asyncio.sleep(0.05)
+        release.set()
+        assert await asyncio.gather(*same) == ["echo: analyze"] * 5
+        assert await other == "echo: analyze"
+        assert prompts == ["analyze", "analyze"]
+        assert service.pool_stats["coalesced"] == 4 and service.pool_stats["requests"] == 2
+        assert not service._flights
+
+        # Once it has finished, the next identical request generates again
+        assert await service.generate_response("analyze", "Be brief") == "echo: analyze"
+        assert len(prompts) == 3
+
+    _run(scenario)
+
+
+def test_cancelled_waiter_does_not_cancel_the_others():
+    async def scenario(service, prompts, release):
+        first = asyncio.create_task(service.generate_response("analyze"))
+        second = asyncio.create_task(service.generate_response("analyze"))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        assert await second == "echo: analyze"
+        assert first.cancelled()
+        assert prompts == ["analyze"] and service.pool_stats["abandoned"] == 0
+
+    _run(scenario)
+
+
+def test_generation_stops_when_every_waiter_leaves():
+    async def scenario(service, prompts, release):
+        waiters = [asyncio.create_task(service.generate_response("analyze")) for _ in range(2)]
+        while not prompts:
+            await asyncio.sleep(0.01)
+        flight = next(iter(service._flights.values()))
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        # The request unwinds over a few loop iterations
+        await asyncio.wait({flight.task}, timeout=5)
+        assert flight.task.cancelled()
+        assert service.pool_stats["abandoned"] == 1 and not service._flights
+
+        # A later caller starts a fresh generation rather than joining the cancelled one
+        release.set()
+        assert await service.generate_response("analyze") == "echo: analyze"
+        assert prompts == ["analyze", "analyze"]
+
+    _run(scenario)
+
+
+if __name__ == "__main__":
+    test_identical_requests_share_one_generation()
+    test_cancelled_waiter_does_not_cancel_the_others()
+    test_generation_stops_when_every_waiter_leaves()
+    print("✅ LLM coalescing tests passed")
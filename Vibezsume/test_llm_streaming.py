@@ -0,0 +1,125 @@
+"""
+Test token streaming from Ollama and the SSE analysis endpoint
+"""
+
+import asyncio
+import json
+import sys
+sys.path.append('.')
+
+from fastapi.testclient import TestClient
+
+from main import app
+from app.services.llm_service import LLMService
+
+client = TestClient(app)
+
+
+async def _fake_streaming_ollama(tokens: list, release: asyncio.Event):
+    """Streams ``tokens`` as chunked NDJSON, holding the rest back until ``release`` is set"""
+    async def handle(reader, writer):
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = next((int(line.split(b":")[1]) for line in head.split(b"\r\n")
+                       if line.lower().startswith(b"content-length")), 0)
+        body = json.loads(await reader.readexactly(length)) if length else {}
+        assert body.get("stream") is True
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                     b"Transfer-Encoding: chunked\r\n\r\n")
+        lines = [{"response": token, "done": False} for token in tokens] + [{"response": "", "done": True}]
+        for number, line in enumerate(lines):
+            if number == 1:
+                await release.wait()
+            data = (json.dumps(line) + "\n").encode()
+            writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+def _events(response):
+    """Parse a Server-Sent Events body into (event, data) pairs"""
+    events = []
+    for block in response.text.split("\n\n"):
+        if not block.strip():
+            continue
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_tokens_arrive_before_the_completion():
+    async def scenario():
+        release = asyncio.Event()
+        server = await _fake_streaming_ollama(["Add ", "metrics ", "to bullets"], release)
+        port = server.sockets[0].getsockname()[1]
+        service = LLMService(ollama_url=f"http://127.0.0.1:{port}")
+        service.model_ready = True
+        try:
+            stream = service.stream_response("Review this resume")
+            # The first token comes through while the server still holds back the rest
+            first = await asyncio.wait_for(stream.__anext__(), timeout=5)
+            assert first == "Add "
+            release.set()
+            rest = [token async for token in stream]
+            assert rest == ["metrics ", "to bullets"]
+            assert service.pool_stats["in_flight"] == 0 and service.breaker.closed
+        finally:
+            await service.close()
+            server.close()
+
+    asyncio.run(scenario())
+
+
+def test_stream_falls_back_without_the_llm():
+    async def scenario():
+        # Unavailable: the fallback in one piece, without a request
+        service = LLMService(ollama_url="http://127.0.0.1:9")
+        chunks = [chunk async for chunk in service.stream_response("Review this resume")]
+        assert chunks == [service._fallback_response("Review this resume")]
+        assert service.pool_stats["requests"] == 0
+
+        # Failing before the first token: the fallback, and the failure is counted
+        service.model_ready = True
+        chunks = [chunk async for chunk in service.stream_response("Review this resume")]
+        assert chunks == [service._fallback_response("Review this resume")]
+        assert service.pool_stats["connect_errors"] == 1 and service.breaker.failures == 1
+        await service.close()
+
+    asyncio.run(scenario())
+
+
+def test_sse_endpoint_streams_analysis_events():
+    with open("test_resume.txt", "rb") as f:
+        files = {"file": ("resume.txt", f.read(), "text/plain")}
+    response = client.post("/api/resume/analyze/stream", files=files,
+                           data={"job_description": "Python developer with FastAPI and Docker"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = _events(response)
+    names = [name for name, _ in events]
+    assert names[0] == "analysis" and names[-1] == "done"
+    assert set(names[1:-1]) <= {"token"}
+
+    analysis, done = events[0][1], events[-1][1]
+    assert done["success"] and done["file_id"] == analysis["file_id"]
+    assert done["score"] == analysis["score"]
+    assert done["has_job_description"] and done["skill_gap"] is not None
+    assert done["vibe_feedback"]
+
+
+def test_sse_endpoint_rejects_bad_files_before_streaming():
+    files = {"file": ("resume.exe", b"binary", "application/octet-stream")}
+    response = client.post("/api/resume/analyze/stream", files=files)
+    assert response.status_code == 400
+
+
+if __name__ == "__main__":
+    test_tokens_arrive_before_the_completion()
+    test_stream_falls_back_without_the_llm()
+    test_sse_endpoint_streams_analysis_events()
+    test_sse_endpoint_rejects_bad_files_before_streaming()
+    print("✅ LLM streaming tests passed")
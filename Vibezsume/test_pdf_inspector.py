@@ -0,0 +1,168 @@
+"""
+Test the lightweight PDF inspector and the font and layout ATS rules built on it
+"""
+
+import os
+import sys
+import zlib
+from io import BytesIO
+sys.path.append('.')
+
+import reportlab
+from fastapi.testclient import TestClient
+from PIL import Image
+from PyPDF2.generic import EncodedStreamObject, NameObject
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from app.services import pdf_inspector, text_extraction
+from app.services.extraction_pool import extraction_pool
+from app.services.ats_validator import ATSValidator
+from app.services.pdf_inspector import PdfInspector, font_family, inspect_pdf
+from app.services.text_extraction import ExtractedDocument
+
+pdfmetrics.registerFont(TTFont("Vera", os.path.join(os.path.dirname(reportlab.__file__), "fonts", "Vera.ttf")))
+
+LINES = ["Jane Doe", "jane.doe@example.com | (555) 123-4567", "EXPERIENCE", "Senior Engineer | Acme Corp",
+         "- Built payment services in Python", "EDUCATION", "B.S. Computer Science", "SKILLS", "Python, SQL"]
+
+
+def _pdf(two_columns=False, font="Helvetica", image=False) -> bytes:
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer)
+    pdf.setFont(font, 11)
+    for number, line in enumerate(LINES * 2):
+        pdf.drawString(72, 740 - number * 15, line)
+        if two_columns:
+            pdf.drawString(330, 740 - number * 15, line)
+    # A right-aligned date and a centered title are not columns
+    pdf.drawRightString(540, 740, "2019 - Present")
+    pdf.drawCentredString(306, 770, "Resume")
+    if image:
+        pdf.drawImage(ImageReader(Image.new("RGB", (4, 4), "red")), 400, 700, 20, 20)
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def test_inspection_reads_fonts_images_and_columns():
+    plain = inspect_pdf(_pdf())
+    assert plain.font_families == ["Helvetica"]
+    assert plain.fonts == {"Helvetica": False} and plain.unembedded_fonts == []
+    assert not plain.multi_column and not plain.has_images
+    assert plain.page_count == 1 and plain.inspected_pages == 1
+
+    columns = inspect_pdf(_pdf(two_columns=True, font="Vera", image=True))
+    assert columns.multi_column and columns.multi_column_pages == [0]
+    assert columns.fonts == {"Helvetica": False, "BitstreamVeraSans-Roman": True}
+    assert columns.font_families == ["BitstreamVeraSans", "Helvetica"]
+    assert columns.image_count == 1
+
+    assert font_family("TimesNewRomanPSMT") == "TimesNewRoman"
+    assert font_family("Arial-BoldMT") == "Arial"
+    assert font_family("Calibri,Bold") == "Calibri"
+
+
+def test_extraction_skips_layout_scan():
+    scans = []
+    has_columns = pdf_inspector._has_columns
+    pdf_inspector._has_columns = lambda page: scans.append(page) or has_columns(page)
+    try:
+        document = text_extraction.extract_document(_pdf(two_columns=True, image=True), ".pdf")
+    finally:
+        pdf_inspector._has_columns = has_columns
+    assert scans == []
+    assert document.fonts == ["Helvetica"] and document.image_count == 1
+    assert ExtractedDocument.from_dict(document.to_dict()).to_dict() == document.to_dict()
+
+
+def test_font_and_layout_rules():
+    validator = ATSValidator()
+    data = _pdf()
+    plain = validator.validate_document(text_extraction.extract_document(data, ".pdf"), "resume.pdf",
+                                        inspection=inspect_pdf(data))
+    assert plain.font_issues == [] and plain.pdf_inspection["font_families"] == ["Helvetica"]
+    assert "Multi-column layout detected - ATS may read the columns out of order" not in plain.formatting_issues
+
+    busy_data = _pdf(two_columns=True, font="Vera", image=True)
+    busy = validator.validate_document(text_extraction.extract_document(busy_data, ".pdf"), "resume.pdf",
+                                       inspection=inspect_pdf(busy_data))
+    assert "Multi-column layout detected - ATS may read the columns out of order" in busy.formatting_issues
+    assert "Contains images or graphics - ATS cannot read text inside them" in busy.formatting_issues
+    assert busy.font_issues == [
+        "Uncommon fonts may not parse reliably: BitstreamVeraSans - use Arial, Calibri, Times New Roman, or Helvetica"
+    ]
+    assert busy.overall_score < plain.overall_score
+
+    # Batch scoring applies the same rules
+    documents = [text_extraction.extract_document(source, ".pdf") for source in (data, busy_data)]
+    inspections = [inspect_pdf(source) for source in (data, busy_data)]
+    assert validator.validate_batch(documents, ["a.pdf", "b.pdf"], inspections) == [plain, busy]
+
+    # Text without a PDF behind it still gets general font advice
+    assert len(validator.validate_text("Jane Doe", "docx").font_issues) == 2
+
+
+def test_inspections_cached_by_hash():
+    inspector = PdfInspector(max_entries=1)
+    data = _pdf()
+    first = inspector.inspect("a" * 64, data)
+    assert inspector.inspect("a" * 64, b"not read again") is first
+    inspector.inspect("b" * 64, _pdf(two_columns=True))
+    assert inspector.get("a" * 64) is None
+    assert inspector.status() == {"entries": 1, "hits": 1, "misses": 2}
+
+    from main import app
+    client = TestClient(app)
+    columns = _pdf(two_columns=True)
+    # Inspection runs in the extraction workers, not on a thread
+    calls = []
+    original = extraction_pool.run
+    async def recording_run(fn, *args, **kwargs):
+        calls.append(fn)
+        return await original(fn, *args, **kwargs)
+    extraction_pool.run = recording_run
+    try:
+        response = client.post("/api/ats/inspect", files={"file": ("resume.pdf", columns, "application/pdf")})
+    finally:
+        extraction_pool.run = original
+    assert response.status_code == 200
+    assert calls == [inspect_pdf]
+    assert response.json()["inspection"]["multi_column_pages"] == [1]
+    response = client.post("/api/ats/inspect", files={"file": ("resume.txt", b"text", "text/plain")})
+    assert response.status_code == 400
+
+    # The ATS endpoints inspect PDF uploads through the same cache
+    hits = pdf_inspector.pdf_inspector.stats["hits"]
+    response = client.post("/api/ats/validate", files={"file": ("resume.pdf", columns, "application/pdf")})
+    assert "Multi-column layout detected - ATS may read the columns out of order" in \
+        response.json()["validation_result"]["formatting_issues"]
+    assert pdf_inspector.pdf_inspector.stats["hits"] == hits + 1
+
+
+def test_content_scan_inflates_only_its_budget():
+    # A ~50KB stream that inflates to 50MB
+    bomb = EncodedStreamObject()
+    bomb._data = zlib.compress(b" " * (50 * 1024 * 1024))
+    bomb[NameObject("/Filter")] = NameObject("/FlateDecode")
+    data = pdf_inspector._content_prefix([bomb], pdf_inspector.CONTENT_SCAN_BYTES)
+    assert len(data) == pdf_inspector.CONTENT_SCAN_BYTES
+    assert bomb.decoded_self is None
+
+    # Streams past the budget, or behind filters the scan does not decode, are not read
+    plain = EncodedStreamObject()
+    plain._data = b"BT 72 700 Td (Jane) Tj ET"
+    assert pdf_inspector._content_prefix([plain, bomb], len(plain._data)) == plain._data
+    plain[NameObject("/Filter")] = NameObject("/LZWDecode")
+    assert pdf_inspector._content_prefix([plain], 1024) == b""
+
+
+if __name__ == "__main__":
+    test_inspection_reads_fonts_images_and_columns()
+    test_extraction_skips_layout_scan()
+    test_font_and_layout_rules()
+    test_inspections_cached_by_hash()
+    test_content_scan_inflates_only_its_budget()
+    print("✅ PDF inspector tests passed")
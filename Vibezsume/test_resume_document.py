@@ -0,0 +1,76 @@
+"""
+Test the shared resume document and its cached views
+"""
+
+import asyncio
+import sys
+sys.path.append('.')
+
+from app.services.ats_validator import ATSValidator
+from app.services.llm_service import LLMService
+from app.services.resume_document import ResumeDocument
+from app.services.resume_parser import ResumeParser
+from app.services.text_extraction import ExtractedDocument
+
+RESUME = """Jane Doe
+jane.doe@example.com | (555) 123-4567
+
+  SUMMARY
+Backend engineer with 8 years of experience building Python APIs.
+
+EXPERIENCE
+Senior Engineer | Acme Corp | 2019 - Present
+- Built payment services
+"""
+
+
+def test_views_are_computed_once():
+    document = ResumeDocument(RESUME)
+    assert document.lines is document.lines
+    assert document.sections.lines is document.lines
+    assert document.lower == RESUME.lower()
+    assert document.tokens == RESUME.split()
+    assert document.word_count == len(RESUME.split())
+    assert document.content_lines[2] == "SUMMARY"
+    assert "python" in document.vocabulary
+    assert document.contact.email == "jane.doe@example.com"
+    assert ResumeDocument.of(document) is document
+
+
+def test_line_offsets():
+    document = ResumeDocument(RESUME)
+    for number, offset in enumerate(document.line_offsets):
+        assert RESUME[offset:].startswith(document.lines[number])
+        assert document.line_at(offset) == number
+    assert document.line_at(RESUME.index("Acme")) == document.lines.index("Senior Engineer | Acme Corp | 2019 - Present")
+
+
+def test_extended_document_drops_stale_views():
+    document = ExtractedDocument(file_ext='.pdf', pages=["Jane Doe\n"], page_count=2)
+    assert document.contact.email is None and document.word_count == 2
+    document.extend(ExtractedDocument(file_ext='.pdf', pages=["jane@example.com\n"]))
+    assert document.contact.email == "jane@example.com"
+    assert document.word_count == 3
+    assert document.lines == ["Jane Doe", "jane@example.com", ""]
+
+
+def test_services_accept_documents():
+    document = ExtractedDocument.from_text(RESUME)
+    assert ResumeParser().parse_document(document).contact_info.email == "jane.doe@example.com"
+    assert ResumeParser().parse_text(RESUME).contact_info.full_name == "Jane Doe"
+
+    result = ATSValidator().validate_document(document, "resume.txt")
+    assert result.keyword_optimization["found_keywords"]["python"] == 1
+
+    service = LLMService()
+    assert service.extract_basic_info(document)["phone"] == "(555) 123-4567"
+    fit = asyncio.run(service.analyze_job_fit(document, "python engineer"))
+    assert fit["match_percentage"] == 95
+
+
+if __name__ == "__main__":
+    test_views_are_computed_once()
+    test_line_offsets()
+    test_extended_document_drops_stale_views()
+    test_services_accept_documents()
+    print("✅ Resume document tests passed")
@@ -0,0 +1,72 @@
+"""
+Test the combined /api/resume/report endpoint (one upload, every stage)
+"""
+
+import sys
+sys.path.append('.')
+
+from fastapi.testclient import TestClient
+
+from main import app
+
+client = TestClient(app)
+
+JOB_DESCRIPTION = "Backend engineer with Python, SQL and Docker experience"
+
+
+def _resume_bytes() -> bytes:
+    with open("test_resume.txt", "rb") as f:
+        return f.read()
+
+
+def test_report_runs_every_stage():
+    response = client.post(
+        "/api/resume/report",
+        files={"file": ("resume.txt", _resume_bytes(), "text/plain")},
+        data={"job_description": JOB_DESCRIPTION}
+    )
+    print(f"Report: {response.status_code}")
+    assert response.status_code == 200
+
+    result = response.json()
+    assert result["stages"] == ["parse", "ats", "analysis", "skill_gap", "vibe"]
+    assert result["resume_data"]["contact_info"]["email"]
+    assert 0 <= result["validation_result"]["overall_score"] <= 100
+    assert 0 <= result["analysis"]["score"] <= 100
+    assert "skill_match_percentage" in result["skill_gap"]
+    assert result["vibe_feedback"]
+
+
+def test_report_stage_selection():
+    response = client.post(
+        "/api/resume/report",
+        files={"file": ("resume.txt", _resume_bytes(), "text/plain")},
+        data={"stages": "ats"}
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert "validation_result" in result
+    assert "resume_data" not in result and "analysis" not in result
+
+    # The ATS stage matches the standalone validator
+    standalone = client.post(
+        "/api/ats/validate",
+        files={"file": ("resume.txt", _resume_bytes(), "text/plain")}
+    ).json()
+    assert result["validation_result"] == standalone["validation_result"]
+
+
+def test_report_rejects_unknown_stage():
+    response = client.post(
+        "/api/resume/report",
+        files={"file": ("resume.txt", _resume_bytes(), "text/plain")},
+        data={"stages": "parse,horoscope"}
+    )
+    assert response.status_code == 400
+
+
+if __name__ == "__main__":
+    test_report_runs_every_stage()
+    test_report_stage_selection()
+    test_report_rejects_unknown_stage()
+    print("✅ Resume report tests passed")
@@ -0,0 +1,78 @@
+"""
+Test single-pass section segmentation shared by the parser and ATS checks
+"""
+
+import sys
+sys.path.append('.')
+
+from app.services.section_index import SectionIndex
+from app.services.text_extraction import ExtractedDocument
+
+RESUME = """Jane Doe
+jane.doe@example.com
+
+Professional Summary:
+Backend engineer with eight years of experience building APIs
+and data pipelines for fintech companies.
+
+Unrelated second paragraph.
+
+WORK EXPERIENCE
+Senior Engineer | Acme Corp | 2019-Present
+- Built payment services
+
+EDUCATION
+B.S. Computer Science | State University | 2015
+
+TECHNICAL SKILLS
+Python, SQL, Docker
+"""
+
+
+def test_sections_and_spans():
+    index = SectionIndex(RESUME)
+    assert list(index.sections) == ["summary", "experience", "education", "skills"]
+    assert "projects" not in index
+
+    assert index.body("experience") == "Senior Engineer | Acme Corp | 2019-Present\n- Built payment services\n\n"
+    assert index.body("skills") == "Python, SQL, Docker\n"
+    assert index.body("projects") is None
+    assert index.paragraph("summary") == (
+        "Backend engineer with eight years of experience building APIs "
+        "and data pipelines for fintech companies."
+    )
+    assert index.headers == ["Professional Summary:", "WORK EXPERIENCE", "EDUCATION", "TECHNICAL SKILLS"]
+    assert index.caps_headers == ["WORK EXPERIENCE", "EDUCATION", "TECHNICAL SKILLS"]
+
+
+def test_title_case_headers_still_get_caps_advice():
+    """Known title-case headers are sections, but the ALL CAPS advice still applies"""
+    from app.services.ats_validator import ATSValidator
+
+    text = "Jane Doe\njane@example.com\n\nExperience\nEngineer\n\nEducation\nB.S.\n\nSkills\nPython\n"
+    result = ATSValidator().validate_text(text)
+    assert "Section headers should be in ALL CAPS or clearly formatted" in result.section_issues
+    assert not any(issue.startswith("Missing required sections") for issue in result.section_issues)
+
+    caps = text.replace("Experience", "EXPERIENCE").replace("Education", "EDUCATION").replace("Skills", "SKILLS")
+    assert "Section headers should be in ALL CAPS or clearly formatted" not in ATSValidator().validate_text(caps).section_issues
+
+
+def test_words_inside_text_are_not_sections():
+    """'Experienced' in a summary line no longer counts as an experience section"""
+    index = SectionIndex("SUMMARY\nExperienced engineer with strong skills\n")
+    assert list(index.sections) == ["summary"]
+
+
+def test_index_is_built_once_per_document():
+    document = ExtractedDocument.from_text(RESUME)
+    assert document.sections is document.sections
+    assert document.sections.body("education").startswith("B.S. Computer Science")
+
+
+if __name__ == "__main__":
+    test_sections_and_spans()
+    test_title_case_headers_still_get_caps_advice()
+    test_words_inside_text_are_not_sections()
+    test_index_is_built_once_per_document()
+    print("✅ Section index tests passed")
@@ -0,0 +1,271 @@
+"""
+Test in-memory text extraction for PDF, DOCX and TXT content
+"""
+
+import asyncio
+import io
+import os
+import sys
+import threading
+import tracemalloc
+import zipfile
+from pathlib import Path
+sys.path.append('.')
+
+import docx
+
+from app.services import text_extraction
+from app.services.extraction_pool import ExtractionPool, ExtractionTimeout
+from app.services.pdf_inspector import inspect_pdf
+from app.services.resume_parser import ResumeParser
+
+SAMPLE_PDF = sorted(Path("generated_resumes").glob("*.pdf"))[0]
+
+
+def _sample_docx_bytes() -> bytes:
+    document = docx.Document()
+    document.add_paragraph("Jane Doe")
+    document.add_paragraph("jane.doe@example.com")
+    document.add_paragraph("EXPERIENCE")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _multipage_pdf_bytes(page_count: int) -> bytes:
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer)
+    for number in range(page_count):
+        pdf.drawString(72, 720, f"Page {number} experience with Python and SQL")
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def test_pdf_buffer_matches_path():
+    """Extracting from bytes gives the same text as extracting from disk"""
+    from_path = text_extraction.extract_text(SAMPLE_PDF, ".pdf")
+    from_buffer = text_extraction.extract_text(io.BytesIO(SAMPLE_PDF.read_bytes()), ".pdf")
+    print(f"PDF text: {len(from_path)} chars")
+    assert from_path
+    assert from_buffer == from_path
+
+
+def test_docx_buffer():
+    text = text_extraction.extract_text(_sample_docx_bytes(), ".docx")
+    assert text.splitlines() == ["Jane Doe", "jane.doe@example.com", "EXPERIENCE"]
+
+
+def test_docx_streaming_reads_tables_headers_and_text_boxes():
+    """Headers, body paragraphs and table cells come out in document order"""
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = "Jane Doe | jane.doe@example.com"
+    document.add_paragraph("SKILLS")
+    table = document.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "Python"
+    table.cell(0, 1).text = "SQL"
+    document.add_paragraph("EXPERIENCE")
+    buffer = io.BytesIO()
+    document.save(buffer)
+
+    blocks = list(text_extraction.iter_docx_blocks(buffer.getvalue()))
+    assert blocks == ["Jane Doe | jane.doe@example.com", "SKILLS", "Python", "SQL", "EXPERIENCE"]
+
+    # A text box anchored in a paragraph is read once, not again from its VML fallback
+    body = (
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+        'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"><w:body>'
+        '<w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs></w:pPr>'
+        '<w:r><w:t>Name</w:t><w:tab/><w:t>Title</w:t></w:r>'
+        '<w:r><mc:AlternateContent><mc:Choice><w:txbxContent><w:p><w:r><w:t>Boxed</w:t></w:r></w:p>'
+        '</w:txbxContent></mc:Choice><mc:Fallback><w:txbxContent><w:p><w:r><w:t>Boxed</w:t></w:r></w:p>'
+        '</w:txbxContent></mc:Fallback></mc:AlternateContent></w:r></w:p>'
+        '</w:body></w:document>'
+    )
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("word/document.xml", body)
+    assert list(text_extraction.iter_docx_blocks(archive.getvalue())) == ["Boxed", "Name\tTitle"]
+
+
+def test_docx_extraction_ignores_embedded_media():
+    """Memory stays flat however large the embedded images are"""
+    archive = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(_sample_docx_bytes())) as source, \
+            zipfile.ZipFile(archive, "w", zipfile.ZIP_STORED) as target:
+        for item in source.infolist():
+            target.writestr(item, source.read(item))
+        target.writestr("word/media/image1.png", os.urandom(20 * 1024 * 1024))
+    data = archive.getvalue()
+
+    tracemalloc.start()
+    text = text_extraction.extract_text(data, ".docx")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"DOCX extraction peak memory: {peak / 1024:.0f} KiB")
+    assert text.splitlines() == ["Jane Doe", "jane.doe@example.com", "EXPERIENCE"]
+    assert peak < 2 * 1024 * 1024
+
+
+def test_txt_buffer_matches_path():
+    from_path = text_extraction.extract_text("test_resume.txt", ".txt")
+    from_buffer = text_extraction.extract_text(Path("test_resume.txt").read_bytes(), ".txt")
+    assert from_buffer == from_path
+
+
+def test_parse_resume_from_buffer():
+    parser = ResumeParser()
+    with open("test_resume.txt", "rb") as f:
+        resume_data = asyncio.run(parser.parse_resume_from_buffer(f, ".txt"))
+    print(f"Parsed contact: {resume_data.contact_info.full_name}")
+    assert resume_data.contact_info.email
+
+
+def test_extraction_pool_offloads_and_times_out():
+    """PDF extraction runs in a worker process; slow tasks hit the timeout"""
+    import time
+
+    pool = ExtractionPool(max_workers=1, timeout=20)
+    asyncio.run(pool.start())
+    try:
+        readers = []
+
+        class Upload(io.BytesIO):
+            def read(self, *args):
+                readers.append(threading.get_ident())
+                return super().read(*args)
+
+        text = asyncio.run(pool.extract_text(Upload(SAMPLE_PDF.read_bytes()), ".pdf"))
+        assert text == text_extraction.extract_text(SAMPLE_PDF, ".pdf")
+        # Spooled uploads may be on disk, so they are read off the event loop
+        assert readers and threading.get_ident() not in readers
+
+        try:
+            asyncio.run(pool.run(time.sleep, 2, timeout=0.2))
+            assert False, "expected a timeout"
+        except ExtractionTimeout:
+            pass
+        assert pool.stats["timeouts"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_hung_task_does_not_hold_a_worker():
+    """A task still running at its timeout gets its worker killed and replaced"""
+    import time
+
+    pool = ExtractionPool(max_workers=2, timeout=20)
+
+    async def scenario():
+        await pool.start()
+        old_workers = list(pool._executor._processes.values())
+        hung = pool.run(time.sleep, 60, timeout=0.5)
+        # Running alongside, caught in the restart, and retried on the new workers
+        innocent = pool.run(time.sleep, 1)
+        results = await asyncio.gather(hung, innocent, return_exceptions=True)
+        assert isinstance(results[0], ExtractionTimeout)
+        assert results[1] is None
+        for process in old_workers:
+            process.join(5)
+            assert not process.is_alive()
+        assert await pool.run(sum, [1, 2, 3]) == 6
+
+    try:
+        started = time.monotonic()
+        asyncio.run(scenario())
+        assert time.monotonic() - started < 15
+        assert pool.stats["restarts"] == 1 and pool.stats["timeouts"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_pdf_page_budgets():
+    """Page and character budgets stop extraction early"""
+    data = _multipage_pdf_bytes(10)
+    assert text_extraction.extract_pdf_text(data, max_pages=2).count("Page ") == 2
+
+    document = text_extraction.extract_pdf_page_range(data, 0, None, max_chars=100)
+    assert document.page_count == 10
+    assert 1 < len(document.pages) < 10
+    assert document.truncated
+
+
+def test_parallel_pdf_extraction_matches_sequential():
+    """Page ranges split across workers join back in document order"""
+    data = _multipage_pdf_bytes(12)
+    sequential = text_extraction.extract_pdf_text(data, max_pages=None, max_chars=None)
+
+    pool = ExtractionPool(max_workers=2, timeout=20)
+    try:
+        parallel = asyncio.run(pool.extract_pdf_text(data, max_pages=None, max_chars=None, pages_per_task=3))
+        assert parallel == sequential
+
+        budgeted = asyncio.run(pool.extract_pdf_text(data, max_pages=7, max_chars=None, pages_per_task=3))
+        assert budgeted.count("Page ") == 7
+    finally:
+        pool.shutdown()
+
+
+def test_page_ranges_share_one_copy_and_stop_together():
+    """Range tasks get a path instead of the bytes, and a failed range cancels its wave"""
+    data = _multipage_pdf_bytes(12)
+    sources, cancelled = [], []
+
+    class FailingPool(ExtractionPool):
+        async def run(self, fn, *args, timeout=None, retry=True):
+            sources.append(args[0])
+            start = args[1]
+            if start == 0:
+                return fn(*args)
+            if start == 3:
+                raise RuntimeError("bad range")
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.append(start)
+                raise
+
+    pool = FailingPool(max_workers=3)
+    document = asyncio.run(pool.extract_pdf_document(data, max_pages=None, max_chars=None, pages_per_task=3))
+    assert document.text.count("Page ") == 3
+    assert sorted(cancelled) == [6, 9]
+    assert all(isinstance(source, str) for source in sources) and len(set(sources)) == 1
+    assert not os.path.exists(sources[0])
+
+
+def test_extracted_document_shared_by_parser_and_ats():
+    """One extraction feeds both the parser and the ATS checks"""
+    from app.services.ats_validator import ATSValidator
+
+    document = text_extraction.extract_document(SAMPLE_PDF.read_bytes(), ".pdf")
+    assert document.page_count >= 1
+    assert document.text_selectable
+    assert document.fonts
+    print(f"Fonts: {document.fonts}")
+
+    resume_data = ResumeParser().parse_document(document)
+    assert resume_data.contact_info.full_name
+
+    validator = ATSValidator()
+    # The path variant inspects the file itself; callers holding a document pass the inspection
+    shared = validator.validate_document(document, SAMPLE_PDF.name, inspection=inspect_pdf(SAMPLE_PDF))
+    from_path = asyncio.run(validator.validate_resume(str(SAMPLE_PDF), document.text))
+    assert shared == from_path
+
+
+if __name__ == "__main__":
+    test_pdf_buffer_matches_path()
+    test_docx_buffer()
+    test_docx_streaming_reads_tables_headers_and_text_boxes()
+    test_docx_extraction_ignores_embedded_media()
+    test_txt_buffer_matches_path()
+    test_parse_resume_from_buffer()
+    test_extraction_pool_offloads_and_times_out()
+    test_hung_task_does_not_hold_a_worker()
+    test_pdf_page_budgets()
+    test_parallel_pdf_extraction_matches_sequential()
+    test_page_ranges_share_one_copy_and_stop_together()
+    test_extracted_document_shared_by_parser_and_ats()
+    print("✅ Text extraction tests passed")
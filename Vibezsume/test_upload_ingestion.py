@@ -0,0 +1,78 @@
+"""
+Test streaming upload ingestion (size limit, hashing, 413 responses)
+"""
+
+import hashlib
+import sys
+sys.path.append('.')
+
+from fastapi.testclient import TestClient
+
+from main import app
+from app.services.upload_ingestion import MAX_FILE_SIZE, MULTIPART_OVERHEAD
+
+client = TestClient(app)
+
+
+def test_oversized_upload_rejected():
+    """Uploads over the limit are answered with 413"""
+    payload = b"a" * (MAX_FILE_SIZE + 1)
+    response = client.post(
+        "/api/ats/validate",
+        files={"file": ("big.txt", payload, "text/plain")}
+    )
+    print(f"Oversized upload: {response.status_code}")
+    assert response.status_code == 413
+
+
+def test_oversized_upload_rejection_carries_cors_headers():
+    """The middleware's early 413 passes through CORS so browsers can read it"""
+    payload = b"a" * (MAX_FILE_SIZE + MULTIPART_OVERHEAD + 1)
+    response = client.post(
+        "/api/ats/validate",
+        files={"file": ("big.txt", payload, "text/plain")},
+        headers={"Origin": "http://example.com"}
+    )
+    assert response.status_code == 413
+    assert response.headers.get("access-control-allow-origin") in ("*", "http://example.com")
+
+
+def test_unsupported_extension_rejected():
+    """Unsupported file types are still answered with 400"""
+    response = client.post(
+        "/api/ats/validate",
+        files={"file": ("resume.exe", b"MZ", "application/octet-stream")}
+    )
+    assert response.status_code == 400
+
+
+def test_upload_is_hashed_and_processed():
+    """A normal upload is hashed while streaming and reaches the validator"""
+    from app.services.upload_ingestion import ingest_upload
+    from starlette.datastructures import UploadFile
+    import asyncio
+    import io
+
+    with open("test_resume.txt", "rb") as f:
+        content = f.read()
+
+    upload = asyncio.run(ingest_upload(UploadFile(io.BytesIO(content), filename="resume.txt")))
+    assert upload.size == len(content)
+    assert upload.sha256 == hashlib.sha256(content).hexdigest()
+    assert upload.rewind().read() == content
+
+    response = client.post(
+        "/api/ats/validate",
+        files={"file": ("test_resume.txt", content, "text/plain")}
+    )
+    print(f"Normal upload: {response.status_code}")
+    assert response.status_code == 200
+    assert "validation_result" in response.json()
+
+
+if __name__ == "__main__":
+    test_oversized_upload_rejected()
+    test_oversized_upload_rejection_carries_cors_headers()
+    test_unsupported_extension_rejected()
+    test_upload_is_hashed_and_processed()
+    print("✅ Upload ingestion tests passed")